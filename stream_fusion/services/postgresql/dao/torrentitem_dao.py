@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import Depends
-from sqlalchemy import select, func, update
+from sqlalchemy import and_, or_, select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone, timedelta
 
@@ -55,6 +56,67 @@ class TorrentItemDAO:
                 logger.error(f"TorrentItemDAO: Error retrieving TorrentItem {item_id}: {str(e)}")
                 return None
 
+    async def get_torrent_items_by_ids(self, item_ids: List[str]) -> Dict[str, TorrentItemModel]:
+        if not item_ids:
+            return {}
+
+        async with self.session.begin():
+            try:
+                query = select(TorrentItemModel).where(TorrentItemModel.id.in_(set(item_ids)))
+                result = await self.session.execute(query)
+                items = {item.id: item for item in result.scalars().all()}
+                logger.debug(f"TorrentItemDAO: Retrieved {len(items)}/{len(item_ids)} TorrentItems by id")
+                return items
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error retrieving TorrentItems by ids: {str(e)}")
+                return {}
+
+    async def bulk_create_torrent_items(self, items: List[Tuple[str, TorrentItem]]) -> int:
+        """
+        Insère plusieurs TorrentItems en une seule requête (INSERT ... ON CONFLICT DO NOTHING).
+
+        :param items: liste de tuples (id, torrent_item)
+        :return: nombre de lignes réellement insérées
+        """
+        if not items:
+            return 0
+
+        columns = TorrentItemModel.__table__.columns
+        required = [column.name for column in columns if not column.nullable]
+        rows = {}
+        for item_id, torrent_item in items:
+            model = TorrentItemModel.from_torrent_item(torrent_item)
+            row = {column.name: getattr(model, column.name) for column in columns}
+            row["id"] = item_id
+            if row["trackers"] is None:
+                row["trackers"] = []
+            if row["availability"] is None:
+                row["availability"] = False
+            missing = [name for name in required if row[name] is None]
+            if missing:
+                # Une seule ligne invalide ferait échouer tout le batch
+                logger.debug(f"TorrentItemDAO: Skipping TorrentItem {item_id}, missing {missing}")
+                continue
+            rows[item_id] = row
+
+        if not rows:
+            return 0
+
+        async with self.session.begin():
+            try:
+                stmt = (
+                    pg_insert(TorrentItemModel)
+                    .values(list(rows.values()))
+                    .on_conflict_do_nothing(index_elements=[TorrentItemModel.id])
+                )
+                result = await self.session.execute(stmt)
+                inserted = result.rowcount
+                logger.debug(f"TorrentItemDAO: Bulk inserted {inserted}/{len(rows)} TorrentItems")
+                return inserted
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error bulk creating TorrentItems: {str(e)}")
+                return 0
+
     async def update_torrent_item(self, item_id: str, torrent_item: TorrentItem) -> TorrentItemModel:
         async with self.session.begin():
             try:
@@ -67,6 +129,8 @@ class TorrentItemDAO:
                     return None
 
                 for key, value in torrent_item.__dict__.items():
+                    if key == '_parsed_data':
+                        key, value = 'parsed_data', torrent_item.parsed_data
                     if key == 'size' and value is not None:
                         try:
                             value = int(value)
@@ -75,6 +139,8 @@ class TorrentItemDAO:
                             continue
                     setattr(db_item, key, value)
 
+                for key, value in TorrentItemModel.season_episode_columns(torrent_item.parsed_data).items():
+                    setattr(db_item, key, value)
                 db_item.updated_at = int(datetime.now(timezone.utc).timestamp())
                 await self.session.flush()
                 await self.session.refresh(db_item)
@@ -188,6 +254,58 @@ class TorrentItemDAO:
                 logger.error(f"TorrentItemDAO: Error searching by TMDB ID {tmdb_id}: {str(e)}")
                 return []
 
+    async def search_stream_candidates(
+        self,
+        tmdb_id: int,
+        media_type: str,
+        indexers: List[str],
+        season: Optional[int] = None,
+        episode: Optional[int] = None,
+        languages: Optional[List[str]] = None,
+    ) -> List[TorrentItem]:
+        """
+        Variante de search_by_tmdb_id pour /stream : indexer, type, saison/épisode et langues
+        sont filtrés en SQL, et seules les colonnes utiles au classement sont lues.
+        Les prédicats restent plus larges que filter_items, qui garde le dernier mot.
+        """
+        columns = [getattr(TorrentItemModel, name) for name in TorrentItemModel.STREAM_COLUMNS]
+        conditions = [
+            TorrentItemModel.tmdb_id == tmdb_id,
+            TorrentItemModel.indexer.in_(indexers),
+            or_(TorrentItemModel.type == media_type, TorrentItemModel.type.is_(None)),
+        ]
+        if season is not None:
+            season_match = [TorrentItemModel.seasons.contains([season])]
+            if episode is not None:
+                # Pack de saison ou épisode exact
+                season_match.append(or_(
+                    func.cardinality(TorrentItemModel.episodes) == 0,
+                    TorrentItemModel.episodes.contains([episode]),
+                ))
+            conditions.append(or_(
+                # Lignes antérieures à la colonne seasons : filtrées en Python
+                TorrentItemModel.seasons.is_(None),
+                # Intégrales sans saison ni épisode
+                and_(func.cardinality(TorrentItemModel.seasons) == 0, func.cardinality(TorrentItemModel.episodes) == 0),
+                and_(*season_match),
+            ))
+        if languages is not None:
+            conditions.append(TorrentItemModel.languages.overlap(list(languages) + ["multi"]))
+
+        async with self.session.begin():
+            try:
+                query = select(*columns).where(*conditions)
+                result = await self.session.execute(query)
+                items = [TorrentItemModel.row_to_torrent_item(row) for row in result.all()]
+                logger.debug(
+                    f"TorrentItemDAO: Found {len(items)} stream candidates for TMDB ID: {tmdb_id} "
+                    f"(season={season}, episode={episode})"
+                )
+                return items
+            except Exception as e:
+                logger.error(f"TorrentItemDAO: Error searching stream candidates for TMDB ID {tmdb_id}: {str(e)}")
+                return []
+
     async def update_torrent_file_path(self, torrent_id: str, file_path: str) -> bool:
         async with self.session.begin():
             try:
@@ -0,0 +1,43 @@
+"""add seasons/episodes columns and stream search indexes to torrent_items
+
+Revision ID: add_season_episode
+Revises: add_tmdb_id
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'add_season_episode'
+down_revision = 'add_tmdb_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('torrent_items', sa.Column('seasons', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.add_column('torrent_items', sa.Column('episodes', postgresql.ARRAY(sa.Integer()), nullable=True))
+
+    # Backfill depuis parsed_data ; les lignes sans listes valides restent à NULL
+    op.execute(
+        """
+        UPDATE torrent_items SET
+            seasons = ARRAY(SELECT json_array_elements_text(parsed_data->'seasons')::int),
+            episodes = ARRAY(SELECT json_array_elements_text(parsed_data->'episodes')::int)
+        WHERE json_typeof(parsed_data->'seasons') = 'array'
+          AND json_typeof(parsed_data->'episodes') = 'array'
+        """
+    )
+
+    op.create_index('ix_torrent_items_tmdb_id_type_indexer', 'torrent_items', ['tmdb_id', 'type', 'indexer'], unique=False)
+    op.create_index('ix_torrent_items_seasons', 'torrent_items', ['seasons'], unique=False, postgresql_using='gin')
+    op.create_index('ix_torrent_items_languages', 'torrent_items', ['languages'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_torrent_items_languages', table_name='torrent_items')
+    op.drop_index('ix_torrent_items_seasons', table_name='torrent_items')
+    op.drop_index('ix_torrent_items_tmdb_id_type_indexer', table_name='torrent_items')
+    op.drop_column('torrent_items', 'episodes')
+    op.drop_column('torrent_items', 'seasons')
@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, String, Boolean, Integer, JSON
+from sqlalchemy import BigInteger, String, Boolean, Integer, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import ARRAY
 from stream_fusion.services.postgresql.base import Base
@@ -13,6 +13,17 @@ class TorrentItemModel(Base):
     """Model for TorrentItem in PostgreSQL."""
 
     __tablename__ = "torrent_items"
+    __table_args__ = (
+        Index("ix_torrent_items_tmdb_id_type_indexer", "tmdb_id", "type", "indexer"),
+        Index("ix_torrent_items_seasons", "seasons", postgresql_using="gin"),
+        Index("ix_torrent_items_languages", "languages", postgresql_using="gin"),
+    )
+
+    # Colonnes relues par to_torrent_item : files/full_index/trackers ne sont pas restaurés
+    STREAM_COLUMNS = (
+        "raw_title", "size", "magnet", "info_hash", "link", "seeders", "languages",
+        "indexer", "privacy", "type", "parsed_data", "torrent_download", "tmdb_id",
+    )
 
     id: Mapped[str] = mapped_column(String(16), primary_key=True)
     raw_title: Mapped[str] = mapped_column(String, nullable=False)
@@ -36,6 +47,9 @@ class TorrentItemModel(Base):
     availability: Mapped[bool] = mapped_column(Boolean, default=False)
 
     parsed_data: Mapped[dict] = mapped_column(JSON, nullable=True)
+    # Copie de parsed_data.seasons/episodes pour filtrer en SQL (NULL si jamais parsé)
+    seasons: Mapped[Optional[List[int]]] = mapped_column(ARRAY(Integer), nullable=True)
+    episodes: Mapped[Optional[List[int]]] = mapped_column(ARRAY(Integer), nullable=True)
 
     created_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
     updated_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -82,7 +96,10 @@ class TorrentItemModel(Base):
     @classmethod
     def from_torrent_item(cls, torrent_item: TorrentItem):
         model_dict = {}
-        for attr, value in torrent_item.__dict__.items():
+        # parsed_data est une propriété lazy de TorrentItem (stockée dans _parsed_data)
+        attributes = {k: v for k, v in torrent_item.__dict__.items() if k != '_parsed_data'}
+        attributes['parsed_data'] = torrent_item.parsed_data
+        for attr, value in attributes.items():
             if hasattr(cls, attr):
                 if attr == 'size':
                     model_dict[attr] = cls._parse_size(value)
@@ -116,34 +133,48 @@ class TorrentItemModel(Base):
                 else:
                     model_dict[attr] = value
 
+        model_dict.update(cls.season_episode_columns(model_dict.get('parsed_data')))
         return cls(**model_dict)
 
-    def to_torrent_item(self):
+    @staticmethod
+    def season_episode_columns(parsed_data) -> dict:
+        if isinstance(parsed_data, dict):
+            seasons, episodes = parsed_data.get('seasons'), parsed_data.get('episodes')
+        else:
+            seasons, episodes = getattr(parsed_data, 'seasons', None), getattr(parsed_data, 'episodes', None)
+        if not isinstance(seasons, list) or not isinstance(episodes, list):
+            return {'seasons': None, 'episodes': None}
+        return {'seasons': seasons, 'episodes': episodes}
+
+    @staticmethod
+    def _load_parsed_data(value):
         from RTN.models import ParsedData
-        from RTN import parse
+
+        if isinstance(value, dict):
+            try:
+                return ParsedData(**value)
+            except Exception:
+                # If parsing dict fails, TorrentItem reparses raw_title lazily
+                return None
+        # None, string or other type: TorrentItem reparses raw_title lazily
+        return None
+
+    @classmethod
+    def row_to_torrent_item(cls, row) -> TorrentItem:
+        """Construit un TorrentItem depuis une ligne projetée sur STREAM_COLUMNS."""
+        torrent_item_dict = dict(row._mapping)
+        torrent_item_dict['parsed_data'] = cls._load_parsed_data(torrent_item_dict.get('parsed_data'))
+        return TorrentItem(**torrent_item_dict)
+
+    def to_torrent_item(self):
         from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
         torrent_item_dict = {}
-        raw_title = None
 
         for attr, value in self.__dict__.items():
             if attr not in ['_sa_instance_state', 'created_at', 'updated_at']:
-                if attr == 'raw_title':
-                    raw_title = value
-                    torrent_item_dict[attr] = value
-                elif attr == 'parsed_data':
-                    # Handle parsed_data conversion with validation
-                    if value is None:
-                        torrent_item_dict[attr] = None
-                    elif isinstance(value, dict):
-                        try:
-                            torrent_item_dict[attr] = ParsedData(**value)
-                        except Exception:
-                            # If parsing dict fails, reparse from raw_title
-                            torrent_item_dict[attr] = parse(raw_title) if raw_title else None
-                    else:
-                        # If it's a string or other type, reparse from raw_title
-                        torrent_item_dict[attr] = parse(raw_title) if raw_title else None
+                if attr == 'parsed_data':
+                    torrent_item_dict[attr] = self._load_parsed_data(value)
                 else:
                     torrent_item_dict[attr] = value
 
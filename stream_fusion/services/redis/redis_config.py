@@ -1,8 +1,9 @@
 from functools import lru_cache
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from fastapi import Depends, Request
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from stream_fusion.settings import settings
 from stream_fusion.utils.cache.local_redis import RedisCache
 
@@ -17,16 +18,17 @@ def get_redis_config():
     }
 
 # Redis cache
-def create_redis_cache():
-    return RedisCache(get_redis_config())
+def create_redis_cache(redis_client: Optional[AsyncRedis] = None):
+    return RedisCache(get_redis_config(), redis_client=redis_client)
 
 # Redis cache dependency
-def get_redis_cache():
-    return create_redis_cache()
+def get_redis_cache(request: Request):
+    # Client async partagé, créé dans le lifespan (un seul pool par worker)
+    return create_redis_cache(getattr(request.app.state, "async_redis_client", None))
 
 # Async generator for Redis cache dependency
-async def get_redis_cache_dependency():
-    redis_cache = get_redis_cache()
+async def get_redis_cache_dependency(request: Request):
+    redis_cache = get_redis_cache(request)
     try:
         yield redis_cache
     finally:
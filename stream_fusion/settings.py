@@ -117,6 +117,22 @@ class Settings(BaseSettings):
     # STREMTHRU
     stremthru_url: str = "https://stremthru.13377001.xyz"
 
+    # DEBRID AVAILABILITY
+    debrid_availability_timeout: float = 10.0  # Budget par service, les checks tournent en parallèle
+    debrid_availability_chunk_size: int = 50
+    debrid_availability_chunk_concurrency: int = 4  # Chunks simultanés par provider, tous utilisateurs confondus
+    debrid_availability_cache_ttl: int = 900  # Cache partagé (provider, hash) : hash en cache chez le debrid
+    debrid_availability_negative_ttl: int = 180  # Hash absent du cache debrid
+
+    # DEBRID RATE LIMIT
+    debrid_rate_limit_backend: str = "local"  # "local" (par worker) ou "redis" (GCRA partagé entre workers)
+
+    # DEBRID TORRENT INDEX
+    debrid_index_refresh_interval: int = 600  # Rafraîchissement en arrière-plan de l'index hash -> torrent du compte
+    debrid_index_max_age: int = 86400  # Au-delà, l'index est reconstruit avant utilisation
+    debrid_index_lock_ttl: int = 120
+    debrid_index_retry_delay: int = 60
+
     # LOGGING
     log_level: LogLevel = LogLevel.INFO
     log_path: str = "/app/config/logs/stream-fusion.log"
@@ -144,9 +160,55 @@ class Settings(BaseSettings):
     redis_db: int = 5
     redis_expiration: int = 604800  # 7 jours
     redis_password: str | None = None
+    redis_max_connections: int = 100
+    redis_circuit_failure_threshold: int = 5
+    redis_circuit_reset_timeout: int = 30
+    redis_compression_threshold: int = 1024  # Octets, 0 pour désactiver la compression
+
+    # SEARCH
+    search_single_flight_lock_ttl: int = 60  # Durée max d'une recherche « leader » entre workers
+    search_single_flight_wait_timeout: float = 45.0
+    search_deadline: float = 8.0  # Attente max des indexers avant de répondre avec les résultats déjà reçus
+    search_default_budget: float = 4.0  # Budget d'une source sans historique de latence
+    search_min_budget: float = 1.0
+    search_budget_factor: float = 1.5  # Budget = p95 récent × facteur
+    search_latency_window: int = 100
+    search_backfill_timeout: int = 60  # Attente max des sources retardataires en arrière-plan
+
+    # PREFETCH (épisodes suivants)
+    prefetch_workers: int = 2
+    prefetch_queue_size: int = 100  # File pleine : les nouveaux pré-chargements sont abandonnés
+    prefetch_lookahead: int = 1  # Nombre d'épisodes suivants pré-chargés
+    prefetch_next_season: bool = True  # E01 de la saison suivante quand l'épisode suivant n'a rien donné
+    prefetch_dedupe_ttl: int = 1800  # Un même (utilisateur, série, épisode) n'est pré-chargé qu'une fois
+    prefetch_job_timeout: float = 60.0
+
+    # INDEXER RAW CACHE
+    indexer_cache_enabled: bool = True
+    indexer_cache_ttl: int = 900  # Réponses brutes des indexers, par (indexer, requête normalisée)
+    indexer_cache_ttl_zilean: int = 3600
+    indexer_cache_ttl_jackett: int = 1800
+    indexer_cache_ttl_yggflix: int = 900
+    indexer_cache_ttl_c411: int = 900
+    indexer_cache_ttl_torr9: int = 900
+    indexer_cache_ttl_lacale: int = 900
+    indexer_cache_negative_ttl: int = 300  # Réponses sans résultat
+
+    # SEASON PACK INDEX
+    season_pack_index_enabled: bool = True
+    season_pack_index_ttl: int = 604800  # Packs de saison par (tmdb_id, saison), 7 jours
+
+    # STREAM CACHE (stale-while-revalidate)
+    stream_cache_soft_ttl: int = 1200  # Au-delà, la liste est servie puis rafraîchie en arrière-plan
+    stream_cache_soft_ttl_stremthru: int = 600
+    stream_cache_hard_ttl: int = 3600  # Expiration Redis réelle de la liste de streams
+    stream_cache_refresh_lock_ttl: int = 120
 
     # TMDB
     tmdb_api_key: str | None = None
+    catalog_fetch_concurrency: int = 10  # Appels TMDB simultanés pour les métas manquantes du catalogue
+    metadata_cache_size: int = 5000  # Entrées (type, tmdb_id) gardées en mémoire par worker
+    metadata_cache_ttl: int = 7 * 86400
 
     # JACKETT
     jackett_host: str = "jackett"
@@ -154,6 +216,11 @@ class Settings(BaseSettings):
     jackett_port: int = 9117
     jackett_api_key: str | None = None
     jackett_enable: bool = check_env_variable("JACKETT_API_KEY")
+    jackett_indexers_ttl: int = 3600  # Liste des indexers configurés, rafraîchie en arrière-plan
+    jackett_indexers_retry_delay: int = 60
+    jackett_indexer_slow_threshold: float = 10.0  # Au-delà, la réponse compte comme un échec
+    jackett_indexer_failure_threshold: int = 3
+    jackett_indexer_reset_timeout: int = 300
 
     # ZILEAN DMM API
     zilean_host: str = "zilean"
@@ -183,6 +250,7 @@ class Settings(BaseSettings):
     # YGG RELAY / YGGFLIX
     yggflix_url: str = "https://relay.ygg.gratis/torznab"
     yggflix_max_workers: int = 4
+    yggflix_max_concurrency: int = 16
     ygg_passkey: str | None = None
     ygg_unique_account: bool = False
 
@@ -208,6 +276,17 @@ class Settings(BaseSettings):
     lacale_api_key: str | None = None  # Env: LACALE_API_KEY
     lacale_unique_account: bool = check_env_variable("LACALE_API_KEY")
 
+    # TORRENT FETCH
+    torrent_fetch_max_concurrency: int = 8
+    torrent_decode_workers: int = 4
+
+    # RTN PARSER
+    rtn_parse_cache_size: int = 50000
+
+    # FILTERS
+    filter_plan_cache_size: int = 256  # Plans de filtrage compilés par (config, média)
+    filter_title_cache_size: int = 50000  # Titres normalisés et résultats de title_match
+
     # PUBLIC_CACHE
     public_cache_url: str = "https://stremio-jackett-cacher.elfhosted.com/"
 
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.cache.indexer_cache import indexer_cache, is_empty_torznab
 
 
 class C411RawResult:
@@ -41,6 +42,11 @@ class C411API:
             return None
         # Torznab standard : apikey en query param (pas Bearer header)
         params["apikey"] = self.api_key
+        return await indexer_cache.fetch(
+            "c411", params, lambda: self._fetch_xml(params), is_empty=is_empty_torznab
+        )
+
+    async def _fetch_xml(self, params: dict) -> Optional[str]:
         session = await self._get_session()
         try:
             async with session.get(
@@ -1,5 +1,5 @@
 
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.utils.detection import detect_languages
@@ -24,7 +24,7 @@ class C411Result:
         self.torrent_download = None
 
     def convert_to_torrent_item(self):
-        parsed_data = self.parsed_data or parse(self.raw_title)
+        parsed_data = self.parsed_data or cached_parse(self.raw_title)
         return TorrentItem(
             raw_title=self.raw_title,
             size=self.size,
@@ -46,7 +46,7 @@ class C411Result:
         if not self.info_hash or len(self.info_hash) != 40:
             raise ValueError(f"Invalid info_hash: {self.info_hash}")
 
-        parsed = parse(api_item.raw_title)
+        parsed = cached_parse(api_item.raw_title)
         self.raw_title = parsed.raw_title
         self.parsed_data = parsed
         self.size = api_item.size or "0"
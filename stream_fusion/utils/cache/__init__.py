@@ -1,4 +1,6 @@
 from stream_fusion.utils.cache.cache_base import CacheBase
+from stream_fusion.utils.cache.circuit_breaker import CircuitBreaker
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.single_flight import SingleFlight
 
-__all__ = ["CacheBase", "RedisCache"]
\ No newline at end of file
+__all__ = ["CacheBase", "CircuitBreaker", "RedisCache", "SingleFlight"]
\ No newline at end of file
@@ -0,0 +1,73 @@
+import time
+
+from stream_fusion.logging_config import logger
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur simple : après `failure_threshold` échecs consécutifs, le circuit
+    s'ouvre pendant `reset_timeout` secondes, puis laisse passer un appel d'essai.
+
+    Les appelants qui ne rapportent pas l'issue de leur appel consultent is_open() ;
+    seuls ceux qui appellent record_success/record_failure (ou release_trial) passent par allow_request().
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def is_open(self) -> bool:
+        """Sans effet de bord : True tant que les appels doivent être évités (ouvert ou essai en cours)."""
+        if self.state == self.CLOSED:
+            return False
+        return time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """
+        Réservé au code qui exécute l'appel et en rapporte l'issue (record_success/record_failure).
+        Après reset_timeout, le premier appelant obtient l'essai half-open ; un essai jamais
+        résolu est rendu au bout d'un nouveau reset_timeout.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Un seul appel d'essai tant que l'état n'est pas résolu
+            self.state = self.HALF_OPEN
+            self.opened_at = time.monotonic()
+            logger.info(f"CircuitBreaker: {self.name} half-open, trying a request")
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"CircuitBreaker: {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"CircuitBreaker: {self.name} open for {self.reset_timeout}s after {self.failures} failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """Issue non concluante (annulation, erreur locale) : rend l'essai half-open sans compter d'échec."""
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            # L'essai suivant est accordé aussitôt
+            self.opened_at = time.monotonic() - self.reset_timeout
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures}
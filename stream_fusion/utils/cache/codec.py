@@ -0,0 +1,165 @@
+"""
+Codec versionné pour les valeurs stockées dans Redis.
+
+Format : b"SF" + version (1 octet) + kind (1 octet) + compression (1 octet) + payload.
+- kind "r" : JSON brut (orjson)
+- kind "m" : modèle(s) pydantic, reconstruits via model_construct (sans validation)
+- kind "o" : objet(s) simples (Movie/Series...), reconstruits via leur __dict__
+- kind "p" : fallback jsonpickle pour les types non supportés
+Les valeurs sans en-tête sont des entrées jsonpickle historiques.
+"""
+import importlib
+import zlib
+from functools import lru_cache
+from typing import Any
+
+import jsonpickle
+import orjson
+from pydantic import BaseModel
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+try:
+    import zstandard
+
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+except ImportError:  # optional dependency
+    zstandard = None
+
+MAGIC = b"SF"
+CODEC_VERSION = 1
+
+KIND_RAW = b"r"
+KIND_MODEL = b"m"
+KIND_OBJECT = b"o"
+KIND_PICKLE = b"p"
+
+COMPRESSION_NONE = b"n"
+COMPRESSION_ZLIB = b"z"
+COMPRESSION_ZSTD = b"s"
+
+_TRUSTED_MODULE_PREFIX = "stream_fusion."
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (bytes, bytearray)):
+        # ed2k/md5 des fichiers torrent, jamais relus
+        return value.hex()
+    if isinstance(value, set):
+        return list(value)
+    raise TypeError
+
+
+def _dumps(value) -> bytes:
+    return orjson.dumps(value, default=_default)
+
+
+def _type_path(cls) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+@lru_cache(maxsize=64)
+def _resolve_type(path: str):
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(_TRUSTED_MODULE_PREFIX):
+        raise ValueError(f"Untrusted type in cache payload: {path}")
+    obj = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _is_plain_object(value) -> bool:
+    return type(value).__module__.startswith(_TRUSTED_MODULE_PREFIX) and hasattr(value, "__dict__")
+
+
+def _serialize(value) -> tuple[bytes, bytes]:
+    """Retourne (kind, payload JSON)."""
+    many = isinstance(value, list)
+    items = value if many else [value]
+    sample_type = type(items[0]) if items else None
+
+    if sample_type is None or any(type(item) is not sample_type for item in items):
+        return KIND_RAW, _dumps(value)
+
+    if issubclass(sample_type, BaseModel):
+        # Modèles plats uniquement (ex: Stream) : model_construct ne reconstruit pas les sous-modèles
+        dumped = [item.model_dump() for item in items]
+        return KIND_MODEL, _dumps({"t": _type_path(sample_type), "many": many, "v": dumped if many else dumped[0]})
+
+    if _is_plain_object(items[0]):
+        dumped = [vars(item) for item in items]
+        return KIND_OBJECT, _dumps({"t": _type_path(sample_type), "many": many, "v": dumped if many else dumped[0]})
+
+    return KIND_RAW, _dumps(value)
+
+
+def encode(value: Any) -> bytes:
+    try:
+        kind, payload = _serialize(value)
+    except TypeError:
+        kind, payload = KIND_PICKLE, jsonpickle.encode(value).encode("utf-8")
+
+    compression = COMPRESSION_NONE
+    if settings.redis_compression_threshold and len(payload) >= settings.redis_compression_threshold:
+        if zstandard is not None:
+            payload, compression = _zstd_compressor.compress(payload), COMPRESSION_ZSTD
+        else:
+            payload, compression = zlib.compress(payload, 1), COMPRESSION_ZLIB
+
+    return MAGIC + bytes([CODEC_VERSION]) + kind + compression + payload
+
+
+def _decompress(compression: bytes, payload: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return payload
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(payload)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd payload but zstandard is not installed")
+        return _zstd_decompressor.decompress(payload)
+    raise ValueError(f"Unknown compression {compression!r}")
+
+
+def _build_object(cls, attributes: dict):
+    instance = cls.__new__(cls)
+    instance.__dict__.update(attributes)
+    return instance
+
+
+def decode(data: bytes) -> Any:
+    if not data.startswith(MAGIC):
+        # Entrée historique jsonpickle
+        return jsonpickle.decode(data)
+
+    version = data[2]
+    if version != CODEC_VERSION:
+        logger.warning(f"RedisCodec: Unsupported codec version {version}, ignoring cached value")
+        return None
+
+    kind, compression = data[3:4], data[4:5]
+    payload = _decompress(compression, data[5:])
+
+    if kind == KIND_RAW:
+        return orjson.loads(payload)
+    if kind == KIND_PICKLE:
+        return jsonpickle.decode(payload)
+
+    envelope = orjson.loads(payload)
+    cls = _resolve_type(envelope["t"])
+    if kind == KIND_MODEL:
+        build = cls.model_construct
+        if envelope["many"]:
+            return [build(**item) for item in envelope["v"]]
+        return build(**envelope["v"])
+    if kind == KIND_OBJECT:
+        if envelope["many"]:
+            return [_build_object(cls, item) for item in envelope["v"]]
+        return _build_object(cls, envelope["v"])
+
+    raise ValueError(f"Unknown codec kind {kind!r}")
@@ -0,0 +1,104 @@
+"""
+Cache Redis partagé des réponses brutes des indexers, par (indexer, requête normalisée).
+
+Les réponses vides sont mises en cache avec un TTL court (cache négatif) ; les erreurs
+(None ou exception) ne le sont jamais. La clé d'API ne fait pas partie de la clé de cache.
+Toute erreur Redis fait simplement appeler l'indexer.
+"""
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache import codec
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+
+_IGNORED_PARAMS = {"apikey", "api_key"}
+
+
+def normalize_query(params: Dict[str, Any]) -> str:
+    normalized = {}
+    for name, value in params.items():
+        if value is None or name.lower() in _IGNORED_PARAMS:
+            continue
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower()
+        normalized[name.lower()] = value
+    return orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS, default=str).decode()
+
+
+def indexer_ttl(indexer: str) -> int:
+    """TTL propre à l'indexer (indexer_cache_ttl_<nom>) ou TTL par défaut."""
+    base = indexer.split(":", 1)[0].lower()
+    return getattr(settings, f"indexer_cache_ttl_{base}", settings.indexer_cache_ttl)
+
+
+def is_empty_torznab(xml: str) -> bool:
+    return "<item" not in xml
+
+
+class IndexerCache:
+    def __init__(self):
+        self._stats: Dict[str, dict] = {}
+
+    @staticmethod
+    def _key(indexer: str, query: str) -> str:
+        return f"indexer_raw:{indexer}:{hashlib.sha1(query.encode()).hexdigest()}"
+
+    def _record(self, indexer: str, event: str):
+        base = indexer.split(":", 1)[0]
+        entry = self._stats.setdefault(base, {"hits": 0, "negative_hits": 0, "misses": 0})
+        entry[event] += 1
+
+    async def _get(self, key: str) -> Optional[Any]:
+        if not settings.indexer_cache_enabled or redis_circuit_breaker.is_open():
+            return None
+        try:
+            value = await get_shared_redis_client().get(key)
+        except Exception as e:
+            logger.debug(f"IndexerCache: Redis read failed for {key}: {e}")
+            return None
+        return codec.decode(value) if value is not None else None
+
+    async def _set(self, key: str, value: Any, ttl: int):
+        if not settings.indexer_cache_enabled or redis_circuit_breaker.is_open():
+            return
+        try:
+            await get_shared_redis_client().set(key, codec.encode(value), ex=ttl)
+        except Exception as e:
+            logger.debug(f"IndexerCache: Redis write failed for {key}: {e}")
+
+    async def fetch(
+        self,
+        indexer: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]],
+        is_empty: Callable[[Any], bool] = lambda value: not value,
+    ) -> Any:
+        """
+        Retourne la réponse en cache pour (indexer, params), sinon appelle `fetch`.
+
+        :param fetch: appel réel à l'indexer ; None signale une erreur (non mise en cache)
+        :param is_empty: détermine si la réponse relève du cache négatif
+        """
+        key = self._key(indexer, normalize_query(params))
+        cached = await self._get(key)
+        if cached is not None:
+            self._record(indexer, "negative_hits" if is_empty(cached) else "hits")
+            logger.debug(f"IndexerCache: {indexer} served from cache")
+            return cached
+
+        self._record(indexer, "misses")
+        value = await fetch()
+        if value is not None:
+            ttl = settings.indexer_cache_negative_ttl if is_empty(value) else indexer_ttl(indexer)
+            await self._set(key, value, ttl)
+        return value
+
+    def stats(self) -> dict:
+        return {name: dict(entry) for name, entry in self._stats.items()}
+
+
+indexer_cache = IndexerCache()
@@ -1,55 +1,102 @@
 import asyncio
 import inspect
-import jsonpickle
 import time
-from typing import Any, List
+from typing import Any, List, Optional
 import hashlib
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from stream_fusion.settings import settings
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.cache import codec
 from stream_fusion.utils.cache.cache_base import CacheBase
+from stream_fusion.utils.cache.circuit_breaker import CircuitBreaker
+
+redis_circuit_breaker = CircuitBreaker(
+    "Redis",
+    failure_threshold=settings.redis_circuit_failure_threshold,
+    reset_timeout=settings.redis_circuit_reset_timeout,
+)
+
+
+def create_redis_pool() -> ConnectionPool:
+    return ConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        max_connections=settings.redis_max_connections,
+        socket_connect_timeout=5,
+        socket_timeout=10,
+    )
+
+
+_shared_client: Optional[Redis] = None
+
+
+def get_shared_redis_client() -> Redis:
+    """
+    Client Redis du process, aussi exposé par le lifespan dans app.state : un seul pool
+    async par worker, y compris pour le code sans accès à app.state (services debrid...).
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = Redis(connection_pool=create_redis_pool())
+    return _shared_client
+
+
+async def close_shared_redis_client():
+    """Ferme le pool du client partagé (arrêt du worker)."""
+    global _shared_client
+    if _shared_client is not None:
+        client, _shared_client = _shared_client, None
+        await client.connection_pool.disconnect()
+
 
 class RedisCache(CacheBase):
-    def __init__(self, config):
+    def __init__(self, config, redis_client: Optional[Redis] = None):
         super().__init__(config)
         self.redis_host = settings.redis_host
         self.redis_port = settings.redis_port
         self.redis_db = settings.redis_db
-        self.redis_url = f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
-        self._redis_client = None
+        # Client partagé (pool de l'application) : ne jamais le fermer ici
+        self._redis_client = redis_client
+        self._owns_client = redis_client is None
         self.media_expiration = settings.redis_expiration
 
     async def get_redis_client(self):
         if not self._redis_client:
             try:
-                self._redis_client = Redis.from_url(
-                    self.redis_url,
-                    max_connections=100,
-                    socket_connect_timeout=5,
-                    socket_timeout=10
-                )
+                self._redis_client = Redis(connection_pool=create_redis_pool())
+                self._owns_client = True
             except Exception as e:
                 self.logger.error(f"RedisCache: Failed to create Redis client: {e}")
                 self._redis_client = None
         return self._redis_client
-    
-    async def reconnect(self):
-        self._redis_client = None
-        return await self.get_redis_client()
 
     async def execute_with_retry(self, operation, *args, **kwargs):
+        if not redis_circuit_breaker.allow_request():
+            self.logger.debug("RedisCache: Circuit open, skipping Redis operation")
+            return None
+
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                return await operation(*args, **kwargs)
-            except ConnectionError:
+                result = await operation(*args, **kwargs)
+            except (RedisConnectionError, RedisTimeoutError, ConnectionError) as e:
                 if attempt < max_retries - 1:
-                    self.logger.warning(f"RedisCache: Connection lost. Attempting reconnection (attempt {attempt + 1}/{max_retries})")
-                    await self.reconnect()
-                else:
-                    self.logger.error("RedisCache: Max retries reached. Unable to reconnect to Redis.")
-                    raise
+                    # Le pool recrée la connexion au prochain appel
+                    self.logger.warning(f"RedisCache: Connection lost. Retrying (attempt {attempt + 1}/{max_retries})")
+                    continue
+                redis_circuit_breaker.record_failure()
+                self.logger.error(f"RedisCache: Max retries reached. Unable to reach Redis: {e}")
+                raise
+            except BaseException:
+                # Annulation ou erreur locale : Redis n'est pas en cause, l'essai half-open éventuel est rendu
+                redis_circuit_breaker.release_trial()
+                raise
+            redis_circuit_breaker.record_success()
+            return result
 
     async def get_list(self, key: str) -> List[Any]:
         result = await self.get(key)
@@ -157,22 +204,19 @@ class RedisCache(CacheBase):
         return result
 
     async def can_cache(self) -> bool:
-        self.logger.debug("RedisCache: Checking if caching is possible")
-        try:
-            client = await self.get_redis_client()
-            result = await client.ping()
-            self.logger.debug(f"RedisCache: Redis ping result: {result}")
-            return result
-        except Exception as e:
-            self.logger.error(f"RedisCache: Unable to connect to Redis: {e}")
-            return False
+        # Plus de PING à chaque appel : l'état de Redis est suivi par le circuit breaker
+        return not redis_circuit_breaker.is_open()
 
     async def get(self, key: str) -> Any:
         async def get_operation():
             client = await self.get_redis_client()
             cached_result = await client.get(key)
             if cached_result:
-                return jsonpickle.decode(cached_result)
+                try:
+                    return codec.decode(cached_result)
+                except Exception as e:
+                    self.logger.warning(f"RedisCache: Unable to decode cached value for key {key}: {e}")
+                    return None
             return None
 
         return await self.execute_with_retry(get_operation)
@@ -183,7 +227,7 @@ class RedisCache(CacheBase):
 
         async def set_operation():
             client = await self.get_redis_client()
-            cached_data = jsonpickle.encode(value)
+            cached_data = codec.encode(value)
             return await client.set(key, cached_data, ex=expiration)
 
         await self.execute_with_retry(set_operation)
@@ -217,11 +261,11 @@ class RedisCache(CacheBase):
         return await self.execute_with_retry(update_expiration_operation)
 
     async def close(self):
-        if self._redis_client:
+        if self._redis_client and self._owns_client:
             try:
                 # Set a short timeout for closing to avoid blocking
                 await asyncio.wait_for(
-                    self._redis_client.close(),
+                    self._redis_client.connection_pool.disconnect(),
                     timeout=2.0
                 )
             except asyncio.TimeoutError:
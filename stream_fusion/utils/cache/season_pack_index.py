@@ -0,0 +1,112 @@
+"""
+Index Redis des packs de saison, par (tmdb_id, saison).
+
+Un pack (saison sans épisode dans le titre) dont le full_index est connu couvre tous les
+épisodes de la saison : une fois trouvé pour un épisode, il répond aux suivants sans
+réinterroger ni retélécharger le torrent.
+Hash Redis season_packs:{tmdb_id}:{saison}, un champ par info_hash. Toute erreur Redis est ignorée.
+"""
+from typing import Iterable, List
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache import codec
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.torrent.torrent_item import TorrentItem
+
+
+def is_season_pack(item: TorrentItem, season: int) -> bool:
+    parsed = item.parsed_data
+    if item.type != "series" or not item.full_index or not item.info_hash or parsed is None:
+        return False
+    return season in getattr(parsed, "seasons", []) and not getattr(parsed, "episodes", None)
+
+
+def _has_episode(full_index, season: int, episode: int) -> bool:
+    # Équivalent silencieux de TorrentSmartContainer._find_matching_file : un pack sans l'épisode est courant
+    return any(
+        season in file_entry.get("seasons", []) and episode in file_entry.get("episodes", [])
+        for file_entry in full_index or []
+    )
+
+
+class SeasonPackIndex:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.packs_served = 0
+        self.packs_indexed = 0
+
+    @staticmethod
+    def _key(tmdb_id, season: int) -> str:
+        return f"season_packs:{tmdb_id}:{season}"
+
+    @staticmethod
+    def _usable(media) -> bool:
+        return settings.season_pack_index_enabled and isinstance(media, Series) and bool(media.tmdb_id)
+
+    async def add(self, media, items: Iterable[TorrentItem]):
+        """Indexe les packs de la saison de `media` parmi `items`."""
+        if not self._usable(media) or redis_circuit_breaker.is_open():
+            return
+        season = media.get_season_number()
+        packs = {}
+        for item in items:
+            if not is_season_pack(item, season):
+                continue
+            record = item.to_dict()
+            # Champs propres à un épisode ou à une vérification debrid : recalculés à chaque requête
+            record.update(file_index=None, file_name=None, availability=False)
+            packs[item.info_hash] = codec.encode(record)
+        if not packs:
+            return
+
+        key = self._key(media.tmdb_id, season)
+        try:
+            client = get_shared_redis_client()
+            await client.hset(key, mapping=packs)
+            await client.expire(key, settings.season_pack_index_ttl)
+        except Exception as e:
+            logger.debug(f"SeasonPackIndex: Redis write failed for {key}: {e}")
+            return
+        self.packs_indexed += len(packs)
+        logger.debug(f"SeasonPackIndex: Indexed {len(packs)} packs for TMDB {media.tmdb_id} season {season}")
+
+    async def get(self, media) -> List[TorrentItem]:
+        """Packs indexés de la saison contenant l'épisode demandé (copies propres à la requête)."""
+        if not self._usable(media) or redis_circuit_breaker.is_open():
+            return []
+        key = self._key(media.tmdb_id, media.get_season_number())
+        try:
+            values = await get_shared_redis_client().hvals(key)
+        except Exception as e:
+            logger.debug(f"SeasonPackIndex: Redis read failed for {key}: {e}")
+            return []
+
+        season, episode = media.get_season_number(), media.get_episode_number()
+        packs = []
+        for value in values:
+            item = TorrentItem.from_dict(codec.decode(value))
+            if item is not None and _has_episode(item.full_index, season, episode):
+                packs.append(item)
+
+        if packs:
+            self.hits += 1
+            self.packs_served += len(packs)
+        else:
+            self.misses += 1
+        return packs
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "packs_served": self.packs_served,
+            "packs_indexed": self.packs_indexed,
+        }
+
+
+season_pack_index = SeasonPackIndex()
@@ -0,0 +1,110 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.cache.local_redis import RedisCache
+
+
+class SingleFlight:
+    """
+    Regroupe les appels concurrents sur une même clé : un seul « leader » exécute
+    la fonction, les autres attendent son résultat.
+
+    - Dans le worker : les appelants partagent la même tâche asyncio.
+    - Entre workers : verrou Redis (SET NX) + notification pub/sub à la fin ;
+      les workers en attente relisent alors le résultat via `load_result`.
+    """
+
+    def __init__(self, name: str, lock_ttl: int, wait_timeout: float):
+        self.name = name
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _lock_key(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"singleflight:{self.name}:{key}:done"
+
+    async def run(
+        self,
+        key: str,
+        redis_cache: RedisCache,
+        func: Callable[[], Awaitable[Any]],
+        load_result: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Any:
+        """
+        :param func: calcule le résultat (et l'écrit dans le cache partagé) ; partagé par les
+            appelants et poursuivi après la fin de la requête leader, il ne doit pas dépendre
+            de ressources propres à une requête (session DB, dépendances FastAPI)
+        :param load_result: relit le résultat écrit par un autre worker, None si absent
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_cross_worker(key, redis_cache, func, load_result))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info(f"SingleFlight: Joining in-flight {self.name} for key {key}")
+        return await asyncio.shield(task)
+
+    async def _run_cross_worker(self, key, redis_cache: RedisCache, func, load_result):
+        lock_key = self._lock_key(key)
+        token = uuid.uuid4().hex
+        try:
+            client = await redis_cache.get_redis_client()
+            acquired = await client.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            logger.warning(f"SingleFlight: Redis unavailable for {self.name} lock, running locally: {e}")
+            return await func()
+
+        if acquired:
+            try:
+                return await func()
+            finally:
+                await self._release(client, key, token)
+
+        logger.info(f"SingleFlight: {self.name} for key {key} running in another worker, waiting")
+        if await self._wait_for_leader(client, key):
+            result = await load_result()
+            if result is not None:
+                return result
+        logger.warning(f"SingleFlight: No result from leader for {self.name} key {key}, running locally")
+        return await func()
+
+    async def _wait_for_leader(self, client, key: str) -> bool:
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(key))
+            # Le leader a pu terminer entre le SET NX et l'abonnement
+            if not await client.exists(self._lock_key(key)):
+                return True
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_timeout
+            while (remaining := deadline - loop.time()) > 0:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+                if message is not None:
+                    return True
+                if not await client.exists(self._lock_key(key)):
+                    return True
+            return False
+        except Exception as e:
+            logger.warning(f"SingleFlight: Error while waiting for {self.name} key {key}: {e}")
+            return False
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def _release(self, client, key: str, token: str):
+        lock_key = self._lock_key(key)
+        try:
+            current = await client.get(lock_key)
+            if current is not None and current.decode() == token:
+                await client.delete(lock_key)
+            await client.publish(self._channel(key), "done")
+        except Exception as e:
+            logger.warning(f"SingleFlight: Error releasing {self.name} lock for key {key}: {e}")
@@ -0,0 +1,43 @@
+from stream_fusion.settings import settings
+
+
+class StreamCacheStats:
+    """Compteurs du cache des listes de streams (stale-while-revalidate), par worker."""
+
+    def __init__(self):
+        self.fresh = 0
+        self.stale = 0
+        self.miss = 0
+        self.refreshed = 0
+        self.refresh_failed = 0
+
+    def stats(self) -> dict:
+        served = self.fresh + self.stale
+        return {
+            "fresh_served": self.fresh,
+            "stale_served": self.stale,
+            "misses": self.miss,
+            "refreshed": self.refreshed,
+            "refresh_failed": self.refresh_failed,
+            "stale_ratio": round(self.stale / served, 4) if served else 0.0,
+        }
+
+
+stream_cache_stats = StreamCacheStats()
+
+
+def stream_cache_soft_ttl(debrid_services) -> int:
+    # Disponibilités StremThru plus volatiles : rafraîchissement plus fréquent
+    has_stremthru = any(
+        type(debrid).__name__ == "StremThru" or hasattr(debrid, 'store_name')
+        for debrid in debrid_services
+    )
+    return settings.stream_cache_soft_ttl_stremthru if has_stremthru else settings.stream_cache_soft_ttl
+
+
+def is_stale(remaining_ttl, soft_ttl: int) -> bool:
+    """Une entrée est périmée quand son âge (hard TTL - TTL restant) dépasse le soft TTL."""
+    if remaining_ttl is None or remaining_ttl < 0:
+        # -1 : pas d'expiration, -2 : clé expirée entre-temps
+        return False
+    return settings.stream_cache_hard_ttl - remaining_ttl >= soft_ttl
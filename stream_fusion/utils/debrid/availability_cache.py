@@ -0,0 +1,149 @@
+"""
+Cache Redis partagé de la disponibilité debrid, par (provider, info_hash).
+
+Chaque entrée contient la réponse du provider pour ce hash (liste de fichiers comprise
+pour les packs), ou False quand le hash n'est pas en cache chez le provider.
+Les réponses sont redécoupées par hash puis reconstruites au format du provider,
+pour que TorrentSmartContainer.update_availability reste inchangé.
+"""
+from typing import Any, Dict, List, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache import codec
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.debrid.premiumize import Premiumize
+from stream_fusion.utils.debrid.realdebrid import RealDebrid
+from stream_fusion.utils.debrid.stremthru import StremThru
+from stream_fusion.utils.debrid.torbox import Torbox
+
+NOT_CACHED = False
+
+
+def availability_provider(debrid) -> Optional[str]:
+    """Identifiant de cache du provider, None s'il n'est pas mis en cache (AllDebrid ne fait pas d'appel)."""
+    if isinstance(debrid, StremThru):
+        return f"StremThru-{debrid.store_name}"
+    if isinstance(debrid, (RealDebrid, Torbox, Premiumize)):
+        return type(debrid).__name__
+    return None
+
+
+def split_response(debrid, hashes: List[str], response) -> Dict[str, Any]:
+    """
+    Découpe une réponse bulk en entrées par hash demandé (NOT_CACHED si absent).
+    `hashes` ne doit contenir que des hashes auxquels le provider a effectivement répondu.
+    """
+    entries = {info_hash: NOT_CACHED for info_hash in hashes}
+    by_lower = {info_hash.lower(): info_hash for info_hash in hashes}
+
+    if isinstance(debrid, (RealDebrid, Premiumize)):
+        for info_hash, details in (response or {}).items():
+            if info_hash not in entries:
+                continue
+            if isinstance(debrid, RealDebrid) and not (isinstance(details, dict) and details.get("rd")):
+                continue
+            entries[info_hash] = details
+    elif isinstance(debrid, Torbox):
+        for item in (response or {}).get("data") or []:
+            info_hash = by_lower.get(str(item.get("hash", "")).lower())
+            if info_hash:
+                entries[info_hash] = item
+    elif isinstance(debrid, StremThru):
+        for item in response or []:
+            info_hash = by_lower.get(str(item.get("hash", "")).lower())
+            if info_hash:
+                entries[info_hash] = item
+    return entries
+
+
+def build_response(debrid, entries: Dict[str, Any]):
+    """Reconstruit une réponse au format du provider à partir des entrées par hash."""
+    if isinstance(debrid, Premiumize):
+        # Premiumize renvoie aussi les hashes non disponibles
+        return {
+            info_hash: entry if entry is not NOT_CACHED else {"transcoded": False, "filename": None, "filesize": 0}
+            for info_hash, entry in entries.items()
+        }
+    positives = {info_hash: entry for info_hash, entry in entries.items() if entry is not NOT_CACHED}
+    if isinstance(debrid, RealDebrid):
+        return positives
+    if isinstance(debrid, Torbox):
+        return {
+            "success": True,
+            "detail": "Torrent cache status retrieved successfully.",
+            "data": list(positives.values()),
+        }
+    return list(positives.values())
+
+
+def is_available(entry) -> bool:
+    if entry is NOT_CACHED:
+        return False
+    if isinstance(entry, dict) and "transcoded" in entry:
+        return bool(entry["transcoded"])
+    return True
+
+
+class AvailabilityCache:
+    """Lecture MGET / écriture pipelinée des disponibilités, TTL courts positifs et négatifs."""
+
+    hits = 0
+    misses = 0
+
+    def __init__(self, redis_cache: RedisCache):
+        self.redis_cache = redis_cache
+
+    @staticmethod
+    def _key(provider: str, info_hash: str) -> str:
+        return f"availability:{provider}:{info_hash.lower()}"
+
+    async def get_many(self, provider: str, hashes: List[str]) -> Dict[str, Any]:
+        """Retourne les entrées connues ; les hashes absents du dict sont à demander au provider."""
+        if not hashes or not await self.redis_cache.can_cache():
+            return {}
+        try:
+            client = await self.redis_cache.get_redis_client()
+            values = await client.mget([self._key(provider, info_hash) for info_hash in hashes])
+        except Exception as e:
+            logger.warning(f"AvailabilityCache: Read failed for {provider}: {e}")
+            return {}
+
+        known = {}
+        for info_hash, value in zip(hashes, values):
+            if value is None:
+                continue
+            try:
+                known[info_hash] = codec.decode(value)
+            except Exception as e:
+                logger.debug(f"AvailabilityCache: Undecodable entry for {info_hash}: {e}")
+        AvailabilityCache.hits += len(known)
+        AvailabilityCache.misses += len(hashes) - len(known)
+        logger.debug(f"AvailabilityCache: {provider} {len(known)}/{len(hashes)} hashes served from cache")
+        return known
+
+    async def set_many(self, provider: str, entries: Dict[str, Any]):
+        if not entries or not await self.redis_cache.can_cache():
+            return
+        try:
+            client = await self.redis_cache.get_redis_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for info_hash, entry in entries.items():
+                    ttl = (
+                        settings.debrid_availability_cache_ttl
+                        if is_available(entry)
+                        else settings.debrid_availability_negative_ttl
+                    )
+                    pipe.set(self._key(provider, info_hash), codec.encode(entry), ex=ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"AvailabilityCache: Write failed for {provider}: {e}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        total = cls.hits + cls.misses
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_ratio": round(cls.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,160 @@
+"""
+Vérification de disponibilité debrid au fil de l'eau (producteur / consommateur).
+
+Les producteurs (Postgres, cache Redis externe, chaque lot d'indexer) soumettent les
+hashes qui ont passé les filtres peu coûteux ; un consommateur les vérifie aussitôt
+auprès de chaque debrid, sans attendre l'indexer le plus lent. L'assemblage final
+(check_debrid_availability) reprend les réponses déjà reçues et n'interroge les
+debrids que pour les hashes restants.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.debrid.availability_cache import (
+    AvailabilityCache,
+    availability_provider,
+    split_response,
+)
+
+
+async def fetch_availability(debrid, hashes: List[str], ip, answered: Set[str] = None):
+    """
+    Appel bulk au debrid avec timeout ; None en cas d'échec.
+    `answered` (providers mis en cache uniquement) reçoit les hashes auxquels le provider a répondu.
+    """
+    started = time.time()
+    call = (
+        debrid.get_availability_bulk(hashes, ip)
+        if answered is None
+        else debrid.get_availability_bulk(hashes, ip, answered=answered)
+    )
+    try:
+        result = await asyncio.wait_for(call, timeout=settings.debrid_availability_timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Search: {type(debrid).__name__} availability check timed out after {settings.debrid_availability_timeout}s"
+        )
+        return None
+    except Exception as e:
+        logger.error(f"Search: {type(debrid).__name__} availability check failed: {e}")
+        return None
+    logger.debug(f"Search: {type(debrid).__name__} availability answered in {time.time() - started:.2f}s")
+    return result
+
+
+async def check_entries(debrid, hashes: List[str], ip, availability_cache: Optional[AvailabilityCache]) -> Dict[str, Any]:
+    """
+    Entrées par hash pour un debrid qui a un identifiant de cache : cache partagé d'abord,
+    puis le provider pour les hashes manquants. Les hashes dont l'appel (ou le chunk) a échoué
+    sont absents : ni mis en cache négatif, ni considérés comme vérifiés.
+    """
+    provider = availability_provider(debrid)
+    entries = await availability_cache.get_many(provider, hashes) if availability_cache is not None else {}
+    missing = [info_hash for info_hash in hashes if info_hash not in entries]
+    if missing:
+        answered: Set[str] = set()
+        result = await fetch_availability(debrid, missing, ip, answered)
+        # Sans réponse (timeout, erreur), `answered` peut contenir les chunks finis avant l'annulation :
+        # leurs résultats sont perdus, rien n'est donc mis en cache négatif
+        answered_hashes = [info_hash for info_hash in missing if info_hash in answered] if result is not None else []
+        if answered_hashes:
+            fresh = split_response(debrid, answered_hashes, result)
+            if availability_cache is not None:
+                await availability_cache.set_many(provider, fresh)
+            entries.update(fresh)
+        if len(answered_hashes) < len(missing):
+            logger.debug(f"Search: {provider} did not answer for {len(missing) - len(answered_hashes)} hashes")
+    return entries
+
+
+class AvailabilityPipeline:
+    def __init__(self, debrid_services, ip, redis_cache: RedisCache = None):
+        # AllDebrid et consorts (sans identifiant de cache) ne font pas d'appel : l'assemblage final suffit
+        self.debrid_services = [debrid for debrid in debrid_services if availability_provider(debrid)]
+        self.ip = ip
+        self.availability_cache = AvailabilityCache(redis_cache) if redis_cache is not None else None
+        self.entries: Dict[int, Dict[str, Any]] = {index: {} for index in range(len(self.debrid_services))}
+        self.attempted: Dict[int, Set[str]] = {index: set() for index in range(len(self.debrid_services))}
+        self._submitted: Set[str] = set()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._inflight: Set[asyncio.Task] = set()
+        self._consumer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def submit(self, items: Iterable):
+        """Soumet les hashes encore jamais vus d'un lot d'items (TorrentItem)."""
+        # Une recherche partagée (single-flight) peut encore produire après la fin de la requête
+        if not self.debrid_services or self._closed:
+            return
+        batch = []
+        for item in items:
+            info_hash = getattr(item, "info_hash", None)
+            if info_hash and info_hash not in self._submitted:
+                self._submitted.add(info_hash)
+                batch.append(info_hash)
+        if not batch:
+            return
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+        self._queue.put_nowait(batch)
+
+    async def _consume(self):
+        while True:
+            batch = await self._queue.get()
+            # Chaque lot part immédiatement ; les debrids bornent eux-mêmes leur concurrence
+            task = asyncio.create_task(self._check_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _check_batch(self, batch: List[str]):
+        logger.debug(f"AvailabilityPipeline: Checking {len(batch)} hashes")
+
+        async def _check(index, debrid):
+            try:
+                entries = await check_entries(debrid, batch, self.ip, self.availability_cache)
+            except Exception as e:
+                logger.warning(f"AvailabilityPipeline: {type(debrid).__name__} batch failed: {e}")
+                return
+            self.entries[index].update(entries)
+            # Seuls les hashes réellement vérifiés sont écartés de l'assemblage final
+            self.attempted[index].update(entries)
+
+        await asyncio.gather(*[_check(index, debrid) for index, debrid in enumerate(self.debrid_services)])
+
+    async def drain(self, timeout: float = None) -> None:
+        """Attend les vérifications en cours (bornées par le timeout debrid) puis arrête le consommateur."""
+        # Laisse le consommateur prendre les lots déjà soumis
+        while not self._queue.empty():
+            await asyncio.sleep(0)
+        if self._inflight:
+            await asyncio.wait(
+                set(self._inflight),
+                timeout=timeout if timeout is not None else settings.debrid_availability_timeout,
+            )
+        self.close()
+
+    def close(self):
+        """Arrête le consommateur et les vérifications encore en cours ; à appeler quoi qu'il arrive."""
+        self._closed = True
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        for task in self._inflight:
+            task.cancel()
+
+    def known_entries(self, debrid) -> Optional[Dict[str, Any]]:
+        """Entrées reçues pour ce debrid, None s'il n'est pas géré par le pipeline."""
+        for index, candidate in enumerate(self.debrid_services):
+            if candidate is debrid:
+                return self.entries[index]
+        return None
+
+    def attempted_hashes(self, debrid) -> Set[str]:
+        for index, candidate in enumerate(self.debrid_services):
+            if candidate is debrid:
+                return self.attempted[index]
+        return set()
@@ -1,12 +1,49 @@
-from collections import deque
 import asyncio
 import time
+from typing import Dict
 
 import aiohttp
 from aiohttp_socks import ProxyConnector
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.debrid import rate_limiter
+
+
+class ChunkStats:
+    """Latence et taille des chunks de vérification de disponibilité, par provider."""
+
+    def __init__(self):
+        self._providers: Dict[str, dict] = {}
+
+    def record(self, provider: str, size: int, latency: float, ok: bool):
+        entry = self._providers.setdefault(
+            provider, {"chunks": 0, "failed": 0, "hashes": 0, "total_latency": 0.0, "max_latency": 0.0}
+        )
+        entry["chunks"] += 1
+        entry["hashes"] += size
+        entry["total_latency"] += latency
+        entry["max_latency"] = max(entry["max_latency"], latency)
+        if not ok:
+            entry["failed"] += 1
+
+    def stats(self) -> dict:
+        return {
+            provider: {
+                "chunks": entry["chunks"],
+                "failed": entry["failed"],
+                "avg_size": round(entry["hashes"] / entry["chunks"], 1),
+                "avg_latency": round(entry["total_latency"] / entry["chunks"], 3),
+                "max_latency": round(entry["max_latency"], 3),
+            }
+            for provider, entry in self._providers.items()
+        }
+
+
+availability_chunk_stats = ChunkStats()
+
+# Plafond de chunks simultanés par provider, partagé par toutes les requêtes du worker
+_CHUNK_SEMAPHORES: Dict[str, asyncio.Semaphore] = {}
 
 
 class BaseDebrid:
@@ -16,15 +53,12 @@ class BaseDebrid:
         self._external_session = session is not None
         self._session = session
 
-        # Rate limiters
+        # Rate limits, partagés par provider et par compte (voir rate_limiter)
         self.global_limit = 250
         self.global_period = 60
         self.torrent_limit = 1
         self.torrent_period = 1
 
-        self.global_requests = deque()
-        self.torrent_requests = deque()
-
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session with optional proxy support."""
         if self._session is None or self._session.closed:
@@ -45,30 +79,32 @@ class BaseDebrid:
         if self._session and not self._external_session and not self._session.closed:
             await self._session.close()
 
-    async def _rate_limit(self, requests_queue, limit, period):
-        """Async rate limiter using asyncio.sleep."""
-        current_time = time.time()
+    def rate_limit_provider(self) -> str:
+        return self.__class__.__name__
 
-        while requests_queue and requests_queue[0] <= current_time - period:
-            requests_queue.popleft()
+    def rate_limit_credential(self):
+        """Token du compte utilisé, pour limiter le débit par compte."""
+        return getattr(self, "token", None) or getattr(self, "api_key", None)
 
-        if len(requests_queue) >= limit:
-            sleep_time = requests_queue[0] - (current_time - period)
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-
-        requests_queue.append(time.time())
+    async def _rate_limit(self, scope, limit, period):
+        await rate_limiter.acquire(
+            self.rate_limit_provider(),
+            rate_limiter.account_id(self.rate_limit_credential()),
+            scope,
+            limit,
+            period,
+        )
 
     async def _global_rate_limit(self):
-        await self._rate_limit(self.global_requests, self.global_limit, self.global_period)
+        await self._rate_limit("global", self.global_limit, self.global_period)
 
     async def _torrent_rate_limit(self):
-        await self._rate_limit(self.torrent_requests, self.torrent_limit, self.torrent_period)
+        await self._rate_limit("torrents", self.torrent_limit, self.torrent_period)
 
-    async def json_response(self, url, method="get", data=None, headers=None, files=None, timeout=30, retry_on_429=True):
+    async def json_response(self, url, method="get", data=None, headers=None, files=None, timeout=30, retry_on_429=True, torrent_rate_limit=True):
         """Make an async HTTP request and return JSON response."""
         await self._global_rate_limit()
-        if "torrents" in url:
+        if torrent_rate_limit and "torrents" in url:
             await self._torrent_rate_limit()
 
         session = await self._get_session()
@@ -209,6 +245,44 @@ class BaseDebrid:
                 await asyncio.sleep(wait_time)
             return None
 
+    async def check_availability_chunks(self, hashes, check_chunk, provider=None, answered: set = None) -> list:
+        """
+        Découpe `hashes` en chunks vérifiés en parallèle, sous un plafond par provider.
+        `check_chunk(chunk)` retourne la liste des résultats du chunk, ou None en cas d'échec :
+        un chunk en échec ne fait perdre que ses propres hashes.
+        `answered`, si fourni, reçoit les hashes des chunks qui ont effectivement répondu.
+        """
+        provider = provider or self.__class__.__name__
+        semaphore = _CHUNK_SEMAPHORES.get(provider)
+        if semaphore is None:
+            semaphore = _CHUNK_SEMAPHORES[provider] = asyncio.Semaphore(settings.debrid_availability_chunk_concurrency)
+
+        size = settings.debrid_availability_chunk_size
+        chunks = [hashes[i:i + size] for i in range(0, len(hashes), size)]
+
+        async def _run(index, chunk):
+            async with semaphore:
+                started = time.time()
+                try:
+                    result = await check_chunk(chunk)
+                except Exception as e:
+                    self.logger.warning(f"{provider}: Availability chunk {index + 1}/{len(chunks)} failed: {e}")
+                    result = None
+                latency = time.time() - started
+            availability_chunk_stats.record(provider, len(chunk), latency, result is not None)
+            if result is None:
+                self.logger.warning(f"{provider}: Lost availability for {len(chunk)} hashes (chunk {index + 1}/{len(chunks)})")
+                return []
+            self.logger.debug(
+                f"{provider}: Chunk {index + 1}/{len(chunks)} ({len(chunk)} hashes) answered in {latency:.2f}s"
+            )
+            if answered is not None:
+                answered.update(chunk)
+            return result
+
+        results = await asyncio.gather(*[_run(index, chunk) for index, chunk in enumerate(chunks)])
+        return [item for chunk_result in results for item in chunk_result]
+
     async def wait_for_ready_status(self, check_status_func, timeout=30, interval=5):
         """Async wait for ready status with polling."""
         self.logger.info(f"BaseDebrid: Waiting for {timeout} seconds for caching.")
@@ -238,5 +312,6 @@ class BaseDebrid:
     async def add_magnet(self, magnet, ip=None):
         raise NotImplementedError
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
+        """`answered`, si fourni, reçoit les hashes pour lesquels le provider a réellement répondu."""
         raise NotImplementedError
@@ -14,9 +14,9 @@ class Offcloud(StremThru):
         # Configurer StremThru pour utiliser Offcloud
         self.set_store_credentials("offcloud", self.credentials)
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         """Vérifie la disponibilité des torrents en masse via StremThru"""
-        results = await super().get_availability_bulk(hashes_or_magnets, ip)
+        results = await super().get_availability_bulk(hashes_or_magnets, ip, answered)
         logger.debug(f"Offcloud (via StremThru): {len(results)} torrents en cache trouvés")
         # Note: Pour Offcloud, la liste des fichiers est toujours vide selon la documentation StremThru
         return results
@@ -14,9 +14,9 @@ class PikPak(StremThru):
         # Configurer StremThru pour utiliser PikPak
         self.set_store_credentials("pikpak", self.credentials)
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         """Vérifie la disponibilité des torrents en masse via StremThru"""
-        results = await super().get_availability_bulk(hashes_or_magnets, ip)
+        results = await super().get_availability_bulk(hashes_or_magnets, ip, answered)
         logger.debug(f"PikPak (via StremThru): {len(results)} torrents en cache trouvés")
         return results
 
@@ -176,7 +176,7 @@ class Premiumize(BaseDebrid):
             "transcoded": response.get("transcoded", [False])
         }
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         """Get availability for multiple hashes or magnets"""
         await self._ensure_token_checked()
         if not hashes_or_magnets:
@@ -200,6 +200,8 @@ class Premiumize(BaseDebrid):
         if not response or response.get("status") != "success":
             logger.error("Invalid response from Premiumize API")
             return {}
+        if answered is not None:
+            answered.update(hashes_or_magnets)
 
         result = {}
         for i, hash_or_magnet in enumerate(hashes_or_magnets):
@@ -0,0 +1,156 @@
+"""
+Limiteurs de débit partagés pour les APIs debrid, par (provider, compte, portée).
+
+- "local" : token bucket asyncio, partagé par toutes les requêtes du worker.
+- "redis" : GCRA dans Redis, partagé par tous les workers gunicorn ; retombe
+  sur le token bucket local si Redis est indisponible.
+Les appels attendent leur créneau avant d'envoyer la requête, au lieu de réessayer après un 429.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Dict
+
+from cachetools import LRUCache
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+
+
+class TokenBucket:
+    """Token bucket asyncio : `limit` jetons par `period` secondes, rafale max `limit`."""
+
+    def __init__(self, limit: int, period: float):
+        self.rate = limit / period
+        self.capacity = limit
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Consomme un jeton, retourne le temps attendu."""
+        # Le verrou est gardé pendant l'attente : les appelants sont servis dans l'ordre
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self.tokens < 1:
+                waited = (1 - self.tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self.tokens -= 1
+            return waited
+
+
+# Réserve un créneau (GCRA) et retourne l'attente en ms avant de pouvoir l'utiliser
+_GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local wait = tat - tolerance - now
+if wait < 0 then
+    wait = 0
+end
+local new_tat = tat + emission
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now + tolerance) + 1000)
+return wait
+"""
+
+
+class RedisGCRALimiter:
+    """GCRA partagé entre workers : un créneau toutes les period/limit secondes, rafale de `limit`."""
+
+    _script = None
+
+    def __init__(self, key: str, limit: int, period: float):
+        self.key = f"ratelimit:{key}"
+        self.emission_ms = period * 1000 / limit
+        self.tolerance_ms = self.emission_ms * (limit - 1)
+        self.fallback = TokenBucket(limit, period)
+
+    @classmethod
+    def _get_script(cls):
+        if cls._script is None:
+            cls._script = get_shared_redis_client().register_script(_GCRA_SCRIPT)
+        return cls._script
+
+    async def acquire(self) -> float:
+        if not redis_circuit_breaker.allow_request():
+            return await self.fallback.acquire()
+        try:
+            wait_ms = await self._get_script()(keys=[self.key], args=[self.emission_ms, self.tolerance_ms])
+            redis_circuit_breaker.record_success()
+        except (RedisConnectionError, RedisTimeoutError, ConnectionError) as e:
+            redis_circuit_breaker.record_failure()
+            logger.warning(f"RateLimiter: Redis GCRA unavailable for {self.key}, using local bucket: {e}")
+            return await self.fallback.acquire()
+        except asyncio.CancelledError:
+            redis_circuit_breaker.release_trial()
+            raise
+        except Exception as e:
+            # Redis joignable (erreur de script...) : pas d'échec compté, l'essai half-open éventuel est rendu
+            redis_circuit_breaker.release_trial()
+            logger.warning(f"RateLimiter: Redis GCRA failed for {self.key}, using local bucket: {e}")
+            return await self.fallback.acquire()
+        waited = float(wait_ms) / 1000
+        if waited > 0:
+            await asyncio.sleep(waited)
+        return waited
+
+
+class RateLimiterStats:
+    def __init__(self):
+        self._keys: Dict[str, dict] = {}
+
+    def record(self, name: str, waited: float):
+        entry = self._keys.setdefault(name, {"acquired": 0, "throttled": 0, "total_wait": 0.0})
+        entry["acquired"] += 1
+        if waited > 0:
+            entry["throttled"] += 1
+            entry["total_wait"] += waited
+
+    def stats(self) -> dict:
+        return {
+            name: {**entry, "total_wait": round(entry["total_wait"], 3)}
+            for name, entry in self._keys.items()
+        }
+
+
+rate_limiter_stats = RateLimiterStats()
+
+# Un limiteur évincé repart simplement avec un bucket plein
+_LIMITERS = LRUCache(maxsize=10000)
+
+
+def account_id(credential) -> str:
+    """Identifiant non réversible du compte, pour ne pas stocker de token dans les clés."""
+    return hashlib.sha256(str(credential or "anonymous").encode()).hexdigest()[:16]
+
+
+async def acquire(provider: str, account: str, scope: str, limit: int, period: float) -> float:
+    """Attend un créneau pour (provider, compte, portée) ; retourne le temps attendu."""
+    key = (provider, account, scope)
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        if settings.debrid_rate_limit_backend == "redis":
+            limiter = RedisGCRALimiter(f"{provider}:{account}:{scope}", limit, period)
+        else:
+            limiter = TokenBucket(limit, period)
+        _LIMITERS[key] = limiter
+
+    waited = await limiter.acquire()
+    rate_limiter_stats.record(f"{provider}:{scope}", waited)
+    if waited > 0:
+        logger.debug(f"RateLimiter: {provider} {scope} throttled for {waited:.2f}s")
+    return waited
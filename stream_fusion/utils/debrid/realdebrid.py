@@ -7,6 +7,8 @@ from fastapi import HTTPException
 
 from stream_fusion.services.rd_conn.token_manager import RDTokenManager
 from stream_fusion.utils.debrid.base_debrid import BaseDebrid
+from stream_fusion.utils.debrid.rate_limiter import account_id
+from stream_fusion.utils.debrid.torrent_index import DebridTorrentIndex
 from stream_fusion.utils.general import (
     get_info_hash_from_magnet,
     is_video_file,
@@ -17,12 +19,18 @@ from stream_fusion.logging_config import logger
 
 
 class RealDebrid(BaseDebrid):
+    TORRENTS_PAGE_SIZE = 2500
+
     def __init__(self, config, session: aiohttp.ClientSession = None):
         super().__init__(config, session)
         self.base_url = f"{settings.rd_base_url}/{settings.rd_api_version}/"
         if not settings.rd_unique_account:
             self.token_manager = RDTokenManager(config)
 
+    def rate_limit_credential(self):
+        # Pas de get_headers() ici : il peut déclencher un renouvellement de token
+        return settings.rd_token if settings.rd_unique_account else self.config.get("RDToken")
+
     def get_headers(self):
         if settings.rd_unique_account:
             if not settings.proxied_link:
@@ -75,7 +83,9 @@ class RealDebrid(BaseDebrid):
 
     async def delete_torrent(self, id):
         url = f"{self.base_url}torrents/delete/{id}"
-        return await self.json_response(url, method="delete", headers=self.get_headers())
+        response = await self.json_response(url, method="delete", headers=self.get_headers())
+        await self._torrent_index().remove(id)
+        return response
 
     async def get_torrent_info(self, torrent_id):
         logger.info(f"Real-Debrid: Getting torrent info for ID: {torrent_id}")
@@ -143,13 +153,16 @@ class RealDebrid(BaseDebrid):
             await asyncio.sleep(interval)
         return None
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         await self._torrent_rate_limit()
         if len(hashes_or_magnets) == 0:
             logger.info("Real-Debrid: No hashes to be sent.")
             return dict()
         url = f"{self.base_url}torrents/instantAvailability/{'/'.join(hashes_or_magnets)}"
-        return await self.json_response(url, headers=self.get_headers())
+        response = await self.json_response(url, headers=self.get_headers())
+        if isinstance(response, dict) and answered is not None:
+            answered.update(hashes_or_magnets)
+        return response
 
     async def get_stream_link(self, query, config=None, ip=None):
         # Extract query parameters
@@ -206,7 +219,49 @@ class RealDebrid(BaseDebrid):
         logger.info(f"Real-Debrid: Got download link: {unrestrict_response['download']}")
         return unrestrict_response["download"]
 
+    def _torrent_index(self) -> DebridTorrentIndex:
+        return DebridTorrentIndex(
+            self.rate_limit_provider(), account_id(self.rate_limit_credential()), self._list_all_torrents
+        )
+
+    async def _list_torrents_page(self, page):
+        """Une page de /torrents : [] après la dernière page, None en cas d'erreur."""
+        await self._global_rate_limit()
+        await self._torrent_rate_limit()
+        url = f"{self.base_url}torrents?page={page}&limit={self.TORRENTS_PAGE_SIZE}"
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(total=30)
+        try:
+            async with session.get(url, headers=self.get_headers(), timeout=timeout) as response:
+                # Real-Debrid répond 204 (sans JSON) après la dernière page
+                if response.status == 204:
+                    return []
+                await self._log_and_raise(response)
+                torrents = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"Real-Debrid: Failed to list torrents page {page}: {e}")
+            return None
+        return torrents if isinstance(torrents, list) else None
+
+    async def _list_all_torrents(self):
+        """(hash, id) de tout le compte ; None si une page échoue, pour garder l'index précédent."""
+        entries = []
+        page = 1
+        while True:
+            torrents = await self._list_torrents_page(page)
+            if torrents is None:
+                return None
+            entries.extend((torrent["hash"], torrent["id"]) for torrent in torrents)
+            if len(torrents) < self.TORRENTS_PAGE_SIZE:
+                return entries
+            page += 1
+
     async def _get_cached_torrent_ids(self, info_hash):
+        torrent_ids = await self._torrent_index().lookup(info_hash)
+        if torrent_ids is not None:
+            logger.info(f"Real-Debrid: Resolved hash {info_hash} from the account torrent index")
+            return torrent_ids
+
         await self._torrent_rate_limit()
         url = f"{self.base_url}torrents"
         torrents = await self.json_response(url, headers=self.get_headers())
@@ -224,6 +279,10 @@ class RealDebrid(BaseDebrid):
     ):
         for cached_torrent_id in cached_ids:
             cached_torrent_info = await self.get_torrent_info(cached_torrent_id)
+            if cached_torrent_info is None:
+                # Supprimé hors de stream-fusion depuis la dernière indexation
+                await self._torrent_index().remove(cached_torrent_id)
+                continue
             if self._torrent_contains_file(
                 cached_torrent_info, file_index, season, episode, stream_type
             ):
@@ -280,7 +339,10 @@ class RealDebrid(BaseDebrid):
             torrent_id = upload_response["id"]
 
         logger.info(f"Real-Debrid: New torrent added with ID: {torrent_id}")
-        return await self.get_torrent_info(torrent_id)
+        torrent_info = await self.get_torrent_info(torrent_id)
+        if torrent_info:
+            await self._torrent_index().add(torrent_info.get("hash"), torrent_id)
+        return torrent_info
 
     async def add_magnet_or_torrent_and_select(self, query, ip=None):
         magnet = query['magnet']
@@ -59,6 +59,9 @@ class StremThru(BaseDebrid):
             "User-Agent": "stream-fusion"
         }
 
+    def rate_limit_provider(self) -> str:
+        return f"StremThru-{self.store_name}"
+
     @staticmethod
     def get_underlying_debrid_code(store_name=None):
         """Retourne le code du service de debrid sous-jacent (RD, AD, TB, PM, etc.)"""
@@ -95,18 +98,15 @@ class StremThru(BaseDebrid):
             logger.warning(f"Exception lors de la vérification du statut premium sur StremThru-{self.store_name}: {e}")
         return False
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         """Vérifie la disponibilité des torrents avec l'API StremThru"""
         if not hashes_or_magnets:
             return []
 
-        results = []
         session = await self._get_session()
         timeout = aiohttp.ClientTimeout(total=5)
 
-        chunk_size = 50
-        for i in range(0, len(hashes_or_magnets), chunk_size):
-            chunk = hashes_or_magnets[i:i + chunk_size]
+        async def check_chunk(chunk):
             magnets = []
 
             for hash_or_magnet in chunk:
@@ -119,35 +119,35 @@ class StremThru(BaseDebrid):
                     magnet_url = hash_or_magnet
                 magnets.append(magnet_url)
 
-            try:
-                url = f"{self.base_url}/magnets/check?magnet={','.join([quote(m) for m in magnets])}"
-                if ip:
-                    url += f"&client_ip={ip}"
-
-                logger.debug(f"Vérification de {len(magnets)} magnets sur StremThru-{self.store_name}")
+            url = f"{self.base_url}/magnets/check?magnet={','.join([quote(m) for m in magnets])}"
+            if ip:
+                url += f"&client_ip={ip}"
 
-                async with session.get(url, headers=self._headers, timeout=timeout) as response:
-                    if response.status == 200:
-                        try:
-                            json_data = await response.json()
-                            if json_data and "data" in json_data and "items" in json_data["data"]:
-                                for item in json_data["data"]["items"]:
-                                    if item.get("status") == "cached":
-                                        hash_value = item["hash"].lower()
-                                        results.append({
-                                            "hash": hash_value,
-                                            "status": "cached",
-                                            "files": item.get("files", []),
-                                            "store_name": self.store_name,
-                                            "debrid": StremThru.get_underlying_debrid_code(self.store_name)
-                                        })
-                                        logger.debug(f"Magnet caché trouvé sur StremThru-{self.store_name}: {hash_value}")
-                        except Exception as json_e:
-                            logger.warning(f"Erreur lors du parsing JSON: {json_e}")
-            except Exception as e:
-                logger.warning(f"Erreur lors de la vérification des magnets sur StremThru-{self.store_name}: {e}")
+            logger.debug(f"Vérification de {len(magnets)} magnets sur StremThru-{self.store_name}")
 
-        return results
+            results = []
+            async with session.get(url, headers=self._headers, timeout=timeout) as response:
+                if response.status != 200:
+                    logger.warning(f"Erreur HTTP {response.status} lors de la vérification des magnets sur StremThru-{self.store_name}")
+                    return None
+                json_data = await response.json()
+                if json_data and "data" in json_data and "items" in json_data["data"]:
+                    for item in json_data["data"]["items"]:
+                        if item.get("status") == "cached":
+                            hash_value = item["hash"].lower()
+                            results.append({
+                                "hash": hash_value,
+                                "status": "cached",
+                                "files": item.get("files", []),
+                                "store_name": self.store_name,
+                                "debrid": StremThru.get_underlying_debrid_code(self.store_name)
+                            })
+                            logger.debug(f"Magnet caché trouvé sur StremThru-{self.store_name}: {hash_value}")
+            return results
+
+        return await self.check_availability_chunks(
+            list(hashes_or_magnets), check_chunk, provider=f"StremThru-{self.store_name}", answered=answered
+        )
 
     async def add_magnet(self, magnet, ip=None, torrent_file_content=None):
         """Ajoute un magnet à StremThru"""
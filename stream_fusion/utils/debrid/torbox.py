@@ -1,16 +1,19 @@
-from itertools import islice
 import uuid
 import asyncio
 import aiohttp
 
 from fastapi import HTTPException
 from stream_fusion.utils.debrid.base_debrid import BaseDebrid
+from stream_fusion.utils.debrid.rate_limiter import account_id
+from stream_fusion.utils.debrid.torrent_index import DebridTorrentIndex
 from stream_fusion.utils.general import get_info_hash_from_magnet, season_episode_in_filename, is_video_file
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
 
 class Torbox(BaseDebrid):
+    TORRENTS_PAGE_SIZE = 1000
+
     def __init__(self, config, session: aiohttp.ClientSession = None):
         super().__init__(config, session)
         self.base_url = f"{settings.tb_base_url}/{settings.tb_api_version}/api"
@@ -75,6 +78,8 @@ class Torbox(BaseDebrid):
         }
         response = await self.json_response(url, method='post', headers=self.get_headers(), data=data)
         logger.info(f"Torbox: Control torrent response: {response}")
+        if operation == "delete":
+            await self._torrent_index().remove(torrent_id)
         return response
 
     async def request_download_link(self, torrent_id, file_id=None, zip_link=False):
@@ -113,17 +118,21 @@ class Torbox(BaseDebrid):
 
         # Check if the torrent is already added
         existing_torrent = await self._find_existing_torrent(info_hash)
+        torrent_info = None
 
         if existing_torrent:
             logger.info(f"Torbox: Found existing torrent with ID: {existing_torrent['id']}")
             torrent_id = existing_torrent["id"]
             # Get full torrent info with files
             torrent_response = await self.get_torrent_info(torrent_id)
-            if not torrent_response or "data" not in torrent_response:
-                logger.error("Torbox: Failed to get torrent info.")
-                return None
-            torrent_info = torrent_response["data"]
-        else:
+            if torrent_response and torrent_response.get("data"):
+                torrent_info = torrent_response["data"]
+            else:
+                # Supprimé hors de stream-fusion depuis la dernière indexation
+                logger.warning(f"Torbox: Existing torrent {torrent_id} is gone, adding it again")
+                await self._torrent_index().remove(torrent_id)
+
+        if torrent_info is None:
             # Add the magnet or torrent file
             add_response = await self.add_magnet_or_torrent(magnet, torrent_download)
             if not add_response or "torrent_id" not in add_response:
@@ -161,22 +170,21 @@ class Torbox(BaseDebrid):
         logger.info(f"Torbox: Got download link: {download_link_response['data']}")
         return download_link_response['data']
 
-    async def get_availability_bulk(self, hashes_or_magnets, ip=None):
+    async def get_availability_bulk(self, hashes_or_magnets, ip=None, answered: set = None):
         logger.info(f"Torbox: Checking availability for {len(hashes_or_magnets)} hashes/magnets")
 
-        all_results = []
-
-        for i in range(0, len(hashes_or_magnets), 50):
-            batch = list(islice(hashes_or_magnets, i, i + 50))
-            logger.info(f"Torbox: Checking batch of {len(batch)} hashes/magnets (batch {i//50 + 1})")
+        async def check_chunk(batch):
             url = f"{self.base_url}/torrents/checkcached?hash={','.join(batch)}&format=list&list_files=true"
-            response = await self.json_response(url, headers=self.get_headers())
-
-            if response and response.get("success") and response["data"]:
-                all_results.extend(response["data"])
-            else:
-                logger.debug(f"Torbox: No cached availability for batch {i//50 + 1}")
+            # Lecture seule : pas soumise à la limite d'ajout de torrents
+            response = await self.json_response(url, headers=self.get_headers(), torrent_rate_limit=False)
+            if not response or not response.get("success"):
                 return None
+            return response["data"] or []
+
+        all_results = await self.check_availability_chunks(list(hashes_or_magnets), check_chunk, answered=answered)
+        if not all_results:
+            logger.debug("Torbox: No cached availability found")
+            return None
 
         logger.info(f"Torbox: Availability check completed for all {len(hashes_or_magnets)} hashes/magnets")
         return {
@@ -185,7 +193,34 @@ class Torbox(BaseDebrid):
             "data": all_results
         }
 
+    def _torrent_index(self) -> DebridTorrentIndex:
+        return DebridTorrentIndex(
+            self.rate_limit_provider(), account_id(self.rate_limit_credential()), self._list_all_torrents
+        )
+
+    async def _list_all_torrents(self):
+        entries = []
+        offset = 0
+        while True:
+            url = f"{self.base_url}/torrents/mylist?offset={offset}&limit={self.TORRENTS_PAGE_SIZE}"
+            response = await self.json_response(url, headers=self.get_headers())
+            if not response or not response.get("success"):
+                return None
+            torrents = response.get("data") or []
+            entries.extend((torrent["hash"], torrent["id"]) for torrent in torrents)
+            if len(torrents) < self.TORRENTS_PAGE_SIZE:
+                return entries
+            offset += self.TORRENTS_PAGE_SIZE
+
     async def _find_existing_torrent(self, info_hash):
+        torrent_ids = await self._torrent_index().lookup(info_hash)
+        if torrent_ids is not None:
+            if not torrent_ids:
+                logger.info("Torbox: No existing torrent found in the account torrent index")
+                return None
+            # Le plus récent en dernier
+            return {"id": torrent_ids[-1], "hash": info_hash}
+
         logger.info(f"Torbox: Searching for existing torrent with hash: {info_hash}")
         torrents = await self.json_response(f"{self.base_url}/torrents/mylist", headers=self.get_headers())
         if torrents and "data" in torrents:
@@ -207,7 +242,9 @@ class Torbox(BaseDebrid):
             logger.error("Torbox: Failed to add magnet/torrent")
             return None
 
-        return response["data"]
+        data = response["data"]
+        await self._torrent_index().add(data.get("hash") or get_info_hash_from_magnet(magnet), data.get("torrent_id"))
+        return data
 
     async def _wait_for_torrent_completion(self, torrent_id, timeout=60, interval=10):
         logger.info(f"Torbox: Waiting for torrent completion, ID: {torrent_id}")
@@ -0,0 +1,146 @@
+"""
+Index Redis hash -> ids de torrents d'un compte debrid.
+
+Évite de télécharger toute la liste /torrents du compte à chaque lecture :
+- construit par pages au premier accès, puis rafraîchi en arrière-plan ;
+- mis à jour à l'ajout et à la suppression de torrents par stream-fusion.
+Toute erreur Redis fait retourner None : l'appelant retombe sur le parcours complet.
+"""
+import asyncio
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+
+# (info_hash, torrent_id) de tout le compte, None en cas d'échec
+FetchAll = Callable[[], Awaitable[Optional[List[Tuple[str, str]]]]]
+
+
+class DebridTorrentIndex:
+    _refreshing: Dict[str, asyncio.Task] = {}
+
+    def __init__(self, provider: str, account: str, fetch_all: FetchAll):
+        self.provider = provider
+        self.fetch_all = fetch_all
+        base = f"debrid_index:{provider}:{account}"
+        self.hashes_key = f"{base}:hashes"  # info_hash -> [ids]
+        self.ids_key = f"{base}:ids"  # id -> info_hash
+        self.built_key = f"{base}:built"
+        self.fresh_key = f"{base}:fresh"
+        self.lock_key = f"{base}:lock"
+
+    async def lookup(self, info_hash: str) -> Optional[List[str]]:
+        """Ids des torrents du compte pour ce hash, None si l'index n'est pas utilisable."""
+        if redis_circuit_breaker.is_open():
+            return None
+        try:
+            client = get_shared_redis_client()
+            built, fresh = await client.exists(self.built_key), await client.exists(self.fresh_key)
+            if not built:
+                if not await self.rebuild():
+                    return None
+            elif not fresh:
+                self._schedule_refresh()
+            ids = await client.hget(self.hashes_key, info_hash.lower())
+        except Exception as e:
+            logger.warning(f"DebridTorrentIndex: {self.provider} lookup failed: {e}")
+            return None
+        return orjson.loads(ids) if ids else []
+
+    async def add(self, info_hash: str, torrent_id):
+        if not info_hash or torrent_id is None:
+            return
+        info_hash, torrent_id = info_hash.lower(), str(torrent_id)
+        try:
+            client = get_shared_redis_client()
+            if not await client.exists(self.built_key):
+                return
+            current = await client.hget(self.hashes_key, info_hash)
+            ids = orjson.loads(current) if current else []
+            if torrent_id not in ids:
+                ids.append(torrent_id)
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(self.hashes_key, info_hash, orjson.dumps(ids))
+                pipe.hset(self.ids_key, torrent_id, info_hash)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"DebridTorrentIndex: {self.provider} add failed: {e}")
+
+    async def remove(self, torrent_id):
+        torrent_id = str(torrent_id)
+        try:
+            client = get_shared_redis_client()
+            info_hash = await client.hget(self.ids_key, torrent_id)
+            if info_hash is None:
+                return
+            info_hash = info_hash.decode()
+            current = await client.hget(self.hashes_key, info_hash)
+            ids = [i for i in (orjson.loads(current) if current else []) if i != torrent_id]
+            async with client.pipeline(transaction=True) as pipe:
+                if ids:
+                    pipe.hset(self.hashes_key, info_hash, orjson.dumps(ids))
+                else:
+                    pipe.hdel(self.hashes_key, info_hash)
+                pipe.hdel(self.ids_key, torrent_id)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"DebridTorrentIndex: {self.provider} remove failed: {e}")
+
+    async def rebuild(self) -> bool:
+        client = get_shared_redis_client()
+        token = uuid.uuid4().hex
+        if not await client.set(self.lock_key, token, nx=True, ex=settings.debrid_index_lock_ttl):
+            # Reconstruction déjà en cours ailleurs : l'index actuel (éventuellement absent) fait foi
+            return bool(await client.exists(self.built_key))
+        try:
+            entries = await self.fetch_all()
+            if entries is None:
+                logger.warning(f"DebridTorrentIndex: {self.provider} listing failed, keeping previous index")
+                # Pas de nouvel essai à chaque lecture tant que le provider échoue
+                await client.set(self.fresh_key, 1, ex=settings.debrid_index_retry_delay)
+                return False
+
+            hashes: Dict[str, List[str]] = {}
+            for info_hash, torrent_id in entries:
+                hashes.setdefault(info_hash.lower(), []).append(str(torrent_id))
+
+            tmp_hashes, tmp_ids = f"{self.hashes_key}:tmp:{token}", f"{self.ids_key}:tmp:{token}"
+            async with client.pipeline(transaction=True) as pipe:
+                if hashes:
+                    pipe.hset(tmp_hashes, mapping={h: orjson.dumps(ids) for h, ids in hashes.items()})
+                    pipe.hset(tmp_ids, mapping={i: h for h, ids in hashes.items() for i in ids})
+                    pipe.rename(tmp_hashes, self.hashes_key)
+                    pipe.rename(tmp_ids, self.ids_key)
+                    pipe.expire(self.hashes_key, settings.debrid_index_max_age)
+                    pipe.expire(self.ids_key, settings.debrid_index_max_age)
+                else:
+                    pipe.delete(self.hashes_key, self.ids_key)
+                pipe.set(self.built_key, 1, ex=settings.debrid_index_max_age)
+                pipe.set(self.fresh_key, 1, ex=settings.debrid_index_refresh_interval)
+                await pipe.execute()
+            logger.info(f"DebridTorrentIndex: {self.provider} index rebuilt with {len(entries)} torrents")
+            return True
+        finally:
+            try:
+                if (await client.get(self.lock_key) or b"").decode() == token:
+                    await client.delete(self.lock_key)
+            except Exception:
+                pass
+
+    def _schedule_refresh(self):
+        if self.fresh_key in self._refreshing:
+            return
+
+        async def _refresh():
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.warning(f"DebridTorrentIndex: {self.provider} background refresh failed: {e}")
+
+        task = asyncio.create_task(_refresh())
+        self._refreshing[self.fresh_key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(self.fresh_key, None))
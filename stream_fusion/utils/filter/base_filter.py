@@ -6,10 +6,17 @@ class BaseFilter:
     def filter(self, data):
         raise NotImplementedError
 
+    def accepts(self, item) -> bool:
+        """Prédicat par item, pour les filtres d'exclusion évalués en une passe par filter_items."""
+        raise NotImplementedError
+
+    def is_active(self) -> bool:
+        return self.config is not None and self.can_filter()
+
     def can_filter(self):
         raise NotImplementedError
 
     def __call__(self, data):
-        if self.config is not None and self.can_filter():
+        if self.is_active():
             return self.filter(data)
         return data
@@ -7,6 +7,10 @@ from stream_fusion.utils.filter.base_filter import BaseFilter
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 
+_FRENCH_REGEXES = [
+    (language, re.compile(pattern, re.IGNORECASE)) for language, pattern in FRENCH_PATTERNS.items()
+]
+
 
 class LanguagePriorityFilter(BaseFilter):
     """
@@ -111,8 +115,8 @@ class LanguagePriorityFilter(BaseFilter):
         if not title:
             return None
             
-        for language, pattern in FRENCH_PATTERNS.items():
-            if re.search(pattern, title, re.IGNORECASE):
+        for language, regex in _FRENCH_REGEXES:
+            if regex.search(title):
                 return language
         
         return None
@@ -20,6 +20,9 @@ class QualityExclusionFilter(BaseFilter):
             if self._is_stream_allowed(stream)
         ]
 
+    def accepts(self, stream: TorrentItem) -> bool:
+        return self._is_stream_allowed(stream)
+
     def _is_stream_allowed(self, stream: TorrentItem) -> bool:
 
         parsed_data = stream.parsed_data
@@ -16,6 +16,9 @@ class TitleExclusionFilter(BaseFilter):
         logger.debug(f"TitleExclusionFilter: input {len(data)}, output {len(filtered_items)}")
         return filtered_items
 
+    def accepts(self, stream) -> bool:
+        return self._should_include_stream(stream)
+
     def _should_include_stream(self, stream):
         try:
             title_upper = stream.raw_title.upper()
@@ -1,6 +1,9 @@
 import re
-from typing import List
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
 
+import orjson
+from cachetools import LRUCache
 from RTN import title_match
 
 from stream_fusion.utils.filter.language_filter import LanguageFilter
@@ -10,6 +13,7 @@ from stream_fusion.utils.filter.quality_exclusion_filter import QualityExclusion
 from stream_fusion.utils.filter.title_exclusion_filter import TitleExclusionFilter
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
 
 quality_order = {"2160p": 0, "1080p": 1, "720p": 2, "480p": 3}
 
@@ -99,248 +103,243 @@ def items_sort(items, config):
     return sorted_items
 
 
-def filter_out_non_matching_movies(items, year):
-    logger.info(f"Filters: Filtering non-matching movies for year: {year}")
-    year_min = str(int(year) - 1)
-    year_max = str(int(year) + 1)
-    year_pattern = re.compile(rf"\b{year_max}|{year}|{year_min}\b")
-    filtered_items = []
-    for item in items:
-        if year_pattern.search(item.raw_title):
-            logger.trace(
-                f"Filters: Match found for year {year} in item: {item.raw_title}"
-            )
-            filtered_items.append(item)
-        else:
-            logger.trace(
-                f"Filters: No match found for year {year} in item: {item.raw_title}"
-            )
-    return filtered_items
-
-
-def filter_out_non_matching_series(items, season, episode):
-    logger.info(
-        f"Filters: Filtering non-matching items for season {season} and episode {episode}"
-    )
-    filtered_items = []
-    clean_season = season.replace("S", "")
-    clean_episode = episode.replace("E", "")
-    numeric_season = int(clean_season)
-    numeric_episode = int(clean_episode)
-
-    integrale_pattern = re.compile(
-        r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE
-    )
+_INTEGRALE_PATTERN = re.compile(r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE)
 
-    for item in items:
-        # Ensure parsed_data is valid before accessing it
-        if not item.parsed_data or not hasattr(item.parsed_data, 'seasons') or not hasattr(item.parsed_data, 'episodes'):
-            logger.trace(f"Filters: Skipping item with invalid parsed_data: {item.raw_title}")
-            continue
-
-        if len(item.parsed_data.seasons) == 0 and len(item.parsed_data.episodes) == 0:
-            if integrale_pattern.search(item.raw_title):
-                logger.trace(
-                    f"Filters: Integrale match found for item: {item.raw_title}"
-                )
-                filtered_items.append(item)
-            logger.trace(
-                f"Filters: No season or episode information found for item: {item.raw_title}"
-            )
-            continue
-        if (
-            len(item.parsed_data.episodes) == 0
-            and numeric_season in item.parsed_data.seasons
-        ):
-            logger.trace(
-                f"Filters: Exact season match found for item: {item.raw_title}"
-            )
-            filtered_items.append(item)
-            continue
-        if (
-            numeric_season in item.parsed_data.seasons
-            and numeric_episode in item.parsed_data.episodes
-        ):
-            logger.trace(
-                f"Filters: Exact season and episode match found for item: {item.raw_title}"
-            )
-            filtered_items.append(item)
-            continue
-
-    logger.debug(
-        f"Filters: Filtering complete. {len(filtered_items)} matching items found out of {len(items)} total"
-    )
-    return filtered_items
+# Dictionary of characters to filter, grouped by category
+_CHARACTERS_TO_FILTER = {
+    "punctuation": r'<>"/\\|?*',
+    "control": r"\x00-\x1F",
+    "symbols": r"\u2122\u00AE\u00A9\u2120\u00A1\u00BF\u2013\u2014\u2018\u2019\u201C\u201D\u2022\u2026",
+    "spaces": r"\s+",
+}
+_FILTER_PATTERN = re.compile("".join([f"[{chars}]" for chars in _CHARACTERS_TO_FILTER.values()]))
+_COLON_BEFORE_WORD = re.compile(r":(\S)")
+_COLON = re.compile(r"\s*:\s*")
+_SPACES = re.compile(_CHARACTERS_TO_FILTER["spaces"])
 
 
 def clean_tmdb_title(title):
-    # Dictionary of characters to filter, grouped by category
-    characters_to_filter = {
-        "punctuation": r'<>"/\\|?*',
-        "control": r"\x00-\x1F",
-        "symbols": r"\u2122\u00AE\u00A9\u2120\u00A1\u00BF\u2013\u2014\u2018\u2019\u201C\u201D\u2022\u2026",
-        "spaces": r"\s+",
-    }
-
-    filter_pattern = "".join([f"[{chars}]" for chars in characters_to_filter.values()])
-    cleaned_title = re.sub(r":(\S)", r" \1", title)
-    cleaned_title = re.sub(r"\s*:\s*", " ", cleaned_title)
-    cleaned_title = re.sub(filter_pattern, " ", cleaned_title)
+    cleaned_title = _COLON_BEFORE_WORD.sub(r" \1", title)
+    cleaned_title = _COLON.sub(" ", cleaned_title)
+    cleaned_title = _FILTER_PATTERN.sub(" ", cleaned_title)
     cleaned_title = cleaned_title.strip()
-    cleaned_title = re.sub(characters_to_filter["spaces"], " ", cleaned_title)
+    cleaned_title = _SPACES.sub(" ", cleaned_title)
 
     return cleaned_title
 
 
-def remove_non_matching_title(items, titles):
-    filtered_items = []
-    integrale_pattern = re.compile(
-        r"\b(INTEGRALE|COMPLET|COMPLETE|INTEGRAL)\b", re.IGNORECASE
-    )
-    cleaned_titles = [clean_tmdb_title(title) for title in titles]
-    cleaned_titles = [
-        integrale_pattern.sub("", title).strip() for title in cleaned_titles
-    ]
-    logger.info(f"Filters: Removing items not matching titles: {cleaned_titles}")
-
-    def normalize_words(text):
-        return [w for w in text.lower().split() if w]
-
-    def is_ordered_subset(subset, full_set):
-        subset_words = normalize_words(subset)
-        full_set_words = normalize_words(full_set)
-        subset_index = 0
-        for word in full_set_words:
-            if subset_index < len(subset_words) and word == subset_words[subset_index]:
-                subset_index += 1
-        return subset_index == len(subset_words)
-
-    for item in items:
-        if hasattr(item, "_ensure_parsed_data_valid"):
-            item._ensure_parsed_data_valid()
+@lru_cache(maxsize=settings.filter_title_cache_size)
+def _title_tokens(title: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """(titre sans mention d'intégrale, en minuscules, mots) — calculé une fois par titre."""
+    cleaned = _INTEGRALE_PATTERN.sub("", title).strip()
+    lowered = cleaned.lower()
+    return cleaned, lowered, tuple(lowered.split())
 
-        if item.parsed_data and hasattr(item.parsed_data, "parsed_title"):
-            cleaned_item_title = integrale_pattern.sub(
-                "", item.parsed_data.parsed_title
-            ).strip()
-        else:
-            cleaned_item_title = integrale_pattern.sub("", item.raw_title).strip()
 
-        item_words = normalize_words(cleaned_item_title)
+@lru_cache(maxsize=settings.filter_title_cache_size)
+def _cached_title_match(title: str, item_title: str) -> bool:
+    return title_match(title, item_title)
 
-        for title in cleaned_titles:
-            title_words = normalize_words(title)
 
-            logger.trace(
-                f"Filters: Comparing item title: {cleaned_item_title} with title: {title}"
-            )
+def _is_ordered_subset(subset_words, full_set_words) -> bool:
+    subset_index = 0
+    for word in full_set_words:
+        if subset_index < len(subset_words) and word == subset_words[subset_index]:
+            subset_index += 1
+    return subset_index == len(subset_words)
 
-            # Cas 1: égalité exacte après nettoyage
-            if cleaned_item_title.lower() == title.lower():
-                logger.trace(
-                    f"Filters: Exact cleaned title match. Item accepted: {cleaned_item_title}"
-                )
-                filtered_items.append(item)
-                break
 
-            # Cas 2: le titre de l'item est un sous-ensemble ordonné du titre TMDB
-            # Exemple utile: item un peu tronqué, mais pas plus long que le vrai titre
-            if is_ordered_subset(cleaned_item_title, title):
-                logger.trace(
-                    f"Filters: Ordered subset match found. Item accepted: {cleaned_item_title}"
-                )
-                filtered_items.append(item)
-                break
+class FilterStats:
+    """Compteurs cumulés par étape de filter_items, pour le worker."""
+
+    def __init__(self):
+        self.runs = 0
+        self.items = 0
+        self.plans_built = 0
+        self.rejected: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def stats(self) -> dict:
+        title_cache = _cached_title_match.cache_info()
+        return {
+            "runs": self.runs,
+            "items": self.items,
+            "plans_built": self.plans_built,
+            "plans_cached": len(_PLAN_CACHE),
+            "rejected": dict(self.rejected),
+            "errors": dict(self.errors),
+            "title_match_cache": {"hits": title_cache.hits, "misses": title_cache.misses, "size": title_cache.currsize},
+        }
+
+
+filter_stats = FilterStats()
 
+
+class FilterPlan:
+    """
+    Étapes de filter_items compilées une fois par (config, média) : motifs, titres TMDB
+    nettoyés et filtres instanciés. Toutes les étapes sont évaluées en une seule passe.
+    """
+
+    def __init__(self, media, config, skip_resolution=False):
+        self.stages: List[Tuple[str, Callable[[TorrentItem], bool]]] = []
+
+        if media.type == "series":
+            self.season = int(media.season.replace("S", ""))
+            self.episode = int(media.episode.replace("E", ""))
+            self.stages.append(("season_episode", self._match_series))
+        if media.type == "movie":
+            self.year_pattern = self._year_pattern(media.year)
+            if self.year_pattern is not None:
+                self.stages.append(("year", self._match_year))
+
+        self.titles = []
+        for title in media.titles:
+            cleaned, lowered, words = _title_tokens(clean_tmdb_title(title))
+            self.titles.append((cleaned, lowered, words))
+        self.stages.append(("title", self._match_title))
+
+        # Même ordre qu'avant : langues, taille, mots-clés exclus, puis qualité
+        filters = {
+            "languages": LanguageFilter(config),
+            "maxSize": MaxSizeFilter(config, media.type),
+            "exclusionKeywords": TitleExclusionFilter(config),
+        }
+        if not skip_resolution:
+            filters["exclusion"] = QualityExclusionFilter(config)
+        for filter_name, filter_instance in filters.items():
+            if filter_instance.is_active():
+                self.stages.append((filter_name, filter_instance.accepts))
+
+        self.language_priority_filter = LanguagePriorityFilter(config)
+
+    @staticmethod
+    def _year_pattern(year):
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            logger.warning(f"Filters: Invalid movie year {year!r}, year filtering skipped")
+            return None
+        return re.compile(rf"\b{year + 1}|{year}|{year - 1}\b")
+
+    def _match_year(self, item: TorrentItem) -> bool:
+        return self.year_pattern.search(item.raw_title) is not None
+
+    def _match_series(self, item: TorrentItem) -> bool:
+        parsed = item.parsed_data
+        if not parsed or not hasattr(parsed, "seasons") or not hasattr(parsed, "episodes"):
+            return False
+        if not parsed.seasons and not parsed.episodes:
+            return _INTEGRALE_PATTERN.search(item.raw_title) is not None
+        if self.season not in parsed.seasons:
+            return False
+        return not parsed.episodes or self.episode in parsed.episodes
+
+    def _match_title(self, item: TorrentItem) -> bool:
+        if hasattr(item, "_ensure_parsed_data_valid"):
+            item._ensure_parsed_data_valid()
+        parsed = item.parsed_data
+        raw = parsed.parsed_title if parsed and hasattr(parsed, "parsed_title") else item.raw_title
+        item_title, item_lower, item_words = _title_tokens(raw)
+
+        for title, title_lower, title_words in self.titles:
+            # Cas 1: égalité exacte après nettoyage
+            if item_lower == title_lower:
+                return True
+            # Cas 2: le titre de l'item est un sous-ensemble ordonné du titre TMDB
+            if _is_ordered_subset(item_words, title_words):
+                return True
             # Cas 3: matching flou RTN, mais on protège les titres très courts
             # pour éviter Paradise -> Hell's Paradise
-            if len(title_words) >= 2 or len(item_words) >= 2:
-                if title_match(title, cleaned_item_title):
-                    logger.trace(
-                        f"Filters: title_match() succeeded. Item accepted: {cleaned_item_title}"
-                    )
-                    filtered_items.append(item)
-                    break
+            if (len(title_words) >= 2 or len(item_words) >= 2) and _cached_title_match(title, item_title):
+                return True
+        return False
+
+    def run(self, items: List[TorrentItem]) -> List[TorrentItem]:
+        rejected = dict.fromkeys((name for name, _ in self.stages), 0)
+        errors = {}
+        kept = []
+        for item in items:
+            for name, accepts in self.stages:
+                try:
+                    if not accepts(item):
+                        rejected[name] += 1
+                        break
+                except Exception as e:
+                    # Une étape en erreur laisse passer l'item, comme un filtre en erreur laissait la liste intacte
+                    errors[name] = errors.get(name, 0) + 1
+                    logger.trace(f"Filters: {name} failed on {item.raw_title}: {e}")
+            else:
+                kept.append(item)
+
+        filter_stats.runs += 1
+        filter_stats.items += len(items)
+        for name, count in rejected.items():
+            filter_stats.rejected[name] = filter_stats.rejected.get(name, 0) + count
+        for name, count in errors.items():
+            filter_stats.errors[name] = filter_stats.errors.get(name, 0) + count
+            logger.error(f"Filters: {name} filter failed on {count} items")
+        logger.info(f"Filters: {len(items)} -> {len(kept)} items, rejected per stage: {rejected}")
+        return kept
+
+
+def _plan_key(media, config, skip_resolution) -> tuple:
+    media_key = (
+        media.type,
+        tuple(media.titles),
+        getattr(media, "year", None),
+        getattr(media, "season", None),
+        getattr(media, "episode", None),
+    )
+    config_key = orjson.dumps(
+        {name: config.get(name) for name in _PLAN_CONFIG_FIELDS}, option=orjson.OPT_SORT_KEYS, default=str
+    )
+    return media_key, config_key, skip_resolution
 
-        else:
-            logger.trace(f"Filters: No match found, item skipped: {cleaned_item_title}")
 
-    logger.debug(
-        f"Filters: Title filtering complete. {len(filtered_items)} items kept out of {len(items)} total"
-    )
-    return filtered_items
+# Champs de config lus par les filtres et le tri
+_PLAN_CONFIG_FIELDS = (
+    "languages", "maxSize", "exclusionKeywords", "exclusion", "sort", "debridDownloader", "service",
+)
+_PLAN_CACHE = LRUCache(maxsize=settings.filter_plan_cache_size)
 
-def filter_items(items, media, config, skip_resolution=False):
-    logger.info(f"Filters: Starting item filtering for media: {media.titles[0]}")
-    
-    # Préparer les filtres (SANS le filtre de résolution si skip_resolution=True)
-    filters = {
-        "languages": LanguageFilter(config),
-        "maxSize": MaxSizeFilter(config, media.type),
-        "exclusionKeywords": TitleExclusionFilter(config),
-    }
-    
-    # Ajouter le filtre de résolution seulement si skip_resolution=False
-    if not skip_resolution:
-        filters["exclusion"] = QualityExclusionFilter(config)
-    
-    language_priority_filter = LanguagePriorityFilter(config)
-
-    logger.info(f"Filters: Initial item count: {len(items)}")
-
-    if media.type == "series":
-        logger.info(f"Filters: Filtering out non-matching series torrents")
-        items = filter_out_non_matching_series(items, media.season, media.episode)
-        logger.success(
-            f"Filters: Item count after season/episode filtering: {len(items)}"
-        )
 
-    if media.type == "movie":
-        logger.info(f"Filters: Filtering out non-matching movie torrents")
-        items = filter_out_non_matching_movies(items, media.year)
-        logger.success(f"Filters: Item count after year filtering: {len(items)}")
+def get_filter_plan(media, config, skip_resolution=False) -> FilterPlan:
+    key = _plan_key(media, config, skip_resolution)
+    plan = _PLAN_CACHE.get(key)
+    if plan is None:
+        plan = FilterPlan(media, config, skip_resolution)
+        _PLAN_CACHE[key] = plan
+        filter_stats.plans_built += 1
+    return plan
 
-    logger.info(f"Filters: Filtering out items not matching titles: {media.titles}")
-    items = remove_non_matching_title(items, media.titles)
-    logger.success(f"Filters: Item count after title filtering: {len(items)}")
 
-    for filter_name, filter_instance in filters.items():
-        try:
-            logger.info(
-                f"Filters: Applying {filter_name} filter: {config[filter_name]}"
-            )
-            items = filter_instance(items)
-            logger.success(
-                f"Filters: Item count after {filter_name} filter: {len(items)}"
-            )
-        except Exception as e:
-            logger.error(
-                f"Filters: Error while applying {filter_name} filter", exc_info=e
-            )
+def filter_items(items, media, config, skip_resolution=False):
+    logger.info(f"Filters: Starting item filtering for media: {media.titles[0]}")
+    plan = get_filter_plan(media, config, skip_resolution)
+    items = plan.run(items)
 
     try:
-        logger.info(f"Filters: Applying language priority filter")
-        items = language_priority_filter(items)
-        logger.success(f"Filters: Items sorted by language priority")
-        
+        items = plan.language_priority_filter(items)
+
         language_groups = {}
         for item in items:
             priority = getattr(item, 'language_priority', 999)
             if priority not in language_groups:
                 language_groups[priority] = []
             language_groups[priority].append(item)
-        
+
         sorted_items = []
         for priority in sorted(language_groups.keys()):
             group_items = language_groups[priority]
             sorted_group = items_sort(group_items, config)
             sorted_items.extend(sorted_group)
-            
+
         items = sorted_items
         logger.success(f"Filters: Items sorted by language priority and then by quality")
     except Exception as e:
         logger.error(f"Filters: Error while applying language priority filter", exc_info=e)
-    
+
     logger.success(f"Filters: Filtering complete. Final item count: {len(items)}")
     return items
 
@@ -0,0 +1,99 @@
+"""
+Liste des indexers Jackett et santé de chaque indexer, partagées par tout le process.
+
+- La liste parsée (capacités, langue) est gardée `jackett_indexers_ttl` secondes puis
+  rafraîchie en arrière-plan ; la liste précédente reste servie pendant le rafraîchissement
+  et en cas d'échec.
+- Chaque indexer a un disjoncteur : les erreurs et les réponses plus lentes que
+  `jackett_indexer_slow_threshold` comptent comme des échecs, une recherche annulée aussi ;
+  un indexer ouvert est retiré des recherches pendant `jackett_indexer_reset_timeout`.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.circuit_breaker import CircuitBreaker
+from stream_fusion.utils.jackett.jackett_indexer import JackettIndexer
+
+FetchIndexers = Callable[[], Awaitable[Optional[List[JackettIndexer]]]]
+
+
+class JackettIndexerRegistry:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._indexers: Optional[List[JackettIndexer]] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._health: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, float] = {}
+
+    async def get_indexers(self, fetch: FetchIndexers) -> List[JackettIndexer]:
+        if self._indexers is None:
+            # Premier appel : les recherches concurrentes attendent le même chargement
+            await self._refresh(fetch)
+            return self._indexers or []
+        if time.monotonic() - self._fetched_at >= self.ttl:
+            self._refresh(fetch)
+        return self._indexers
+
+    def _refresh(self, fetch: FetchIndexers) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._load(fetch))
+        return self._refresh_task
+
+    async def _load(self, fetch: FetchIndexers):
+        try:
+            indexers = await fetch()
+        except Exception as e:
+            logger.warning(f"JackettIndexerRegistry: Failed to load indexers: {e}")
+            indexers = None
+        if indexers is None:
+            # Nouvel essai au prochain appel, sans attendre le TTL complet
+            self._fetched_at = time.monotonic() - self.ttl + settings.jackett_indexers_retry_delay
+            return
+        self._indexers = indexers
+        self._fetched_at = time.monotonic()
+        logger.info(f"JackettIndexerRegistry: {len(indexers)} indexers loaded")
+
+    def _breaker(self, indexer_id: str) -> CircuitBreaker:
+        breaker = self._health.get(indexer_id)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                f"Jackett indexer {indexer_id}",
+                failure_threshold=settings.jackett_indexer_failure_threshold,
+                reset_timeout=settings.jackett_indexer_reset_timeout,
+            )
+            self._health[indexer_id] = breaker
+        return breaker
+
+    def healthy(self, indexers: List[JackettIndexer]) -> List[JackettIndexer]:
+        # Sans effet de bord : un indexer retenu peut ne jamais être interrogé (aucune langue commune)
+        selected = [indexer for indexer in indexers if not self._breaker(indexer.id).is_open()]
+        skipped = len(indexers) - len(selected)
+        if skipped:
+            logger.info(f"JackettIndexerRegistry: Skipping {skipped} unhealthy indexers")
+        return selected
+
+    def record(self, indexer_id: str, elapsed: float, success: bool):
+        previous = self._latency.get(indexer_id)
+        self._latency[indexer_id] = elapsed if previous is None else 0.7 * previous + 0.3 * elapsed
+        breaker = self._breaker(indexer_id)
+        if success and elapsed <= settings.jackett_indexer_slow_threshold:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def stats(self) -> dict:
+        return {
+            "indexers": len(self._indexers or []),
+            "age": round(time.monotonic() - self._fetched_at, 1) if self._indexers is not None else None,
+            "health": {
+                indexer_id: {**breaker.stats(), "latency": round(self._latency.get(indexer_id, 0.0), 3)}
+                for indexer_id, breaker in self._health.items()
+            },
+        }
+
+
+jackett_registry = JackettIndexerRegistry(settings.jackett_indexers_ttl)
@@ -1,12 +1,15 @@
 import os
 import asyncio
+import time
 import aiohttp
 import xml.etree.ElementTree as ET
 from typing import List, Optional
 
-from RTN import parse
+from stream_fusion.utils.cache.indexer_cache import indexer_cache, is_empty_torznab
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.utils.jackett.jackett_indexer import JackettIndexer
+from stream_fusion.utils.jackett.jackett_registry import jackett_registry
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -110,7 +113,6 @@ class JackettService:
             titles = [movie.titles[index] for index in index_of_language]
 
         results = []
-        session = await self._get_session()
 
         for index, lang in enumerate(languages):
             params = {
@@ -124,14 +126,9 @@ class JackettService:
             if has_imdb_search_capability:
                 params['imdbid'] = movie.id
 
-            url = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            url += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
-
             try:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    text = await response.text()
-                    results.append(self.__get_torrent_links_from_xml(text))
+                text = await self.__get_results_xml(indexer, params)
+                results.append(self.__get_torrent_links_from_xml(text))
             except Exception:
                 self.logger.exception(
                     f"An exception occurred while searching for a movie on Jackett with indexer {indexer.title} and "
@@ -166,7 +163,6 @@ class JackettService:
             titles = [series.titles[index] for index in index_of_language]
 
         results = []
-        session = await self._get_session()
 
         for index, lang in enumerate(languages):
             params = {
@@ -179,28 +175,12 @@ class JackettService:
             if has_imdb_search_capability:
                 params['imdbid'] = series.id
 
-            url_title = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
-            url_title += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
-
-            url_season = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
             params_season = {**params, 'season': season}
-            url_season += '?' + '&'.join([f'{k}={v}' for k, v in params_season.items()])
-
-            url_ep = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
             params_ep = {**params_season, 'ep': episode}
-            url_ep += '?' + '&'.join([f'{k}={v}' for k, v in params_ep.items()])
 
             try:
-                # Lancer les 3 requêtes en parallèle
-                async with session.get(url_ep) as response_ep:
-                    response_ep.raise_for_status()
-                    text_ep = await response_ep.text()
-                    data_ep = self.__get_torrent_links_from_xml(text_ep)
-
-                async with session.get(url_season) as response_season:
-                    response_season.raise_for_status()
-                    text_season = await response_season.text()
-                    data_season = self.__get_torrent_links_from_xml(text_season)
+                data_ep = self.__get_torrent_links_from_xml(await self.__get_results_xml(indexer, params_ep))
+                data_season = self.__get_torrent_links_from_xml(await self.__get_results_xml(indexer, params_season))
 
                 if data_ep:
                     results.append(data_ep)
@@ -208,12 +188,9 @@ class JackettService:
                     results.append(data_season)
 
                 if not data_ep and not data_season:
-                    async with session.get(url_title) as response_title:
-                        response_title.raise_for_status()
-                        text_title = await response_title.text()
-                        data_title = self.__get_torrent_links_from_xml(text_title)
-                        if data_title:
-                            results.append(data_title)
+                    data_title = self.__get_torrent_links_from_xml(await self.__get_results_xml(indexer, params))
+                    if data_title:
+                        results.append(data_title)
             except Exception:
                 self.logger.exception(
                     f"An exception occurred while searching for a series on Jackett with indexer {indexer.title} and language {lang}."
@@ -221,7 +198,32 @@ class JackettService:
 
         return results
 
+    async def __get_results_xml(self, indexer: JackettIndexer, params: dict) -> str:
+        """Réponse Torznab d'un indexer Jackett, via le cache partagé des indexers."""
+        url = f"{self.__base_url}/indexers/{indexer.id}/results/torznab/api"
+        url += '?' + '&'.join([f'{k}={v}' for k, v in params.items()])
+
+        async def _fetch():
+            session = await self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return await response.text()
+
+        start = time.monotonic()
+        try:
+            text = await indexer_cache.fetch(f"jackett:{indexer.id}", params, _fetch, is_empty=is_empty_torznab)
+        except BaseException:
+            # Annulation comprise (deadline de recherche) : l'indexer n'a pas répondu à temps
+            jackett_registry.record(indexer.id, time.monotonic() - start, success=False)
+            raise
+        jackett_registry.record(indexer.id, time.monotonic() - start, success=True)
+        return text
+
     async def __get_indexers(self) -> List[JackettIndexer]:
+        indexers = await jackett_registry.get_indexers(self.__fetch_indexers)
+        return jackett_registry.healthy(indexers)
+
+    async def __fetch_indexers(self) -> Optional[List[JackettIndexer]]:
         url = f"{self.__base_url}/indexers/all/results/torznab/api?apikey={self.__api_key}&t=indexers&configured=true"
 
         session = await self._get_session()
@@ -232,7 +234,7 @@ class JackettService:
                 return self.__get_indexer_from_xml(text)
         except Exception:
             self.logger.exception("An exception occurred while getting indexers from Jackett.")
-            return []
+            return None
 
     def __get_indexer_from_xml(self, xml_content: str) -> List[JackettIndexer]:
         xml_root = ET.fromstring(xml_content)
@@ -304,7 +306,7 @@ class JackettService:
 
     def __post_process_results(self, results: List[JackettResult], media) -> List[JackettResult]:
         for result in results:
-            parsed_result = parse(result.raw_title)
+            parsed_result = cached_parse(result.raw_title)
 
             result.parsed_data = parsed_result
             result.languages = detect_languages(result.raw_title)
@@ -3,6 +3,8 @@ import logging
 import xml.etree.ElementTree as ET
 from typing import List, Optional
 
+from stream_fusion.utils.cache.indexer_cache import indexer_cache, is_empty_torznab
+
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,11 @@ class LaCaleAPI:
             return None
 
         params["apikey"] = self.api_key
+        return await indexer_cache.fetch(
+            "lacale", params, lambda: self._fetch_xml(params), is_empty=is_empty_torznab
+        )
+
+    async def _fetch_xml(self, params: dict) -> Optional[str]:
         session = await self._get_session()
 
         try:
@@ -1,7 +1,8 @@
-import os
 import aiohttp
 from typing import Optional
 
+from stream_fusion.settings import settings
+from stream_fusion.utils.metdata.metadata_cache import imdb_tmdb_ids, metadata_cache
 from stream_fusion.utils.metdata.metadata_provider_base import MetadataProvider
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -26,7 +27,43 @@ class Cinemeta(MetadataProvider):
 
         session = await self._get_session()
 
-        # Requête Cinemeta
+        # Titre et année ne dépendent que de l'id IMDb : un épisode d'une série déjà vue ne coûte rien
+        cached = await metadata_cache.get(f"cinemeta_{type}", imdb_id)
+        if cached is not None:
+            title, year = cached["title"], cached["year"]
+        else:
+            title, year = await self._fetch_cinemeta(session, imdb_id, type)
+
+        # Check manual mapping for TMDB ID first
+        tmdb_id = self.IMDB_TO_TMDB_MAPPING.get(imdb_id, None)
+
+        if tmdb_id:
+            self.logger.info(f"Using manual mapping: IMDB {imdb_id} → TMDB {tmdb_id}")
+        else:
+            tmdb_id = await self._get_tmdb_id(session, imdb_id, type, title)
+
+        if type == "movie":
+            result = Movie(
+                id=id,
+                tmdb_id=tmdb_id,
+                titles=[title],
+                year=year,
+                languages=["en"]
+            )
+        else:
+            result = Series(
+                id=id,
+                tmdb_id=tmdb_id,
+                titles=[title],
+                season="S{:02d}".format(int(full_id[1])),
+                episode="E{:02d}".format(int(full_id[2])),
+                languages=["en"]
+            )
+
+        self.logger.info("Got metadata for " + type + " with id " + id)
+        return result
+
+    async def _fetch_cinemeta(self, session, imdb_id, type):
         url = f"https://v3-cinemeta.strem.io/meta/{type}/{imdb_id}.json"
         async with session.get(url) as response:
             data = await response.json()
@@ -51,42 +88,41 @@ class Cinemeta(MetadataProvider):
         else:
             title = "Unknown"
 
-        # Check manual mapping for TMDB ID first
-        tmdb_id = self.IMDB_TO_TMDB_MAPPING.get(imdb_id, None)
+        year = data.get("meta", {}).get("year", 2024)
+        if title and title != "Unknown":
+            await metadata_cache.set(f"cinemeta_{type}", imdb_id, {"title": title, "year": year})
+        return title, year
 
-        # If not in manual mapping, try to find TMDB ID from title using TMDB API
-        if not tmdb_id:
-            try:
-                tmdb_api_key = os.environ.get("TMDB_API_KEY", "")
-                if title and title != "Unknown" and tmdb_api_key:
-                    tmdb_url = f"https://api.themoviedb.org/3/search/{type}?query={title}&api_key={tmdb_api_key}"
-                    async with session.get(tmdb_url, timeout=aiohttp.ClientTimeout(total=5)) as tmdb_response:
-                        tmdb_data = await tmdb_response.json()
-                        if tmdb_data.get("results"):
-                            tmdb_id = str(tmdb_data["results"][0]["id"])
-                            self.logger.info(f"Found TMDB ID {tmdb_id} for {type} '{title}'")
-            except Exception as e:
-                self.logger.warning(f"Failed to find TMDB ID for '{title}': {e}")
-        else:
-            self.logger.info(f"Using manual mapping: IMDB {imdb_id} → TMDB {tmdb_id}")
+    async def _get_tmdb_id(self, session, imdb_id, type, title):
+        """Table IMDb -> TMDB d'abord, puis /find par id IMDb, et en dernier recours une recherche par titre."""
+        kind = "movie" if type == "movie" else "tv"
+        mapping = await imdb_tmdb_ids.get(imdb_id)
+        if mapping is not None and mapping[0] == kind:
+            return str(mapping[1])
 
-        if type == "movie":
-            result = Movie(
-                id=id,
-                tmdb_id=tmdb_id,
-                titles=[title],
-                year=data["meta"].get("year", 2024),
-                languages=["en"]
-            )
-        else:
-            result = Series(
-                id=id,
-                tmdb_id=tmdb_id,
-                titles=[title],
-                season="S{:02d}".format(int(full_id[1])),
-                episode="E{:02d}".format(int(full_id[2])),
-                languages=["en"]
-            )
+        if not settings.tmdb_api_key:
+            return None
 
-        self.logger.info("Got metadata for " + type + " with id " + id)
-        return result
+        try:
+            find_url = f"https://api.themoviedb.org/3/find/{imdb_id}?api_key={settings.tmdb_api_key}&external_source=imdb_id"
+            async with session.get(find_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                find_data = await response.json()
+            results = find_data.get("movie_results" if kind == "movie" else "tv_results")
+            if results:
+                tmdb_id = results[0]["id"]
+                await imdb_tmdb_ids.set(imdb_id, kind, tmdb_id)
+                self.logger.info(f"Found TMDB ID {tmdb_id} for IMDB {imdb_id}")
+                return str(tmdb_id)
+
+            # IMDb non lié sur TMDB : id deviné par le titre, non mémorisé dans la table
+            if title and title != "Unknown":
+                tmdb_url = f"https://api.themoviedb.org/3/search/{type}?query={title}&api_key={settings.tmdb_api_key}"
+                async with session.get(tmdb_url, timeout=aiohttp.ClientTimeout(total=5)) as tmdb_response:
+                    tmdb_data = await tmdb_response.json()
+                    if tmdb_data.get("results"):
+                        tmdb_id = str(tmdb_data["results"][0]["id"])
+                        self.logger.info(f"Found TMDB ID {tmdb_id} for {type} '{title}'")
+                        return tmdb_id
+        except Exception as e:
+            self.logger.warning(f"Failed to find TMDB ID for '{title}': {e}")
+        return None
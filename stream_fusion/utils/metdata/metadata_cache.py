@@ -0,0 +1,176 @@
+"""
+Cache des métadonnées TMDB par (type, tmdb_id) : LRU local + Redis partagé.
+
+Une entrée est un dict {"title", "year"} (plus "titles" par langue quand elle vient de
+TMDB.get_metadata) ; à défaut, elle est chargée par un appel asynchrone à /{movie|tv}/{tmdb_id}.
+La table IMDb -> TMDB (hash Redis sans expiration) évite les appels /find pour un titre déjà vu.
+Toute erreur Redis est ignorée : on retombe sur l'appel TMDB.
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from cachetools import LRUCache, TTLCache
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache import codec
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+
+TMDB_API_URL = "https://api.themoviedb.org/3"
+
+
+def parse_year(date: Optional[str]) -> Optional[int]:
+    if not date or len(date) < 4 or not date[:4].isdigit():
+        return None
+    return int(date[:4])
+
+
+def record_from_tmdb(kind: str, data: dict) -> dict:
+    """Entrée de cache à partir d'un résultat TMDB (/find ou /movie|tv/{id})."""
+    if kind == "movie":
+        return {"title": data.get("title"), "year": parse_year(data.get("release_date"))}
+    return {"title": data.get("name"), "year": parse_year(data.get("first_air_date"))}
+
+
+class MetadataCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.ttl = ttl
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(kind: str, tmdb_id) -> str:
+        return f"tmdb_meta:{kind}:{tmdb_id}"
+
+    async def get(self, kind: str, tmdb_id) -> Optional[dict]:
+        key = self._key(kind, tmdb_id)
+        record = self._local.get(key)
+        if record is not None:
+            self.hits += 1
+            return record
+        if redis_circuit_breaker.is_open():
+            return None
+        try:
+            value = await get_shared_redis_client().get(key)
+        except Exception as e:
+            logger.debug(f"MetadataCache: Redis read failed for {key}: {e}")
+            return None
+        if value is None:
+            return None
+        record = codec.decode(value)
+        self._local[key] = record
+        self.redis_hits += 1
+        return record
+
+    async def set(self, kind: str, tmdb_id, record: dict):
+        key = self._key(kind, tmdb_id)
+        self._local[key] = record
+        if redis_circuit_breaker.is_open():
+            return
+        try:
+            await get_shared_redis_client().set(key, codec.encode(record), ex=self.ttl)
+        except Exception as e:
+            logger.debug(f"MetadataCache: Redis write failed for {key}: {e}")
+
+    async def get_or_fetch(self, kind: str, tmdb_id, session: Optional[aiohttp.ClientSession] = None) -> Optional[dict]:
+        if not tmdb_id:
+            return None
+        record = await self.get(kind, tmdb_id)
+        if record is not None:
+            return record
+
+        # Les recherches concurrentes sur le même titre partagent l'appel TMDB
+        key = self._key(kind, tmdb_id)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(kind, tmdb_id, session))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, kind: str, tmdb_id, session: Optional[aiohttp.ClientSession]) -> Optional[dict]:
+        self.misses += 1
+        url = f"{TMDB_API_URL}/{kind}/{tmdb_id}"
+        params = {"api_key": settings.tmdb_api_key, "language": "fr-FR"}
+        timeout = aiohttp.ClientTimeout(total=10)
+        own_session = session is None or session.closed
+        if own_session:
+            session = aiohttp.ClientSession(timeout=timeout)
+        try:
+            async with session.get(url, params=params, timeout=timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
+        except Exception as e:
+            logger.warning(f"MetadataCache: Could not fetch TMDB {kind} {tmdb_id}: {e!r}")
+            return None
+        finally:
+            if own_session:
+                await session.close()
+
+        record = record_from_tmdb(kind, data)
+        await self.set(kind, tmdb_id, record)
+        return record
+
+    def stats(self) -> dict:
+        total = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._local),
+            "maxsize": self._local.maxsize,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.redis_hits) / total, 4) if total else 0.0,
+        }
+
+
+metadata_cache = MetadataCache(settings.metadata_cache_size, settings.metadata_cache_ttl)
+
+
+class ImdbTmdbIds:
+    """Table longue durée imdb_id -> (type TMDB, tmdb_id), partagée par les providers et le catalogue."""
+
+    KEY = "imdb_tmdb_ids"
+
+    def __init__(self, maxsize: int):
+        self._local = LRUCache(maxsize=maxsize)
+
+    async def get(self, imdb_id: str) -> Optional[Tuple[str, int]]:
+        if not imdb_id:
+            return None
+        mapping = self._local.get(imdb_id)
+        if mapping is not None:
+            return mapping
+        if redis_circuit_breaker.is_open():
+            return None
+        try:
+            value = await get_shared_redis_client().hget(self.KEY, imdb_id)
+        except Exception as e:
+            logger.debug(f"ImdbTmdbIds: Redis read failed for {imdb_id}: {e}")
+            return None
+        if value is None:
+            return None
+        kind, _, tmdb_id = value.decode().partition(":")
+        mapping = (kind, int(tmdb_id))
+        self._local[imdb_id] = mapping
+        return mapping
+
+    async def set(self, imdb_id: str, kind: str, tmdb_id):
+        if not imdb_id or not tmdb_id:
+            return
+        mapping = (kind, int(tmdb_id))
+        if self._local.get(imdb_id) == mapping:
+            return
+        self._local[imdb_id] = mapping
+        if redis_circuit_breaker.is_open():
+            return
+        try:
+            await get_shared_redis_client().hset(self.KEY, imdb_id, f"{kind}:{mapping[1]}")
+        except Exception as e:
+            logger.debug(f"ImdbTmdbIds: Redis write failed for {imdb_id}: {e}")
+
+
+imdb_tmdb_ids = ImdbTmdbIds(settings.metadata_cache_size)
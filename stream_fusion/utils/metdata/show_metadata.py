@@ -0,0 +1,61 @@
+"""
+Métadonnées au niveau du titre (film ou série), projetées localement par épisode.
+
+Un enregistrement par (provider, type, id IMDb, langues) contient titres, tmdb_id, année
+et langues ; l'objet Movie/Series d'un épisode en est déduit sans appel au provider.
+"""
+from typing import Awaitable, Callable, List, Union
+
+from stream_fusion.logging_config import logger
+from stream_fusion.utils.metdata.metadata_cache import metadata_cache
+from stream_fusion.utils.models.movie import Movie
+from stream_fusion.utils.models.series import Series
+
+FetchMetadata = Callable[[str, str], Awaitable[Union[Movie, Series]]]
+
+
+def show_record(media: Union[Movie, Series]) -> dict:
+    return {
+        "tmdb_id": media.tmdb_id,
+        "titles": list(media.titles),
+        "languages": list(media.languages),
+        "year": getattr(media, "year", None),
+    }
+
+
+def project(record: dict, stream_id: str, stream_type: str) -> Union[Movie, Series]:
+    """Movie/Series de l'id demandé (tt123 ou tt123:1:5) à partir de l'enregistrement du titre."""
+    if stream_type == "movie":
+        return Movie(
+            id=stream_id,
+            tmdb_id=record["tmdb_id"],
+            titles=list(record["titles"]),
+            year=record["year"],
+            languages=list(record["languages"]),
+        )
+    full_id = stream_id.split(":")
+    return Series(
+        id=stream_id,
+        tmdb_id=record["tmdb_id"],
+        titles=list(record["titles"]),
+        season="S{:02d}".format(int(full_id[1])),
+        episode="E{:02d}".format(int(full_id[2])),
+        languages=list(record["languages"]),
+    )
+
+
+async def get_media(
+    stream_id: str, stream_type: str, provider: str, languages: List[str], fetch: FetchMetadata
+) -> Union[Movie, Series]:
+    """Métadonnées de l'épisode/film : enregistrement du titre en cache, sinon appel au provider."""
+    imdb_id = stream_id.split(":")[0]
+    kind = f"show:{provider}:{stream_type}:{','.join(languages or [])}"
+
+    record = await metadata_cache.get(kind, imdb_id)
+    if record is not None:
+        logger.debug(f"ShowMetadata: {stream_id} projected from cached record of {imdb_id}")
+        return project(record, stream_id, stream_type)
+
+    media = await fetch(stream_id, stream_type)
+    await metadata_cache.set(kind, imdb_id, show_record(media))
+    return media
@@ -2,6 +2,7 @@ import asyncio
 import aiohttp
 from typing import Optional
 
+from stream_fusion.utils.metdata.metadata_cache import imdb_tmdb_ids, metadata_cache, record_from_tmdb
 from stream_fusion.utils.metdata.metadata_provider_base import MetadataProvider
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -14,55 +15,84 @@ class TMDB(MetadataProvider):
         self.logger.info("Getting metadata for " + type + " with id " + id)
 
         full_id = id.split(":")
-        session = await self._get_session()
+        kind = "movie" if type == "movie" else "tv"
+        languages = self.config['languages']
+
+        tmdb_id, record = await self._get_cached_record(full_id[0], kind, languages)
+        if record is None:
+            tmdb_id, record = await self._fetch_record(full_id[0], kind, languages)
+        else:
+            logger.debug(f"TMDB: Metadata for {full_id[0]} served from cache")
 
-        result = None
+        titles = [
+            self.replace_weird_characters(record["titles"][lang])
+            for lang in languages
+            if record["titles"].get(lang)
+        ]
 
-        for lang in self.config['languages']:
-            url = f"https://api.themoviedb.org/3/find/{full_id[0]}?api_key={settings.tmdb_api_key}&external_source=imdb_id&language={lang}"
+        if type == "movie":
+            result = Movie(
+                id=id,
+                tmdb_id=tmdb_id,
+                titles=titles,
+                year=str(record["year"]) if record.get("year") else "",
+                languages=languages
+            )
+        else:
+            season_num = int(full_id[1])
+            episode_num = int(full_id[2])
 
-            async with session.get(url) as response:
-                data = await response.json()
+            result = Series(
+                id=id,
+                tmdb_id=tmdb_id,
+                titles=titles,
+                season="S{:02d}".format(season_num),
+                episode="E{:02d}".format(episode_num),
+                languages=languages
+            )
+
+        self.logger.info("Got metadata for " + type + " with id " + id)
+        return result
 
-            logger.trace(data)
+    async def _get_cached_record(self, imdb_id, kind, languages):
+        """Entrée en cache si le titre est déjà connu dans toutes les langues demandées."""
+        mapping = await imdb_tmdb_ids.get(imdb_id)
+        if mapping is None or mapping[0] != kind:
+            return None, None
+        record = await metadata_cache.get(kind, mapping[1])
+        if not record or not record.get("titles", {}).get(languages[0]):
+            return None, None
+        if any(lang not in record["titles"] for lang in languages):
+            return None, None
+        return mapping[1], record
 
-            if lang == self.config['languages'][0]:
-                if type == "movie":
-                    # Vérifier si movie_results n'est pas vide
-                    if not data.get("movie_results") or len(data["movie_results"]) == 0:
-                        raise ValueError(f"No TMDB results found for movie with IMDB ID {full_id[0]}")
+    async def _find(self, session, imdb_id, lang):
+        url = f"https://api.themoviedb.org/3/find/{imdb_id}?api_key={settings.tmdb_api_key}&external_source=imdb_id&language={lang}"
+        async with session.get(url) as response:
+            data = await response.json()
+        logger.trace(data)
+        return data
 
-                    result = Movie(
-                        id=id,
-                        tmdb_id=data["movie_results"][0]["id"],
-                        titles=[self.replace_weird_characters(data["movie_results"][0]["title"])],
-                        year=data["movie_results"][0]["release_date"][:4],
-                        languages=self.config['languages']
-                    )
-                else:
-                    # Vérifier si tv_results n'est pas vide
-                    if not data.get("tv_results") or len(data["tv_results"]) == 0:
-                        raise ValueError(f"No TMDB results found for series with IMDB ID {full_id[0]}")
+    async def _fetch_record(self, imdb_id, kind, languages):
+        session = await self._get_session()
+        # Une requête /find par langue, toutes en parallèle
+        responses = await asyncio.gather(*[self._find(session, imdb_id, lang) for lang in languages])
 
-                    tmdb_id = data["tv_results"][0]["id"]
-                    season_num = int(full_id[1])
-                    episode_num = int(full_id[2])
+        results_key = "movie_results" if kind == "movie" else "tv_results"
+        first_results = responses[0].get(results_key)
+        if not first_results:
+            label = "movie" if kind == "movie" else "series"
+            raise ValueError(f"No TMDB results found for {label} with IMDB ID {imdb_id}")
 
-                    result = Series(
-                        id=id,
-                        tmdb_id=tmdb_id,
-                        titles=[self.replace_weird_characters(data["tv_results"][0]["name"])],
-                        season="S{:02d}".format(season_num),
-                        episode="E{:02d}".format(episode_num),
-                        languages=self.config['languages']
-                    )
-            else:
-                if type == "movie":
-                    if data.get("movie_results") and len(data["movie_results"]) > 0:
-                        result.titles.append(self.replace_weird_characters(data["movie_results"][0]["title"]))
-                else:
-                    if data.get("tv_results") and len(data["tv_results"]) > 0:
-                        result.titles.append(self.replace_weird_characters(data["tv_results"][0]["name"]))
+        tmdb_id = first_results[0]["id"]
+        cached = await metadata_cache.get(kind, tmdb_id) or {}
+        titles = dict(cached.get("titles", {}))
+        for lang, data in zip(languages, responses):
+            # Langue sans résultat : mémorisée vide pour ne pas la redemander
+            localized = data.get(results_key)
+            titles[lang] = (localized[0].get("title" if kind == "movie" else "name") or "") if localized else ""
 
-        self.logger.info("Got metadata for " + type + " with id " + id)
-        return result
+        record = {**record_from_tmdb(kind, first_results[0]), "titles": titles}
+        await metadata_cache.set(kind, tmdb_id, record)
+        await imdb_tmdb_ids.set(imdb_id, kind, tmdb_id)
+        return tmdb_id, record
@@ -0,0 +1,58 @@
+import threading
+
+from cachetools import LRUCache
+from RTN import parse
+from RTN.models import ParsedData
+
+from stream_fusion.settings import settings
+
+
+class ParseCache:
+    """LRU thread-safe autour de RTN.parse, partagé par tout le process.
+
+    Les ParsedData retournés sont partagés entre appelants : ne pas les modifier.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, raw_title: str) -> ParsedData:
+        with self._lock:
+            parsed = self._cache.get(raw_title)
+            if parsed is not None:
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        # Parsing hors du lock : deux threads peuvent parser la même chaîne, le résultat est identique
+        parsed = parse(raw_title)
+        with self._lock:
+            self._cache[raw_title] = parsed
+        return parsed
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+parse_cache = ParseCache(settings.rtn_parse_cache_size)
+
+
+def cached_parse(raw_title: str) -> ParsedData:
+    return parse_cache.parse(raw_title)
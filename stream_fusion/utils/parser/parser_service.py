@@ -6,6 +6,7 @@ from RTN import ParsedData
 from stream_fusion.settings import settings
 from stream_fusion.utils.models.media import Media
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
+from stream_fusion.utils.parser.parse_cache import cached_parse
 from stream_fusion.utils.string_encoding import encodeb64
 
 from stream_fusion.utils.parser.parser_utils import (
@@ -92,11 +93,9 @@ class StreamParser:
     ) -> List[Dict]:
         """Version synchrone du parsing (CPU-bound)"""
         # Ensure parsed_data is valid ParsedData object, not string or dict
-        from RTN import parse
-
         # Force reparsing if not ParsedData
         if torrent_item.parsed_data is None or not isinstance(torrent_item.parsed_data, ParsedData):
-            torrent_item.parsed_data = parse(torrent_item.raw_title)
+            torrent_item.parsed_data = cached_parse(torrent_item.raw_title)
 
         parsed_data: ParsedData = torrent_item.parsed_data
         name = self._create_stream_name(torrent_item, parsed_data)
@@ -0,0 +1,103 @@
+"""
+Ordonnanceur des pré-chargements d'épisodes : file bornée + pool de workers.
+
+- Un job est identifié par (utilisateur, série, épisode) ; le doublon est écarté dans le
+  worker (file en cours) et entre workers (SET NX Redis pendant prefetch_dedupe_ttl).
+- File pleine : le job est abandonné (pas de back-pressure sur la requête utilisateur).
+- Chaque job est borné par prefetch_job_timeout.
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional, Set
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import get_shared_redis_client, redis_circuit_breaker
+
+PrefetchJob = Callable[[], Awaitable[None]]
+
+
+class PrefetchScheduler:
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending: Set[str] = set()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_workers(self):
+        # Créés au premier job : la boucle asyncio n'existe pas à l'import
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        while len(self._tasks) < self.workers:
+            task = asyncio.create_task(self._worker())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _claim(self, key: str) -> bool:
+        if redis_circuit_breaker.is_open():
+            return True
+        try:
+            return bool(
+                await get_shared_redis_client().set(f"prefetch:{key}", 1, nx=True, ex=settings.prefetch_dedupe_ttl)
+            )
+        except Exception as e:
+            logger.debug(f"PrefetchScheduler: Redis dedupe unavailable for {key}, running locally: {e}")
+            return True
+
+    async def submit(self, key: str, job: PrefetchJob) -> bool:
+        """Met le job en file ; False s'il est déjà prévu (ici ou ailleurs) ou si la file est pleine."""
+        self._ensure_workers()
+        if key in self._pending:
+            self.deduplicated += 1
+            return False
+        if self._queue.full():
+            self.dropped += 1
+            logger.debug(f"PrefetchScheduler: Queue full, dropping {key}")
+            return False
+        if not await self._claim(key):
+            self.deduplicated += 1
+            logger.debug(f"PrefetchScheduler: {key} already scheduled by another worker")
+            return False
+        try:
+            self._queue.put_nowait((key, job))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._pending.add(key)
+        self.submitted += 1
+        return True
+
+    async def _worker(self):
+        while True:
+            key, job = await self._queue.get()
+            try:
+                await asyncio.wait_for(job(), timeout=settings.prefetch_job_timeout)
+                self.completed += 1
+            except asyncio.TimeoutError:
+                self.failed += 1
+                logger.warning(f"PrefetchScheduler: {key} timed out after {settings.prefetch_job_timeout}s")
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"PrefetchScheduler: {key} failed: {e}")
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._tasks),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+prefetch_scheduler = PrefetchScheduler(settings.prefetch_workers, settings.prefetch_queue_size)
@@ -0,0 +1,124 @@
+"""
+Ordonnanceur des recherches indexers : toutes les sources activées partent en même temps.
+
+- Chaque source a un budget de latence appris sur ses derniers temps de réponse
+  (p95 × search_budget_factor), borné par search_min_budget et la deadline globale.
+- On arrête d'attendre dès que `enough()` est vrai, que la deadline est passée, ou que
+  toutes les sources restantes ont dépassé leur budget.
+- Les sources non terminées (« retardataires ») continuent en arrière-plan : `run`
+  retourne leurs tâches pour que l'appelant complète le cache avec leurs résultats.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
+
+SourceFunc = Callable[[], Awaitable[List[Any]]]
+
+
+class SourceLatencyTracker:
+    """Derniers temps de réponse par source, pour le calcul des budgets."""
+
+    MIN_SAMPLES = 5
+
+    def __init__(self, window: int):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._stragglers: Dict[str, int] = {}
+
+    def record(self, source: str, elapsed: float):
+        self._samples.setdefault(source, deque(maxlen=self.window)).append(elapsed)
+
+    def record_straggler(self, source: str):
+        self._stragglers[source] = self._stragglers.get(source, 0) + 1
+
+    def p95(self, source: str) -> Optional[float]:
+        samples = self._samples.get(source)
+        if not samples or len(samples) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def budget(self, source: str) -> float:
+        p95 = self.p95(source)
+        if p95 is None:
+            budget = settings.search_default_budget
+        else:
+            budget = max(settings.search_min_budget, p95 * settings.search_budget_factor)
+        return min(budget, settings.search_deadline)
+
+    def stats(self) -> dict:
+        return {
+            source: {
+                "samples": len(samples),
+                "p95": round(self.p95(source), 3) if self.p95(source) is not None else None,
+                "budget": round(self.budget(source), 3),
+                "stragglers": self._stragglers.get(source, 0),
+            }
+            for source, samples in self._samples.items()
+        }
+
+
+source_latency = SourceLatencyTracker(settings.search_latency_window)
+
+
+class SearchScheduler:
+    def __init__(self, sources: Dict[str, SourceFunc], deadline: float = None):
+        self.sources = sources
+        self.deadline = deadline if deadline is not None else settings.search_deadline
+
+    @staticmethod
+    async def _timed(name: str, func: SourceFunc) -> List[Any]:
+        start = time.monotonic()
+        try:
+            return await func() or []
+        except Exception as e:
+            logger.warning(f"SearchScheduler: {name} search failed, skipping: {e}")
+            return []
+        finally:
+            source_latency.record(name, time.monotonic() - start)
+
+    async def run(
+        self,
+        on_result: Callable[[str, List[Any]], Awaitable[None]],
+        enough: Callable[[], bool],
+    ) -> Dict[asyncio.Task, str]:
+        """
+        Lance toutes les sources et appelle `on_result` pour chacune au fil des réponses.
+
+        :return: tâches des sources retardataires, non attendues (tâche -> nom de la source)
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = {asyncio.create_task(self._timed(name, func)): name for name, func in self.sources.items()}
+        limits = {
+            task: start + min(source_latency.budget(name), self.deadline) for task, name in tasks.items()
+        }
+        pending = set(tasks)
+
+        while pending:
+            now = loop.time()
+            waiting = {task for task in pending if limits[task] > now}
+            if not waiting:
+                break
+            done, _ = await asyncio.wait(
+                waiting, timeout=min(limits[task] for task in waiting) - now, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                pending.discard(task)
+                await on_result(tasks[task], task.result())
+            if enough():
+                break
+
+        stragglers = {task: tasks[task] for task in pending}
+        for name in stragglers.values():
+            source_latency.record_straggler(name)
+        if stragglers:
+            logger.info(
+                f"SearchScheduler: Stopped waiting after {loop.time() - start:.2f}s, "
+                f"continuing in background: {sorted(stragglers.values())}"
+            )
+        return stragglers
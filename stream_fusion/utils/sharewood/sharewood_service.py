@@ -2,7 +2,7 @@ import re
 import urllib.parse
 import aiohttp
 from typing import List, Union, Optional
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.detection import detect_languages
@@ -229,7 +229,7 @@ class SharewoodService:
             item.privacy = "private"
             item.languages = detect_languages(item.raw_title, default_language="fr")
             item.type = media.type
-            item.parsed_data = parse(item.raw_title)
+            item.parsed_data = cached_parse(item.raw_title)
 
             items.append(item)
 
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.cache.indexer_cache import indexer_cache, is_empty_torznab
 
 
 class Torr9RawResult:
@@ -40,6 +41,11 @@ class Torr9API:
             logger.warning("Torr9: API key not configured (TORR9_API_KEY), skipping request")
             return None
         params["apikey"] = self.api_key
+        return await indexer_cache.fetch(
+            "torr9", params, lambda: self._fetch_xml(params), is_empty=is_empty_torznab
+        )
+
+    async def _fetch_xml(self, params: dict) -> Optional[str]:
         session = await self._get_session()
         try:
             async with session.get(
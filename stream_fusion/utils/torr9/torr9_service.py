@@ -2,10 +2,10 @@ from typing import List, Optional, Union
 import re
 
 import aiohttp
-import requests
 
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
+from stream_fusion.utils.metdata.metadata_cache import metadata_cache
 from stream_fusion.utils.torr9.torr9_api import Torr9API
 from stream_fusion.utils.torr9.torr9_result import Torr9Result
 from stream_fusion.utils.models.movie import Movie
@@ -15,6 +15,7 @@ from stream_fusion.utils.models.series import Series
 class Torr9Service:
     def __init__(self, config: dict, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
+        self.session = session
 
         if settings.torr9_unique_account and settings.torr9_api_key:
             api_key = settings.torr9_api_key
@@ -70,7 +71,7 @@ class Torr9Service:
             f"(S{season_num:02d}E{episode_num:02d})"
         )
 
-        raw = self._filter_series_results_for_torr9_only(raw, media)
+        raw = await self._filter_series_results_for_torr9_only(raw, media)
 
         logger.info(
             f"Torr9: {len(raw)} raw results after Torr9 local filtering for '{media.titles[0]}'"
@@ -92,8 +93,8 @@ class Torr9Service:
         logger.info(f"Torr9: Built {len(results)} final Torr9Result objects")
         return results
 
-    def _filter_series_results_for_torr9_only(self, raw_results, media: Series):
-        expected_year = self._get_series_first_air_year(media.tmdb_id)
+    async def _filter_series_results_for_torr9_only(self, raw_results, media: Series):
+        expected_year = await self._get_series_first_air_year(media.tmdb_id)
         season_num = media.get_season_number()
         episode_num = media.get_episode_number()
 
@@ -198,26 +199,6 @@ class Torr9Service:
         title_upper = title.upper()
         return any(marker in title_upper for marker in markers)
 
-    def _get_series_first_air_year(self, tmdb_id):
-        if not tmdb_id:
-            return None
-
-        try:
-            url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
-            response = requests.get(
-                url,
-                params={"api_key": settings.tmdb_api_key, "language": "fr-FR"},
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            first_air_date = data.get("first_air_date")
-            if not first_air_date or len(first_air_date) < 4:
-                return None
-
-            return int(first_air_date[:4])
-
-        except Exception as e:
-            logger.warning(f"Torr9: Could not fetch TMDB year for series {tmdb_id}: {e}")
-            return None
\ No newline at end of file
+    async def _get_series_first_air_year(self, tmdb_id):
+        record = await metadata_cache.get_or_fetch("tv", tmdb_id, self.session)
+        return record.get("year") if record else None
@@ -1,9 +1,9 @@
-from RTN import parse
 from RTN.models import ParsedData
 from urllib.parse import quote
 
 from stream_fusion.utils.models.media import Media
 from stream_fusion.utils.models.series import Series
+from stream_fusion.utils.parser.parse_cache import cached_parse
 from stream_fusion.logging_config import logger
 
 
@@ -32,11 +32,18 @@ class TorrentItem:
         self.full_index = None  # Case where we cannot call RD to get the full index. Else None
         self.availability = False  # If it's instantly available on the debrid service
 
-        # Ensure parsed_data is always set (parse if not provided)
-        if parsed_data is None:
-            from RTN import parse
-            parsed_data = parse(raw_title)
-        self.parsed_data: ParsedData = parsed_data  # Ranked result
+        # Parsed lazily on first access when not provided
+        self._parsed_data: ParsedData | None = parsed_data  # Ranked result
+
+    @property
+    def parsed_data(self) -> ParsedData:
+        if self._parsed_data is None and self.raw_title:
+            self._parsed_data = cached_parse(self.raw_title)
+        return self._parsed_data
+
+    @parsed_data.setter
+    def parsed_data(self, value):
+        self._parsed_data = value
 
     def to_debrid_stream_query(self, media: Media) -> dict:
         return {
@@ -85,7 +92,11 @@ class TorrentItem:
         }
     
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, validate: bool = False):
+        """
+        :param validate: if False (default), parsed_data is rebuilt with model_construct
+                         (no pydantic validation) since it was dumped by to_dict() itself.
+        """
         if not isinstance(data, dict):
             logger.error(f"Expected dict, got {type(data)}")
             return None
@@ -116,23 +127,19 @@ class TorrentItem:
         if data.get('parsed_data'):
             try:
                 # Try to reconstruct ParsedData from dict
-                reconstructed = ParsedData(**data['parsed_data'])
-                logger.debug(f"TorrentItem.from_dict(): Reconstructed ParsedData: {reconstructed}, resolution={getattr(reconstructed, 'resolution', 'UNKNOWN')}")
+                if validate:
+                    reconstructed = ParsedData(**data['parsed_data'])
+                else:
+                    reconstructed = ParsedData.model_construct(**data['parsed_data'])
                 # Validate that reconstruction was successful (not an empty/default object)
                 if reconstructed is not None:
                     instance.parsed_data = reconstructed
                 else:
                     logger.warning(f"TorrentItem.from_dict(): Reconstructed ParsedData is None, will re-parse")
-                    instance.parsed_data = parse(instance.raw_title)
             except Exception as e:
                 logger.warning(f"Failed to reconstruct ParsedData from cache: {e}, will re-parse")
-                instance.parsed_data = parse(instance.raw_title)
         else:
-            # Fallback to parsing if no cached parsed_data
-            logger.debug(f"TorrentItem.from_dict(): No parsed_data in cache dict, will parse")
-            instance.parsed_data = parse(instance.raw_title)
-
-        resolution = getattr(instance.parsed_data, 'resolution', 'UNKNOWN') if instance.parsed_data else 'NONE'
-        logger.debug(f"TorrentItem.from_dict(): '{instance.raw_title[:60]}' → resolution='{resolution}'")
+            # parsed_data sera calculé à la première lecture
+            logger.debug(f"TorrentItem.from_dict(): No parsed_data in cache dict, will parse lazily")
 
         return instance
@@ -1,14 +1,16 @@
+import asyncio
 import hashlib
 import os
 import time
 import urllib.parse
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import pathlib
 import json
 
+import aiohttp
 import bencodepy
-import requests
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import cached_parse
 from RTN.models import ParsedData
 
 from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
@@ -21,17 +23,65 @@ from stream_fusion.utils.general import get_info_hash_from_magnet
 from stream_fusion.logging_config import logger
 from stream_fusion.settings import settings
 
+
+class IndexerRateLimiter:
+    """Espacement minimal async entre deux requêtes vers un même indexer (remplace time.sleep)."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Process-wide: les limites s'appliquent à toutes les requêtes du worker, pas par recherche
+_RATE_LIMITERS = {
+    "sharewood": IndexerRateLimiter(1.0),  # API limit 1 request per second
+    "yggflix": IndexerRateLimiter(0.1),  # fair usage for small VPS
+    "web": IndexerRateLimiter(0.2),
+}
+_FETCH_SEMAPHORE: Optional[asyncio.Semaphore] = None
+_DECODE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.torrent_decode_workers, thread_name_prefix="torrent-decode"
+)
+
+
+def _get_fetch_semaphore() -> asyncio.Semaphore:
+    global _FETCH_SEMAPHORE
+    if _FETCH_SEMAPHORE is None:
+        _FETCH_SEMAPHORE = asyncio.Semaphore(settings.torrent_fetch_max_concurrency)
+    return _FETCH_SEMAPHORE
+
+
 class TorrentService:
     TORRENT_CACHE_DIR = pathlib.Path("/var/cache/torrents")
 
-    def __init__(self, config, torrent_dao: TorrentItemDAO):
+    def __init__(self, config, torrent_dao: TorrentItemDAO, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.torrent_dao = torrent_dao
         self.logger = logger
-        self.__session = requests.Session()
+        self.__session = session
+        self.__owns_session = False
         # Ensure cache directory exists
         self.TORRENT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.__session is None or self.__session.closed:
+            self.__session = aiohttp.ClientSession()
+            self.__owns_session = True
+        return self.__session
+
+    async def close(self):
+        if self.__owns_session and self.__session and not self.__session.closed:
+            await self.__session.close()
+
     @staticmethod
     def __generate_unique_id(raw_title: str, indexer: str = "cached") -> str:
         unique_string = f"{raw_title}_{indexer}"
@@ -97,19 +147,33 @@ class TorrentService:
     async def convert_and_process(self, results: List[JackettResult | ZileanResult | YggflixResult | SharewoodResult], skip_yggflix_download: bool = False):
         """
         Convert and process torrent results.
+        Each batch costs one DB read (bulk lookup) and one DB write (bulk insert).
 
         Args:
             results: List of torrent results to process
             skip_yggflix_download: If True, don't download .torrent files from Yggflix (just update metadata)
                                   Used during search to avoid heavy downloads. Set to False for actual playback.
         """
-        torrent_items_result = []
+        torrent_items = [result.convert_to_torrent_item() for result in results]
+        if not torrent_items:
+            return []
 
-        for result in results:
-            torrent_item = result.convert_to_torrent_item()
+        # Une seule lecture DB pour tout le batch
+        unique_ids = [self.__generate_unique_id(item.raw_title, item.indexer) for item in torrent_items]
+        try:
+            cached_models = await self.torrent_dao.get_torrent_items_by_ids(unique_ids)
+        except Exception as e:
+            self.logger.error(f"TorrentService: Error getting cached torrents: {e}")
+            cached_models = {}
 
-            cached_item = await self.get_cached_torrent(torrent_item.raw_title, torrent_item.indexer)
-            if cached_item:
+        torrent_items_result = []
+        to_download = []
+        to_cache = []
+
+        for unique_id, torrent_item in zip(unique_ids, torrent_items):
+            cached_model = cached_models.get(unique_id)
+            if cached_model:
+                cached_item = cached_model.to_torrent_item()
                 # Pour Yggflix: mettre à jour les seeders frais en mémoire (sans écriture DB)
                 if torrent_item.indexer == "Yggtorrent - API":
                     cached_item.seeders = torrent_item.seeders
@@ -125,86 +189,133 @@ class TorrentService:
             if skip_yggflix_download and settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
                 # Don't process, just cache the raw item (without .torrent file and info_hash)
                 # The info_hash will be set to None, magnet will be empty
-                await self.cache_torrent(torrent_item)
+                to_cache.append((unique_id, torrent_item))
                 torrent_items_result.append(torrent_item)
                 continue
 
-            if torrent_item.link.startswith("magnet:"):
-                processed_torrent_item = self.__process_magnet(torrent_item)
-            elif settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
-                processed_torrent_item = self.__process_sharewood_web_url(torrent_item)
-            elif settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
-                processed_torrent_item = self.__process_ygg_api_url(torrent_item)
-            else:
-                processed_torrent_item = self.__process_web_url(torrent_item)
+            to_download.append((len(torrent_items_result), unique_id, torrent_item))
+            torrent_items_result.append(torrent_item)
+
+        if to_download:
+            processed_items = await asyncio.gather(
+                *[self.__process_new_item(torrent_item) for _, _, torrent_item in to_download]
+            )
+            for (position, unique_id, _), processed_torrent_item in zip(to_download, processed_items):
+                to_cache.append((unique_id, processed_torrent_item))
+                torrent_items_result[position] = processed_torrent_item
 
-            await self.cache_torrent(processed_torrent_item)
-            torrent_items_result.append(processed_torrent_item)
+        # Une seule écriture DB pour tout le batch
+        await self.cache_torrents(to_cache)
 
         return torrent_items_result
-        
-    def __process_sharewood_web_url(self, result: TorrentItem):
+
+    async def cache_torrents(self, items: List[Tuple[str, TorrentItem]]):
+        to_insert = []
+        for unique_id, torrent_item in items:
+            # C411/Torr9 sans tmdb_id → orphelins, jamais retrouvés → on skip
+            if torrent_item.indexer in ['C411 - API', 'Torr9 - API'] and not torrent_item.tmdb_id:
+                self.logger.debug(f"TorrentService: Skipping {torrent_item.indexer} torrent without tmdb_id: {torrent_item.raw_title}")
+                continue
+            to_insert.append((unique_id, torrent_item))
+
+        if not to_insert:
+            return
+        try:
+            inserted = await self.torrent_dao.bulk_create_torrent_items(to_insert)
+            self.logger.debug(f"TorrentService: Cached {inserted}/{len(to_insert)} new torrents")
+        except Exception as e:
+            self.logger.error(f"TorrentService: Error caching torrents: {str(e)}")
+
+    async def __process_new_item(self, torrent_item: TorrentItem) -> TorrentItem:
+        if torrent_item.link.startswith("magnet:"):
+            return self.__process_magnet(torrent_item)
+        elif settings.sharewood_url and torrent_item.link.startswith(settings.sharewood_url):
+            return await self.__process_sharewood_web_url(torrent_item)
+        elif settings.yggflix_url and torrent_item.link.startswith(settings.yggflix_url):
+            return await self.__process_ygg_api_url(torrent_item)
+        else:
+            return await self.__process_web_url(torrent_item)
+
+    async def __fetch(self, url: str, indexer: str, timeout: int, allow_redirects: bool = True):
+        """Télécharge une URL sous le rate limit de l'indexer et le sémaphore global.
+
+        :return: (status, headers, body) ; asyncio.TimeoutError / aiohttp.ClientError sont propagées.
+        """
+        session = await self._get_session()
+        # Le créneau est pris avant le sémaphore : une attente de rate limit ne bloque pas les autres indexers
+        await _RATE_LIMITERS[indexer].acquire()
+        async with _get_fetch_semaphore():
+            async with session.get(
+                url, allow_redirects=allow_redirects, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                body = await response.read() if response.status == 200 else b""
+                return response.status, response.headers, body
+
+    async def __process_downloaded_torrent(self, result: TorrentItem, torrent_file: bytes):
+        # Décodage bencode + parsing RTN hors de l'event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_DECODE_EXECUTOR, self.__process_torrent, result, torrent_file)
+
+    async def __process_sharewood_web_url(self, result: TorrentItem):
         if not self.config["sharewood"]:
             logger.error("Sharewood is not enabled in the config. Skipping processing of Sharewood URL.")
-        
+
         try:
-            time.sleep(1) # API limit 1 request per second
-            response = self.__session.get(result.link, allow_redirects=True, timeout=5)
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            status, _, content = await self.__fetch(result.link, "sharewood", timeout=5)
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
-        
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
+
+        if status == 200:
+            return await self.__process_downloaded_torrent(result, content)
         else:
-            self.logger.error(f"Error code {response.status_code} while processing sharewood url: {result.link}")
+            self.logger.error(f"Error code {status} while processing sharewood url: {result.link}")
 
         return result
 
 
-    def __process_ygg_api_url(self, result: TorrentItem): 
+    async def __process_ygg_api_url(self, result: TorrentItem):
         if not self.config["yggflix"]:
             logger.error("Yggflix is not enabled in the config. Skipping processing of Yggflix URL.")
         try:
-            response = self.__session.get(result.link, timeout=10)
-            time.sleep(0.1) # Add a delay of 0.1 seconds between requests faire usage for small VPS
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            status, _, content = await self.__fetch(result.link, "yggflix", timeout=10)
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
-        
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 422:
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
+
+        if status == 200:
+            return await self.__process_downloaded_torrent(result, content)
+        elif status == 422:
             self.logger.info(f"Not aviable torrent on yggflix: {result.file_name}")
         else:
-            self.logger.error(f"Error code {response.status_code} while processing ygg url: {result.link}")
+            self.logger.error(f"Error code {status} while processing ygg url: {result.link}")
 
         return result
 
-    def __process_web_url(self, result: TorrentItem):
+    async def __process_web_url(self, result: TorrentItem):
         try:
-            time.sleep(0.2)
-            response = self.__session.get(result.link, allow_redirects=False, timeout=40) # flaresolverr and Jackett timeouts
-        except requests.exceptions.RequestException:
-            self.logger.error(f"Error while processing url: {result.link}")
-            return result
-        except requests.exceptions.ReadTimeout:
+            # flaresolverr and Jackett timeouts
+            status, headers, content = await self.__fetch(result.link, "web", timeout=40, allow_redirects=False)
+        except asyncio.TimeoutError:
             self.logger.error(f"Timeout while processing url: {result.link}")
             return result
+        except aiohttp.ClientError:
+            self.logger.error(f"Error while processing url: {result.link}")
+            return result
 
-        if response.status_code == 200:
-            return self.__process_torrent(result, response.content)
-        elif response.status_code == 302:
-            result.magnet = response.headers['Location']
+        if status == 200:
+            return await self.__process_downloaded_torrent(result, content)
+        elif status == 302:
+            result.magnet = headers['Location']
             return self.__process_magnet(result)
         else:
-            self.logger.error(f"Error code {response.status_code} while processing url: {result.link}")
+            self.logger.error(f"Error code {status} while processing url: {result.link}")
 
         return result
 
@@ -255,10 +366,6 @@ class TorrentService:
         result.files = metadata["info"]["files"]
 
         if result.type == "series":
-            # Ensure we have parsed_data from raw_title
-            if not result.parsed_data:
-                result.parsed_data = parse(result.raw_title)
-
             # Only try to find episode file if we have valid parsed_data
             if result.parsed_data and isinstance(result.parsed_data, ParsedData):
                 file_details = self.__find_single_episode_file(result.files, result.parsed_data.seasons, result.parsed_data.episodes)
@@ -349,7 +456,7 @@ class TorrentService:
         for files in file_structure:
             for file in files["path"]:
 
-                parsed_file = parse(file)
+                parsed_file = cached_parse(file)
 
                 if season[0] in parsed_file.seasons and episode[0] in parsed_file.episodes:
                     episode_files.append({
@@ -386,7 +493,7 @@ class TorrentService:
             _, file_extension = os.path.splitext(file_name.lower())
             
             if file_extension in video_formats:
-                parsed_file = parse(file_name)
+                parsed_file = cached_parse(file_name)
                 if len(parsed_file.seasons) == 0 or len(parsed_file.episodes) == 0:
                     self.logger.debug(f"Skipping file without season or episode parsed: {file_name}")
                     continue
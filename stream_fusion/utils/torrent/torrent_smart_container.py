@@ -2,7 +2,7 @@ import os
 import threading
 
 from typing import List, Dict
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.utils.debrid.alldebrid import AllDebrid
 from stream_fusion.utils.debrid.premiumize import Premiumize
@@ -16,6 +16,8 @@ from stream_fusion.logging_config import logger
 
 
 class TorrentSmartContainer:
+    _AVAILABILITY_FIELDS = ("availability", "file_index", "file_name", "raw_title", "size")
+
     def __init__(self, torrent_items: List[TorrentItem], media):
         self.logger = logger
         self.logger.info(
@@ -120,21 +122,21 @@ class TorrentSmartContainer:
                 self.logger.debug(
                     f"TorrentSmartContainer.get_best_matching: Item '{item.raw_title[:60]}' missing parsed_data, parsing now"
                 )
-                from RTN import parse
-                item.parsed_data = parse(item.raw_title)
+                item.parsed_data = cached_parse(item.raw_title)
 
         self.logger.success(
             f"TorrentSmartContainer: Found {len(best_matching)} best matching items"
         )
         return best_matching
 
-    def _find_matching_file(self, full_index, season, episode):
-        self.logger.trace(
+    @staticmethod
+    def _find_matching_file(full_index, season, episode):
+        logger.trace(
             f"TorrentSmartContainer: Searching for matching file: Season {season}, Episode {episode}"
         )
 
         if not full_index:
-            self.logger.trace(
+            logger.trace(
                 "TorrentSmartContainer: Full index is empty, cannot find matching file"
             )
             return None
@@ -142,7 +144,7 @@ class TorrentSmartContainer:
             target_season = int(season.replace("S", ""))
             target_episode = int(episode.replace("E", ""))
         except ValueError:
-            self.logger.error(
+            logger.error(
                 f"TorrentSmartContainer: Invalid season or episode format: {season}, {episode}"
             )
             return None
@@ -155,17 +157,17 @@ class TorrentSmartContainer:
             ):
                 if best_match is None or file_entry["size"] > best_match["size"]:
                     best_match = file_entry
-                    self.logger.trace(
+                    logger.trace(
                         f"TorrentSmartContainer: Found potential match: {file_entry['file_name']}"
                     )
 
         if best_match:
-            self.logger.trace(
+            logger.trace(
                 f"TorrentSmartContainer: Best matching file found: {best_match['file_name']}"
             )
             return best_match
         else:
-            self.logger.warning(
+            logger.warning(
                 f"TorrentSmartContainer: No matching file found for Season {season}, Episode {episode}"
             )
             return None
@@ -237,6 +239,26 @@ class TorrentSmartContainer:
                 f"TorrentSmartContainer: Debrid type {debrid_type.__name__} not implemented"
             )
 
+    def merge_availability(self, debrid_responses, media):
+        """
+        Applique les réponses de plusieurs debrids dans l'ordre de priorité donné.
+        Comme avec des appels séquentiels, un item déjà disponible via un debrid
+        prioritaire n'est pas modifié par les suivants.
+
+        :param debrid_responses: liste de tuples (debrid_type, response), par priorité
+        """
+        for debrid_type, debrid_response in debrid_responses:
+            confirmed = {
+                info_hash: {field: getattr(item, field) for field in self._AVAILABILITY_FIELDS}
+                for info_hash, item in self.__itemsDict.items()
+                if item.availability
+            }
+            self.update_availability(debrid_response, debrid_type, media)
+            for info_hash, state in confirmed.items():
+                item = self.__itemsDict[info_hash]
+                for field, value in state.items():
+                    setattr(item, field, value)
+
     def _update_availability_realdebrid(self, response, media):
         self.logger.info("TorrentSmartContainer: Updating availability for RealDebrid")
         for info_hash, details in response.items():
@@ -617,7 +639,7 @@ class TorrentSmartContainer:
                         file["e"], files, file_index, type, media
                     )
                     continue
-                parsed_file = parse(file["n"])
+                parsed_file = cached_parse(file["n"])
                 clean_season = media.season.replace("S", "")
                 clean_episode = media.episode.replace("E", "")
                 numeric_season = int(clean_season)
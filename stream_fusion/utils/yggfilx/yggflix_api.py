@@ -1,119 +1,150 @@
 from typing import List, Optional
+import asyncio
 import re
-import requests
+import aiohttp
 import xml.etree.ElementTree as ET
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
+from stream_fusion.utils.cache.indexer_cache import indexer_cache
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requêtes simultanées vers le relay, toutes recherches confondues
+_relay_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_relay_semaphore() -> asyncio.Semaphore:
+    global _relay_semaphore
+    if _relay_semaphore is None:
+        _relay_semaphore = asyncio.Semaphore(settings.yggflix_max_concurrency)
+    return _relay_semaphore
 
 
 class YggflixAPI:
     TORZNAB_NS = {"torznab": "http://torznab.com/schemas/2015/feed"}
+    _ATTR_TAG = "{http://torznab.com/schemas/2015/feed}attr"
 
-    def __init__(self, pool_connections=10, pool_maxsize=50, max_retries=1, timeout=10):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, max_retries=1, timeout=10):
         self.base_url = settings.yggflix_url.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=0.2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-        )
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retry_strategy,
-        )
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-
-    def _make_request(self, params=None):
-        try:
-            response = self.session.get(self.base_url, params=params or {}, timeout=self.timeout)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"YGG Relay HTTP error occurred: {e}")
-            raise
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"YGG Relay connection error occurred: {e}")
-            raise
-        except requests.exceptions.Timeout as e:
-            logger.error(f"YGG Relay timeout error occurred: {e}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"YGG Relay request error: {e}")
-            raise
-
-    def _parse_xml(self, xml_text: str) -> List[dict]:
+        self.max_retries = max_retries
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._external_session = session is not None
+        self._session = session
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self._timeout)
+            self._external_session = False
+        return self._session
+
+    async def close(self):
+        if self._session and not self._external_session and not self._session.closed:
+            await self._session.close()
+
+    async def _search(self, params: dict) -> List[dict]:
+        results = await indexer_cache.fetch("yggflix", params, lambda: self._fetch(params))
+        return results if results is not None else []
+
+    async def _fetch(self, params: dict) -> Optional[List[dict]]:
+        session = await self._get_session()
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                async with _get_relay_semaphore():
+                    async with session.get(self.base_url, params=params, timeout=self._timeout) as response:
+                        if response.status not in _RETRY_STATUSES or last_attempt:
+                            response.raise_for_status()
+                            return await self._parse_xml_stream(response)
+                logger.warning(f"YGG Relay HTTP {response.status}, retrying")
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"YGG Relay HTTP error occurred: {e}")
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    logger.error(f"YGG Relay connection error occurred: {e!r}")
+                    raise
+            await asyncio.sleep(0.2 * (2 ** attempt))
+        return []
+
+    async def _parse_xml_stream(self, response: aiohttp.ClientResponse) -> Optional[List[dict]]:
+        """Parse le flux Torznab au fil de la réception, item par item ; None si le flux est invalide."""
+        parser = ET.XMLPullParser(events=("end",))
+        normalized = []
         try:
-            root = ET.fromstring(xml_text)
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                parser.feed(chunk)
+                self._drain_items(parser, normalized)
+            parser.close()
+            self._drain_items(parser, normalized)
         except ET.ParseError as e:
-            logger.error(f"YGG Relay XML Parse Error: {e}")
-            return []
+            # Réponse tronquée ou invalide : rien n'est mis en cache plutôt qu'une liste partielle
+            logger.error(f"YGG Relay XML Parse Error after {len(normalized)} items: {e}")
+            return None
 
-        items = root.findall(".//item")
-        logger.info(f"YGG Relay found {len(items)} results")
+        logger.info(f"YGG Relay found {len(normalized)} results")
+        return normalized
 
-        normalized = []
-        for item in items:
-            try:
-                title = item.findtext("title", "")
-                size_text = item.findtext("size", "0")
-                link = item.findtext("link", "")
-
-                enclosure = item.find("enclosure")
-                download_link = enclosure.get("url", "") if enclosure is not None else link
-
-                info_hash = None
-                seeders = 0
-                leechers = 0
-                magnet_url = None
-
-                for attr in item.findall("torznab:attr", self.TORZNAB_NS):
-                    name = attr.get("name")
-                    value = attr.get("value")
-                    if name == "infohash":
-                        info_hash = value.lower() if value else None
-                    elif name == "seeders":
-                        seeders = int(value) if value else 0
-                    elif name == "peers":
-                        leechers = int(value) if value else 0
-                    elif name == "magneturl":
-                        magnet_url = value
-
-                final_link = magnet_url or download_link
-
-                if not info_hash and final_link and "btih:" in final_link:
-                    hash_match = re.search(r"btih:([a-fA-F0-9]{40})", final_link, re.IGNORECASE)
-                    if hash_match:
-                        info_hash = hash_match.group(1).lower()
-
-                normalized.append(
-                    {
-                        "name": title,
-                        "size": int(size_text) if size_text else 0,
-                        "tracker_name": "YGG Relay",
-                        "info_hash": info_hash,
-                        "magnet": final_link if final_link.startswith("magnet:") else None,
-                        "link": final_link,
-                        "source": "ygg",
-                        "seeders": seeders,
-                        "leechers": leechers,
-                        "privacy": "public",
-                    }
-                )
-            except Exception as e:
-                logger.debug(f"YGG Relay parse item error: {e}")
+    def _drain_items(self, parser: ET.XMLPullParser, normalized: List[dict]):
+        for _, element in parser.read_events():
+            if element.tag != "item":
                 continue
+            item = self._parse_item(element)
+            if item is not None:
+                normalized.append(item)
+            # Libère l'item déjà traité
+            element.clear()
 
-        return normalized
-
-    def search_movie(self, tmdb_id: Optional[int] = None, title: Optional[str] = None) -> List[dict]:
+    def _parse_item(self, item: ET.Element) -> Optional[dict]:
+        try:
+            title = item.findtext("title", "")
+            size_text = item.findtext("size", "0")
+            link = item.findtext("link", "")
+
+            enclosure = item.find("enclosure")
+            download_link = enclosure.get("url", "") if enclosure is not None else link
+
+            info_hash = None
+            seeders = 0
+            leechers = 0
+            magnet_url = None
+
+            for attr in item.iter(self._ATTR_TAG):
+                name = attr.get("name")
+                value = attr.get("value")
+                if name == "infohash":
+                    info_hash = value.lower() if value else None
+                elif name == "seeders":
+                    seeders = int(value) if value else 0
+                elif name == "peers":
+                    leechers = int(value) if value else 0
+                elif name == "magneturl":
+                    magnet_url = value
+
+            final_link = magnet_url or download_link
+
+            if not info_hash and final_link and "btih:" in final_link:
+                hash_match = re.search(r"btih:([a-fA-F0-9]{40})", final_link, re.IGNORECASE)
+                if hash_match:
+                    info_hash = hash_match.group(1).lower()
+
+            return {
+                "name": title,
+                "size": int(size_text) if size_text else 0,
+                "tracker_name": "YGG Relay",
+                "info_hash": info_hash,
+                "magnet": final_link if final_link.startswith("magnet:") else None,
+                "link": final_link,
+                "source": "ygg",
+                "seeders": seeders,
+                "leechers": leechers,
+                "privacy": "public",
+            }
+        except Exception as e:
+            logger.debug(f"YGG Relay parse item error: {e}")
+            return None
+
+    async def search_movie(self, tmdb_id: Optional[int] = None, title: Optional[str] = None) -> List[dict]:
         params = {"t": "movie"}
         if tmdb_id:
             params["tmdbid"] = tmdb_id
@@ -122,10 +153,9 @@ class YggflixAPI:
         else:
             return []
 
-        xml_text = self._make_request(params=params)
-        return self._parse_xml(xml_text)
+        return await self._search(params)
 
-    def search_series(
+    async def search_series(
         self,
         tmdb_id: Optional[int] = None,
         title: Optional[str] = None,
@@ -145,8 +175,4 @@ class YggflixAPI:
         if episode is not None:
             params["ep"] = episode
 
-        xml_text = self._make_request(params=params)
-        return self._parse_xml(xml_text)
-
-    def __del__(self):
-        self.session.close()
\ No newline at end of file
+        return await self._search(params)
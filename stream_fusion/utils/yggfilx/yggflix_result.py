@@ -1,4 +1,4 @@
-from RTN import parse
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.utils.torrent.torrent_item import TorrentItem
 from stream_fusion.logging_config import logger
@@ -23,7 +23,7 @@ class YggflixResult:
         self.torrent_download = None
 
     def convert_to_torrent_item(self):
-        parsed_data = self.parsed_data or parse(self.raw_title)
+        parsed_data = self.parsed_data or cached_parse(self.raw_title)
         logger.debug(
             f"YggflixResult.convert_to_torrent_item(): "
             f"'{self.raw_title[:60]}' → resolution='{getattr(parsed_data, 'resolution', 'UNKNOWN')}'"
@@ -56,6 +56,6 @@ class YggflixResult:
         self.languages = detect_languages(self.raw_title, default_language="fr")
         self.type = media.type
         self.tmdb_id = getattr(media, "tmdb_id", None)
-        self.parsed_data = parse(self.raw_title)
+        self.parsed_data = cached_parse(self.raw_title)
         self.torrent_download = self.link if self.link and not self.link.startswith("magnet:") else None
         return self
\ No newline at end of file
@@ -1,8 +1,11 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Union, Set
-from RTN import parse
+import asyncio
+from typing import List, Optional, Union, Set
+
+import aiohttp
+from stream_fusion.utils.parser.parse_cache import cached_parse
 
 from stream_fusion.logging_config import logger
+from stream_fusion.settings import settings
 from stream_fusion.utils.detection import detect_languages
 from stream_fusion.utils.yggfilx.yggflix_result import YggflixResult
 from stream_fusion.utils.models.movie import Movie
@@ -11,15 +14,15 @@ from stream_fusion.utils.yggfilx.yggflix_api import YggflixAPI
 
 
 class YggflixService:
-    def __init__(self, config: dict):
-        self.yggflix = YggflixAPI()
+    def __init__(self, config: dict, session: Optional[aiohttp.ClientSession] = None):
+        self.yggflix = YggflixAPI(session=session)
         self.has_tmdb = config.get("metadataProvider") == "tmdb"
 
-    def search(self, media: Union[Movie, Series]) -> List[YggflixResult]:
+    async def search(self, media: Union[Movie, Series]) -> List[YggflixResult]:
         if isinstance(media, Movie):
-            results = self.__search_movie(media)
+            results = await self.__search_movie(media)
         elif isinstance(media, Series):
-            results = self.__search_series(media)
+            results = await self.__search_series(media)
         else:
             raise TypeError("Only Movie and Series types are allowed as media!")
 
@@ -45,7 +48,7 @@ class YggflixService:
             unique.append(normalized)
         return unique
 
-    def __search_movie(self, media: Movie) -> List[dict]:
+    async def __search_movie(self, media: Movie) -> List[dict]:
         titles = self.__unique_titles(getattr(media, "titles", []) or [])
         year = getattr(media, "year", None)
 
@@ -57,28 +60,9 @@ class YggflixService:
             if q:
                 queries.append(q)
 
-        merged_results = []
-        seen_hashes: Set[str] = set()
-
-        for query in queries:
-            try:
-                raw_results = self.yggflix.search_movie(title=query)
-                logger.info(f"YGG Relay movie query '{query}' -> {len(raw_results)} results")
-            except Exception as e:
-                logger.warning(f"YGG Relay movie query failed '{query}': {e}")
-                continue
-
-            for item in raw_results:
-                info_hash = (item.get("info_hash") or "").lower()
-                if info_hash:
-                    if info_hash in seen_hashes:
-                        continue
-                    seen_hashes.add(info_hash)
-                merged_results.append(item)
-
-        return merged_results
+        return await self.__run_queries(queries, self.yggflix.search_movie, "movie")
 
-    def __search_series(self, media: Series) -> List[dict]:
+    async def __search_series(self, media: Series) -> List[dict]:
         titles = self.__unique_titles(getattr(media, "titles", []) or [])
         season_num = media.get_season_number()
         episode_num = media.get_episode_number()
@@ -92,17 +76,27 @@ class YggflixService:
             if season_num is not None:
                 queries.append(f"{title} S{int(season_num):02d}")
 
-        merged_results = []
-        seen_hashes: Set[str] = set()
+        return await self.__run_queries(queries, self.yggflix.search_series, "series")
 
-        for query in queries:
-            try:
-                raw_results = self.yggflix.search_series(title=query)
-                logger.info(f"YGG Relay series query '{query}' -> {len(raw_results)} results")
-            except Exception as e:
-                logger.warning(f"YGG Relay series query failed '{query}': {e}")
-                continue
+    async def __run_queries(self, queries: List[str], search_fn, kind: str) -> List[dict]:
+        """Lance les requêtes en parallèle puis fusionne dans l'ordre des requêtes, sans doublons."""
+        semaphore = asyncio.Semaphore(settings.yggflix_max_workers)
+
+        async def _run(query: str) -> List[dict]:
+            async with semaphore:
+                try:
+                    raw_results = await search_fn(title=query)
+                    logger.info(f"YGG Relay {kind} query '{query}' -> {len(raw_results)} results")
+                    return raw_results
+                except Exception as e:
+                    logger.warning(f"YGG Relay {kind} query failed '{query}': {e!r}")
+                    return []
+
+        all_results = await asyncio.gather(*(_run(query) for query in queries))
 
+        merged_results = []
+        seen_hashes: Set[str] = set()
+        for raw_results in all_results:
             for item in raw_results:
                 info_hash = (item.get("info_hash") or "").lower()
                 if info_hash:
@@ -120,7 +114,7 @@ class YggflixService:
         filtered = []
         for r in results:
             name = r.get("name", "")
-            parsed = parse(name)
+            parsed = cached_parse(name)
 
             if not parsed.seasons:
                 filtered.append(r)
@@ -175,7 +169,7 @@ class YggflixService:
             item.privacy = "public"
             item.languages = detect_languages(item.raw_title, default_language="fr")
             item.type = media.type
-            item.parsed_data = parse(item.raw_title)
+            item.parsed_data = cached_parse(item.raw_title)
             item.tmdb_id = getattr(media, "tmdb_id", None)
             items.append(item)
 
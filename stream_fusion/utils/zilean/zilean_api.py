@@ -1,10 +1,10 @@
 import asyncio
 import aiohttp
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Any
 from pydantic import BaseModel, ConfigDict, Field
 from stream_fusion.settings import settings
 from stream_fusion.logging_config import logger
-import time
+from stream_fusion.utils.cache.indexer_cache import indexer_cache
 
 
 class DMMQueryRequest(BaseModel):
@@ -91,10 +91,6 @@ class ZileanAPI:
         self._session = session
         self._timeout = aiohttp.ClientTimeout(total=30)
 
-        # Cache pour les résultats de recherche
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = 900  # 15 minutes en secondes
-
     async def _get_session(self) -> aiohttp.ClientSession:
         """Retourne la session aiohttp, en crée une si nécessaire."""
         if self._session is None or self._session.closed:
@@ -107,37 +103,9 @@ class ZileanAPI:
         if self._session and not self._external_session and not self._session.closed:
             await self._session.close()
 
-    def _get_cache_key(self, method: str, endpoint: str, **kwargs) -> str:
-        """Génère une clé de cache unique basée sur la méthode, l'endpoint et les paramètres."""
-        params_str = "&".join(f"{k}={v}" for k, v in sorted(kwargs.items()) if v is not None)
-        return f"{method}:{endpoint}:{params_str}"
-
-    def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Récupère les données du cache si elles existent et sont valides."""
-        if cache_key in self._cache:
-            cached_data = self._cache[cache_key]
-            if time.time() - cached_data["timestamp"] < self._cache_ttl:
-                return cached_data["data"]
-            # Nettoyer les entrées expirées
-            del self._cache[cache_key]
-        return None
-
-    def _add_to_cache(self, cache_key: str, data: Any) -> None:
-        """Ajoute des données au cache avec un timestamp."""
-        self._cache[cache_key] = {
-            "data": data,
-            "timestamp": time.time()
-        }
-
-        # Nettoyer le cache si trop volumineux (garder max 100 entrées)
-        if len(self._cache) > 100:
-            # Supprimer la plus ancienne entrée
-            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k]["timestamp"])
-            del self._cache[oldest_key]
-
     async def _request(self, method: str, endpoint: str, cache: bool = True, **kwargs) -> Any:
         """
-        Effectue une requête HTTP async avec gestion de cache.
+        Effectue une requête HTTP async, via le cache partagé des indexers.
 
         :param method: Méthode HTTP (GET, POST, etc.)
         :param endpoint: Point d'accès API
@@ -151,30 +119,19 @@ class ZileanAPI:
             {"accept": "application/json", "Content-Type": "application/json"}
         )
 
-        # Vérifier le cache pour les requêtes GET si activé
-        params = kwargs.get("params", {})
-        if cache and method.upper() == "GET":
-            cache_key = self._get_cache_key(method, endpoint, **params)
-            cached_data = self._get_from_cache(cache_key)
-            if cached_data:
-                return cached_data
+        if not cache:
+            return await self._fetch(method, url, headers=headers, **kwargs)
 
+        query = {"method": method.upper(), "endpoint": endpoint, **kwargs.get("params", {}), **kwargs.get("json", {})}
+        return await indexer_cache.fetch("zilean", query, lambda: self._fetch(method, url, headers=headers, **kwargs))
+
+    async def _fetch(self, method: str, url: str, **kwargs) -> Any:
         session = await self._get_session()
 
         try:
-            async with session.request(method, url, headers=headers, **kwargs) as response:
+            async with session.request(method, url, **kwargs) as response:
                 response.raise_for_status()
-                data = await response.json()
-
-                # Mettre en cache les résultats pour les requêtes GET si activé
-                if cache and method.upper() == "GET":
-                    try:
-                        cache_key = self._get_cache_key(method, endpoint, **params)
-                        self._add_to_cache(cache_key, data)
-                    except Exception as e:
-                        logger.warning(f"Impossible de mettre en cache la réponse: {e}")
-
-                return data
+                return await response.json()
         except aiohttp.ClientError as e:
             logger.error(f"Erreur lors de la requête API Zilean: {e}")
             raise
@@ -1,7 +1,6 @@
 import asyncio
 import aiohttp
-from typing import List, Union, Dict, Tuple, Optional
-import time
+from typing import List, Union, Optional
 
 from stream_fusion.logging_config import logger
 from stream_fusion.utils.models.movie import Movie
@@ -15,57 +14,16 @@ class ZileanService:
         self.zilean_api = ZileanAPI(session=session)
         self.logger = logger
         self.max_workers = settings.zilean_max_workers
-        self._search_cache: Dict[str, Tuple[List[DMMTorrentInfo], float]] = {}
-        self._cache_ttl = 3600  # 1 heure en secondes
 
     async def search(self, media: Union[Movie, Series]) -> List[DMMTorrentInfo]:
-        # Vérifier si nous avons déjà des résultats en cache pour ce média
-        cache_key = self._get_cache_key(media)
-        cached_results = self._get_from_cache(cache_key)
-        if cached_results:
-            return cached_results
-
-        # Sinon, effectuer la recherche
+        # Les réponses brutes de Zilean sont mises en cache par ZileanAPI (cache partagé des indexers)
         if isinstance(media, Movie):
-            results = await self.__search_movie(media)
+            return await self.__search_movie(media)
         elif isinstance(media, Series):
-            results = await self.__search_series(media)
+            return await self.__search_series(media)
         else:
             raise TypeError("Only Movie and Series are allowed as media!")
 
-        # Stocker les résultats dans le cache
-        self._add_to_cache(cache_key, results)
-        return results
-
-    def _get_cache_key(self, media: Union[Movie, Series]) -> str:
-        """Génère une clé de cache unique pour un média."""
-        if isinstance(media, Movie):
-            return f"movie:{media.id}:{media.titles[0] if media.titles else ''}"
-        elif isinstance(media, Series):
-            season = getattr(media, 'season', '')
-            episode = getattr(media, 'episode', '')
-            return f"series:{media.id}:{media.titles[0] if media.titles else ''}:{season}:{episode}"
-
-    def _get_from_cache(self, cache_key: str) -> Optional[List[DMMTorrentInfo]]:
-        """Récupère les résultats du cache s'ils existent et sont valides."""
-        if cache_key in self._search_cache:
-            results, timestamp = self._search_cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                return results
-            # Nettoyer les entrées expirées
-            del self._search_cache[cache_key]
-        return None
-
-    def _add_to_cache(self, cache_key: str, results: List[DMMTorrentInfo]) -> None:
-        """Ajoute des résultats au cache avec un timestamp."""
-        self._search_cache[cache_key] = (results, time.time())
-
-        # Nettoyer le cache si trop volumineux (garder max 50 entrées)
-        if len(self._search_cache) > 50:
-            # Supprimer la plus ancienne entrée
-            oldest_key = min(self._search_cache.keys(), key=lambda k: self._search_cache[k][1])
-            del self._search_cache[oldest_key]
-
     def __deduplicate_api_results(self, api_results: List[DMMTorrentInfo]) -> List[DMMTorrentInfo]:
         unique_results = set()
         deduplicated_results = []
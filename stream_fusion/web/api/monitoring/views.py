@@ -1,5 +1,19 @@
 from fastapi import APIRouter
 
+from stream_fusion.utils.cache.indexer_cache import indexer_cache
+from stream_fusion.utils.cache.local_redis import redis_circuit_breaker
+from stream_fusion.utils.cache.season_pack_index import season_pack_index
+from stream_fusion.utils.cache.stream_cache import stream_cache_stats
+from stream_fusion.utils.debrid.availability_cache import AvailabilityCache
+from stream_fusion.utils.debrid.base_debrid import availability_chunk_stats
+from stream_fusion.utils.debrid.rate_limiter import rate_limiter_stats
+from stream_fusion.utils.filter_results import filter_stats
+from stream_fusion.utils.jackett.jackett_registry import jackett_registry
+from stream_fusion.utils.metdata.metadata_cache import metadata_cache
+from stream_fusion.utils.parser.parse_cache import parse_cache
+from stream_fusion.utils.prefetch_scheduler import prefetch_scheduler
+from stream_fusion.utils.search_scheduler import source_latency
+
 router = APIRouter()
 
 
@@ -10,3 +24,44 @@ def health_check() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get("/cache-stats")
+def cache_stats() -> dict:
+    """
+    Returns in-process cache counters for this worker.
+    """
+    return {
+        "rtn_parse": parse_cache.stats(),
+        "redis_circuit": redis_circuit_breaker.stats(),
+        "stream_cache": stream_cache_stats.stats(),
+        "debrid_availability": AvailabilityCache.stats(),
+        "tmdb_metadata": metadata_cache.stats(),
+        "indexer_raw": indexer_cache.stats(),
+        "season_packs": season_pack_index.stats(),
+        "filters": filter_stats.stats(),
+    }
+
+
+@router.get("/debrid-stats")
+def debrid_stats() -> dict:
+    """
+    Returns debrid availability chunk latency and size, and rate limiter waits, for this worker.
+    """
+    return {
+        "availability_chunks": availability_chunk_stats.stats(),
+        "rate_limits": rate_limiter_stats.stats(),
+    }
+
+
+@router.get("/indexer-stats")
+def indexer_stats() -> dict:
+    """
+    Returns search source latency budgets, prefetch queue counters, and the cached
+    Jackett indexer list age and per-indexer health, for this worker.
+    """
+    return {
+        "sources": source_latency.stats(),
+        "prefetch": prefetch_scheduler.stats(),
+        "jackett": jackett_registry.stats(),
+    }
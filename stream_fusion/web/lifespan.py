@@ -12,6 +12,7 @@ from stream_fusion.logging_config import configure_logging
 from stream_fusion.services.postgresql.base import Base
 from stream_fusion.services.postgresql.models import load_all_models
 from stream_fusion.settings import settings
+from stream_fusion.utils.cache.local_redis import close_shared_redis_client, get_shared_redis_client
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -71,6 +72,9 @@ async def lifespan_setup(
     app.state.redis_pool = ConnectionPool(
         host=settings.redis_host, port=settings.redis_port, db=settings.redis_db, max_connections=200
     )
+    # Pool async partagé par tous les RedisCache du worker et par le code hors requête (même client)
+    app.state.async_redis_client = get_shared_redis_client()
+    app.state.async_redis_pool = app.state.async_redis_client.connection_pool
 
     yield
 
@@ -81,4 +85,5 @@ async def lifespan_setup(
         await app.state.debrid_session.close()
     if app.state.redis_pool:
         app.state.redis_pool.disconnect()
+    await close_shared_redis_client()
     await app.state.db_engine.dispose()
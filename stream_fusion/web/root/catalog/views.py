@@ -1,5 +1,6 @@
 import asyncio
 import pickle
+import time
 from datetime import datetime, timedelta
 
 from redis import Redis
@@ -9,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from stream_fusion.services.postgresql.dao.apikey_dao import APIKeyDAO
 from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
 from stream_fusion.settings import settings
+from stream_fusion.utils.metdata.metadata_cache import imdb_tmdb_ids
 from stream_fusion.utils.parse_config import parse_config
 from stream_fusion.utils.security.security_api_key import check_api_key
 from stream_fusion.web.root.catalog.schemas import (
@@ -23,6 +25,9 @@ from stream_fusion.logging_config import logger
 
 router = APIRouter()
 
+CATALOG_LOCK_TTL = 60
+_catalog_builds: dict = {}
+
 tmdb = TMDb()
 tmdb.api_key = settings.tmdb_api_key
 tmdb.language = "fr-FR"
@@ -140,15 +145,274 @@ async def create_meta_object(details, item_type: str, imdb_id: str, include_epis
     return meta
 
 
+def add_episode_prefix(meta: Meta, ep_info: dict) -> None:
+    season = ep_info.get('season', '').strip('[]') or ''
+    episode = ep_info.get('episode', '').strip('[]') or ''
+    if season:
+        if episode:
+            ep_prefix = f"S{season.zfill(2)}E{episode.zfill(2)}"
+        else:
+            ep_prefix = f"S{season.zfill(2)}"
+        meta.name = f"{ep_prefix} - {meta.name}"
+
+
 async def get_tmdb_id_from_imdb(imdb_id: str) -> str:
+    mapping = await imdb_tmdb_ids.get(imdb_id)
+    if mapping is not None:
+        return mapping[1]
     results = await asyncio.to_thread(find.find_by_imdb_id, imdb_id)
     if results.movie_results:
-        return results.movie_results[0]["id"]
+        tmdb_id = results.movie_results[0]["id"]
+        await imdb_tmdb_ids.set(imdb_id, "movie", tmdb_id)
+        return tmdb_id
     elif results.tv_results:
-        return results.tv_results[0]["id"]
+        tmdb_id = results.tv_results[0]["id"]
+        await imdb_tmdb_ids.set(imdb_id, "tv", tmdb_id)
+        return tmdb_id
     return None
 
 
+async def build_catalog(type: str, id: str, cache_key: str, redis_client: Redis, torrentitem_dao: TorrentItemDAO) -> Metas:
+    item_ids = []
+    episode_info_map = {}  # Mapping tmdb_id -> episode info pour les séries
+
+    # Map catalog IDs to item types for PostgreSQL queries
+    catalog_type_map = {
+        "latest_movies": "movie",
+        "recently_added_movies": "movie",
+        "latest_tv_shows": "series",
+        "recently_added_tv_shows": "series",
+    }
+
+    item_type = catalog_type_map.get(id)
+
+    # For "latest_*": Different logic for movies vs series
+    if id.startswith("latest_"):
+        try:
+            if item_type == "movie":
+                # Films: TMDB discover (films récents des 6 derniers mois) + filtre FR disponible en PostgreSQL
+                logger.info(f"Fetching latest movies from TMDB discover (last 6 months) and filtering by PostgreSQL availability")
+                today = datetime.now().strftime('%Y-%m-%d')
+                six_months_ago = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
+                tmdb_results = await asyncio.gather(
+                    *[asyncio.to_thread(discover.discover_movies, {
+                        'sort_by': 'popularity.desc',
+                        'primary_release_date.gte': six_months_ago,
+                        'primary_release_date.lte': today,
+                        'page': page,
+                    }) for page in range(1, 11)]
+                )
+                all_tmdb_ids = []
+                for results in tmdb_results:
+                    for item in results:
+                        if hasattr(item, 'id'):
+                            all_tmdb_ids.append(item.id)
+                logger.info(f"Fetched {len(all_tmdb_ids)} TMDB IDs from TMDB discover for {id}")
+
+                # Filtre par disponibilité FR/MULTI, trié par date d'ajout en base (plus récent en premier)
+                item_ids = await torrentitem_dao.filter_existing_tmdb_ids(all_tmdb_ids, item_type, sort_by_added=True)
+                logger.info(f"Filtered to {len(item_ids)} available TMDB IDs (FR/MULTI, sorted by added date) for {id}")
+            else:
+                # Séries: TMDB discover avec air_date récent (7 derniers jours) + filtre FR en PostgreSQL
+                # Utilise discover au lieu de on_the_air car on_the_air vire trop vite les séries binge-release
+                logger.info(f"Fetching latest series from TMDB discover (air_date last 7 days) and filtering by PostgreSQL availability")
+                today = datetime.now().strftime('%Y-%m-%d')
+                week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+                tmdb_results = await asyncio.gather(
+                    *[asyncio.to_thread(discover.discover_tv_shows, {
+                        'air_date.gte': week_ago,
+                        'without_genres': '10763,10764,10766,10767',
+                        'air_date.lte': today,
+                        'sort_by': 'popularity.desc',
+                        'page': page
+                    }) for page in range(1, 11)]
+                )
+                all_tmdb_ids = []
+                for results in tmdb_results:
+                    for item in results:
+                        if hasattr(item, 'id'):
+                            all_tmdb_ids.append(item.id)
+                logger.info(f"Fetched {len(all_tmdb_ids)} series TMDB IDs from TMDB discover (air_date) for {id}")
+
+                # Filtre par disponibilité FR/MULTI, trié par dernier nouvel épisode en base
+                # Récupère aussi les infos d'épisode pour l'afficher dans le titre
+                episode_data = await torrentitem_dao.filter_existing_tmdb_ids(all_tmdb_ids, item_type, sort_by_added=True, return_episode_info=True)
+                item_ids = [ep['tmdb_id'] for ep in episode_data]
+                # Créer un mapping tmdb_id -> episode info
+                episode_info_map = {ep['tmdb_id']: ep for ep in episode_data}
+                logger.info(f"Filtered to {len(item_ids)} available series TMDB IDs (FR/MULTI, sorted by new episode date) for {id}")
+
+        except Exception as e:
+            logger.warning(f"Failed to fetch latest catalog for {id}: {e}. Falling back to PostgreSQL only.")
+            item_ids = await torrentitem_dao.get_latest_tmdb_ids(item_type, limit=50)
+
+    # For "recently_added_*": Use PostgreSQL directly (recent uploads)
+    elif id.startswith("recently_added_"):
+        try:
+            logger.info(f"Fetching recently added TMDB IDs from PostgreSQL for {item_type}")
+            item_ids = await torrentitem_dao.get_recently_added_tmdb_ids(item_type, limit=50)
+            logger.info(f"Fetched {len(item_ids)} TMDB IDs from PostgreSQL for {id}")
+        except Exception as pg_error:
+            logger.warning(f"Failed to fetch catalog from PostgreSQL for {id}: {pg_error}")
+            item_ids = []
+
+    # Fallback to TMDb discover if no results
+    if not item_ids:
+        logger.info(f"Fallback: Fetching catalog from TMDb discover for type: {type}, id: {id}")
+        try:
+            tmdb_params = {"page": 1}
+            if type == "movie":
+                discover_func = discover.discover_movies
+            else:
+                discover_func = discover.discover_tv_shows
+
+            results = await asyncio.to_thread(discover_func, tmdb_params)
+            item_ids = [item.id for item in results if hasattr(item, 'id')]
+            logger.info(f"Fetched {len(item_ids)} IDs from TMDb discover for {type}/{id}")
+
+        except Exception as tmdb_error:
+            logger.error(f"Failed to fetch catalog from TMDb for {type}/{id}: {tmdb_error}", exc_info=True)
+            item_ids = []
+
+    process_ids = item_ids[:50]
+    item_type = "movie" if type == "movie" else "series"
+
+    # Un seul MGET pour toutes les métas déjà en cache
+    cached_items = await asyncio.to_thread(
+        redis_client.mget, [f"tmdbid_item:{tmdb_id}" for tmdb_id in process_ids]
+    ) if process_ids else []
+
+    cached_metas = {}
+    missing_ids = []
+    for tmdb_id, raw_item in zip(process_ids, cached_items):
+        if raw_item:
+            try:
+                cached_metas[tmdb_id] = Meta.model_validate(pickle.loads(raw_item))
+                continue
+            except Exception as validation_error:
+                logger.warning(f"Failed to validate cached meta for TMDB ID {tmdb_id}: {validation_error}")
+        missing_ids.append(tmdb_id)
+
+    logger.info(f"Catalog: {len(cached_metas)} metas from cache, {len(missing_ids)} to fetch from TMDB")
+
+    fetched_metas = {}
+    if missing_ids:
+        known_imdb_ids = {}
+        if item_type == "series":
+            # Idem pour le mapping tmdbid_to_imdbid (évite les appels external_ids)
+            raw_imdb_ids = await asyncio.to_thread(
+                redis_client.mget, [f"tmdbid_to_imdbid:{tmdb_id}" for tmdb_id in missing_ids]
+            )
+            for tmdb_id, raw_imdb_id in zip(missing_ids, raw_imdb_ids):
+                if raw_imdb_id:
+                    known_imdb_ids[tmdb_id] = raw_imdb_id.decode('utf-8') if isinstance(raw_imdb_id, bytes) else raw_imdb_id
+
+        semaphore = asyncio.Semaphore(settings.catalog_fetch_concurrency)
+
+        async def fetch_meta(tmdb_id):
+            async with semaphore:
+                try:
+                    if item_type == "movie":
+                        details = await get_movie_details(tmdb_id)
+                        imdb_id = getattr(details, 'imdb_id', None)
+                    else:
+                        details = await get_tv_details(tmdb_id)
+                        imdb_id = known_imdb_ids.get(tmdb_id)
+                        if imdb_id:
+                            logger.debug(f"IMDb ID found in cache for TMDB ID {tmdb_id}: {imdb_id}")
+                        else:
+                            external_ids = await asyncio.to_thread(tv.external_ids, tmdb_id)
+                            imdb_id = external_ids.get("imdb_id")
+
+                    if not imdb_id:
+                        logger.warning(f"No IMDb ID found for TMDB ID: {tmdb_id}")
+                        return None
+                    await imdb_tmdb_ids.set(imdb_id, "movie" if item_type == "movie" else "tv", tmdb_id)
+
+                    # include_episodes=False pour le catalogue (pas besoin des épisodes)
+                    meta = await create_meta_object(details, item_type, imdb_id, include_episodes=False)
+                    return imdb_id, meta
+                except Exception as e:
+                    logger.error(f"Error processing item with TMDB ID {tmdb_id}: {str(e)}")
+                    return None
+
+        results = await asyncio.gather(*[fetch_meta(tmdb_id) for tmdb_id in missing_ids])
+
+        pipeline = redis_client.pipeline()
+        for tmdb_id, result in zip(missing_ids, results):
+            if not result:
+                continue
+            imdb_id, meta = result
+            # Cacher la version sans l'épisode dans le titre
+            pipeline.set(f"tmdbid_item:{tmdb_id}", pickle.dumps(meta), ex=7 * 24 * 60 * 60)
+            pipeline.set(f"imdbid_item:{imdb_id}", pickle.dumps(meta), ex=7 * 24 * 60 * 60)
+            pipeline.set(f"tmdbid_to_imdbid:{tmdb_id}", imdb_id, ex=7 * 24 * 60 * 60)
+            fetched_metas[tmdb_id] = meta
+
+        try:
+            await asyncio.to_thread(pipeline.execute)
+        except Exception as pipe_exec_err:
+            logger.error(f"Error executing cache pipeline: {pipe_exec_err}")
+
+    metas = []
+    for tmdb_id in process_ids:
+        meta = cached_metas.get(tmdb_id) or fetched_metas.get(tmdb_id)
+        if meta is None:
+            continue
+        # Ajouter l'info d'épisode au DÉBUT du titre pour les séries (sans modifier le cache)
+        if tmdb_id in episode_info_map:
+            add_episode_prefix(meta, episode_info_map[tmdb_id])
+        metas.append(meta)
+
+    catalog = Metas(metas=metas)
+    try:
+        await cache_item(redis_client, cache_key, catalog, 1800)
+    except Exception as cat_cache_err:
+         logger.error(f"Error caching final catalog {cache_key}: {cat_cache_err}")
+
+    logger.info(f"Catalog generated and cached for key: {cache_key} with {len(metas)} items.")
+    return catalog
+
+
+async def get_or_build_catalog(cache_key: str, redis_client: Redis, builder) -> Metas:
+    """
+    Single-flight sur la clé du catalogue : une seule génération à la fois,
+    dans le worker (tâche partagée) et entre workers (verrou Redis court).
+    """
+    task = _catalog_builds.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_build_catalog_once(cache_key, redis_client, builder))
+        _catalog_builds[cache_key] = task
+        task.add_done_callback(lambda _: _catalog_builds.pop(cache_key, None))
+    else:
+        logger.info(f"Catalog: Joining in-flight generation for key: {cache_key}")
+    return await asyncio.shield(task)
+
+
+async def _build_catalog_once(cache_key: str, redis_client: Redis, builder) -> Metas:
+    lock_key = f"lock:{cache_key}"
+    acquired = await asyncio.to_thread(
+        redis_client.set, lock_key, "1", nx=True, ex=CATALOG_LOCK_TTL
+    )
+    if not acquired:
+        logger.info(f"Catalog: Generation in progress in another worker for key: {cache_key}, waiting")
+        deadline = time.monotonic() + CATALOG_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.25)
+            cached_catalog = await get_cached_item(redis_client, cache_key)
+            if cached_catalog:
+                return Metas.model_validate(cached_catalog)
+            if not await asyncio.to_thread(redis_client.exists, lock_key):
+                break
+        logger.warning(f"Catalog: Timed out waiting for key: {cache_key}, generating locally")
+
+    try:
+        return await builder()
+    finally:
+        if acquired:
+            await asyncio.to_thread(redis_client.delete, lock_key)
+
+
 @router.get(
     "/{config}/catalog/{type}/{id}.json", responses={500: {"model": ErrorResponse}}
 )
@@ -163,7 +427,6 @@ async def get_catalog(
     skip: int = 0,
     redis_client: Redis = Depends(get_redis),
     apikey_dao: APIKeyDAO = Depends(),
-    torrentitem_dao: TorrentItemDAO = Depends()
 ):
     try:
         config_data = parse_config(config)
@@ -192,203 +455,16 @@ async def get_catalog(
 
         logger.info(f"Catalog not found in cache for key: {cache_key}. Generating...")
 
-        item_ids = []
-        episode_info_map = {}  # Mapping tmdb_id -> episode info pour les séries
-
-        # Map catalog IDs to item types for PostgreSQL queries
-        catalog_type_map = {
-            "latest_movies": "movie",
-            "recently_added_movies": "movie",
-            "latest_tv_shows": "series",
-            "recently_added_tv_shows": "series",
-        }
-
-        item_type = catalog_type_map.get(id)
-
-        # For "latest_*": Different logic for movies vs series
-        if id.startswith("latest_"):
-            try:
-                if item_type == "movie":
-                    # Films: TMDB discover (films récents des 6 derniers mois) + filtre FR disponible en PostgreSQL
-                    logger.info(f"Fetching latest movies from TMDB discover (last 6 months) and filtering by PostgreSQL availability")
-                    today = datetime.now().strftime('%Y-%m-%d')
-                    six_months_ago = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
-                    tmdb_results = await asyncio.gather(
-                        *[asyncio.to_thread(discover.discover_movies, {
-                            'sort_by': 'popularity.desc',
-                            'primary_release_date.gte': six_months_ago,
-                            'primary_release_date.lte': today,
-                            'page': page,
-                        }) for page in range(1, 11)]
-                    )
-                    all_tmdb_ids = []
-                    for results in tmdb_results:
-                        for item in results:
-                            if hasattr(item, 'id'):
-                                all_tmdb_ids.append(item.id)
-                    logger.info(f"Fetched {len(all_tmdb_ids)} TMDB IDs from TMDB discover for {id}")
-
-                    # Filtre par disponibilité FR/MULTI, trié par date d'ajout en base (plus récent en premier)
-                    item_ids = await torrentitem_dao.filter_existing_tmdb_ids(all_tmdb_ids, item_type, sort_by_added=True)
-                    logger.info(f"Filtered to {len(item_ids)} available TMDB IDs (FR/MULTI, sorted by added date) for {id}")
-                else:
-                    # Séries: TMDB discover avec air_date récent (7 derniers jours) + filtre FR en PostgreSQL
-                    # Utilise discover au lieu de on_the_air car on_the_air vire trop vite les séries binge-release
-                    logger.info(f"Fetching latest series from TMDB discover (air_date last 7 days) and filtering by PostgreSQL availability")
-                    today = datetime.now().strftime('%Y-%m-%d')
-                    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-                    tmdb_results = await asyncio.gather(
-                        *[asyncio.to_thread(discover.discover_tv_shows, {
-                            'air_date.gte': week_ago,
-                            'without_genres': '10763,10764,10766,10767',
-                            'air_date.lte': today,
-                            'sort_by': 'popularity.desc',
-                            'page': page
-                        }) for page in range(1, 11)]
-                    )
-                    all_tmdb_ids = []
-                    for results in tmdb_results:
-                        for item in results:
-                            if hasattr(item, 'id'):
-                                all_tmdb_ids.append(item.id)
-                    logger.info(f"Fetched {len(all_tmdb_ids)} series TMDB IDs from TMDB discover (air_date) for {id}")
-
-                    # Filtre par disponibilité FR/MULTI, trié par dernier nouvel épisode en base
-                    # Récupère aussi les infos d'épisode pour l'afficher dans le titre
-                    episode_data = await torrentitem_dao.filter_existing_tmdb_ids(all_tmdb_ids, item_type, sort_by_added=True, return_episode_info=True)
-                    item_ids = [ep['tmdb_id'] for ep in episode_data]
-                    # Créer un mapping tmdb_id -> episode info
-                    episode_info_map = {ep['tmdb_id']: ep for ep in episode_data}
-                    logger.info(f"Filtered to {len(item_ids)} available series TMDB IDs (FR/MULTI, sorted by new episode date) for {id}")
-
-            except Exception as e:
-                logger.warning(f"Failed to fetch latest catalog for {id}: {e}. Falling back to PostgreSQL only.")
-                item_ids = await torrentitem_dao.get_latest_tmdb_ids(item_type, limit=50)
-
-        # For "recently_added_*": Use PostgreSQL directly (recent uploads)
-        elif id.startswith("recently_added_"):
-            try:
-                logger.info(f"Fetching recently added TMDB IDs from PostgreSQL for {item_type}")
-                item_ids = await torrentitem_dao.get_recently_added_tmdb_ids(item_type, limit=50)
-                logger.info(f"Fetched {len(item_ids)} TMDB IDs from PostgreSQL for {id}")
-            except Exception as pg_error:
-                logger.warning(f"Failed to fetch catalog from PostgreSQL for {id}: {pg_error}")
-                item_ids = []
-
-        # Fallback to TMDb discover if no results
-        if not item_ids:
-            logger.info(f"Fallback: Fetching catalog from TMDb discover for type: {type}, id: {id}")
-            try:
-                tmdb_params = {"page": 1}
-                if type == "movie":
-                    discover_func = discover.discover_movies
-                else:
-                    discover_func = discover.discover_tv_shows
-
-                results = await asyncio.to_thread(discover_func, tmdb_params)
-                item_ids = [item.id for item in results if hasattr(item, 'id')]
-                logger.info(f"Fetched {len(item_ids)} IDs from TMDb discover for {type}/{id}")
-
-            except Exception as tmdb_error:
-                logger.error(f"Failed to fetch catalog from TMDb for {type}/{id}: {tmdb_error}", exc_info=True)
-                item_ids = []
-
-        metas = []
-        pipeline = redis_client.pipeline()
-
-        process_limit = 50
-        for tmdb_id in item_ids[:process_limit]:
-            item_cache_key_tmdb = f"tmdbid_item:{tmdb_id}"
-            cached_item = await get_cached_item(redis_client, item_cache_key_tmdb)
-
-            if cached_item:
-                try:
-                    meta = Meta.model_validate(cached_item)
-                    # Ajouter l'info d'épisode au DÉBUT du titre pour les séries (sans modifier le cache)
-                    if tmdb_id in episode_info_map:
-                        ep_info = episode_info_map[tmdb_id]
-                        season = ep_info.get('season', '').strip('[]') or ''
-                        episode = ep_info.get('episode', '').strip('[]') or ''
-                        if season:
-                            if episode:
-                                ep_prefix = f"S{season.zfill(2)}E{episode.zfill(2)}"
-                            else:
-                                ep_prefix = f"S{season.zfill(2)}"
-                            meta.name = f"{ep_prefix} - {meta.name}"
-                    metas.append(meta)
-                except Exception as validation_error:
-                     logger.warning(f"Failed to validate cached meta for TMDB ID {tmdb_id}: {validation_error}")
-                continue
-
+        async def builder():
+            # Génération partagée entre requêtes : session DB propre, indépendante de la requête leader
+            session = request.app.state.db_session_factory()
             try:
-                if type == "movie":
-                    details = await get_movie_details(tmdb_id)
-                    item_type = "movie"
-                    imdb_id = getattr(details, 'imdb_id', None)
-                else:
-                    details = await get_tv_details(tmdb_id)
-                    item_type = "series"
-                    # Vérifier le cache tmdbid_to_imdbid avant d'appeler external_ids
-                    cached_imdb_id = await asyncio.to_thread(redis_client.get, f"tmdbid_to_imdbid:{tmdb_id}")
-                    if cached_imdb_id:
-                        imdb_id = cached_imdb_id.decode('utf-8') if isinstance(cached_imdb_id, bytes) else cached_imdb_id
-                        logger.debug(f"IMDb ID found in cache for TMDB ID {tmdb_id}: {imdb_id}")
-                    else:
-                        external_ids = await asyncio.to_thread(tv.external_ids, tmdb_id)
-                        imdb_id = external_ids.get("imdb_id")
-
-                if not imdb_id:
-                    logger.warning(f"No IMDb ID found for TMDB ID: {tmdb_id}")
-                    continue
-
-                # include_episodes=False pour le catalogue (pas besoin des épisodes)
-                meta = await create_meta_object(details, item_type, imdb_id, include_episodes=False)
-
-                item_cache_key_imdb = f"imdbid_item:{imdb_id}"
-                try:
-                    # Cacher la version sans l'épisode dans le titre
-                    pipeline.set(
-                        item_cache_key_tmdb, pickle.dumps(meta), ex=7 * 24 * 60 * 60
-                    )
-                    pipeline.set(
-                        item_cache_key_imdb, pickle.dumps(meta), ex=7 * 24 * 60 * 60
-                    )
-                    pipeline.set(
-                        f"tmdbid_to_imdbid:{tmdb_id}", imdb_id, ex=7 * 24 * 60 * 60
-                    )
-                except Exception as cache_err:
-                    logger.error(f"Error adding item TMDB:{tmdb_id}/IMDB:{imdb_id} to cache pipeline: {cache_err}")
-
-                # Ajouter l'info d'épisode au DÉBUT du titre pour les séries (après le cache)
-                if tmdb_id in episode_info_map:
-                    ep_info = episode_info_map[tmdb_id]
-                    season = ep_info.get('season', '').strip('[]') or ''
-                    episode = ep_info.get('episode', '').strip('[]') or ''
-                    if season:
-                        if episode:
-                            ep_prefix = f"S{season.zfill(2)}E{episode.zfill(2)}"
-                        else:
-                            ep_prefix = f"S{season.zfill(2)}"
-                        meta.name = f"{ep_prefix} - {meta.name}"
-
-                metas.append(meta)
-
-            except Exception as e:
-                logger.error(f"Error processing item with TMDB ID {tmdb_id}: {str(e)}")
-                continue
-
-        try:
-            await asyncio.to_thread(pipeline.execute)
-        except Exception as pipe_exec_err:
-             logger.error(f"Error executing cache pipeline: {pipe_exec_err}")
-
-        catalog = Metas(metas=metas)
-        try:
-            await cache_item(redis_client, cache_key, catalog, 1800)
-        except Exception as cat_cache_err:
-             logger.error(f"Error caching final catalog {cache_key}: {cat_cache_err}")
+                return await build_catalog(type, id, cache_key, redis_client, TorrentItemDAO(session))
+            finally:
+                await session.commit()
+                await session.close()
 
-        logger.info(f"Catalog generated and cached for key: {cache_key} with {len(metas)} items.")
+        catalog = await get_or_build_catalog(cache_key, redis_client, builder)
         return Metas(metas=catalog.metas[skip:])
 
     except Exception as e:
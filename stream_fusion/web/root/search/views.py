@@ -1,5 +1,6 @@
 import hashlib
 import time
+from typing import Set
 from fastapi import APIRouter, Depends, HTTPException, Request
 from uuid import UUID
 import asyncio
@@ -10,6 +11,23 @@ from stream_fusion.services.postgresql.dao.torrentitem_dao import TorrentItemDAO
 from stream_fusion.services.redis.redis_config import get_redis_cache_dependency
 from stream_fusion.utils.cache.cache import search_public
 from stream_fusion.utils.cache.local_redis import RedisCache
+from stream_fusion.utils.cache.season_pack_index import season_pack_index
+from stream_fusion.utils.cache.single_flight import SingleFlight
+from stream_fusion.utils.cache.stream_cache import (
+    is_stale,
+    stream_cache_soft_ttl,
+    stream_cache_stats,
+)
+from stream_fusion.utils.debrid.availability_cache import (
+    AvailabilityCache,
+    availability_provider,
+    build_response,
+)
+from stream_fusion.utils.debrid.availability_pipeline import (
+    AvailabilityPipeline,
+    check_entries,
+    fetch_availability,
+)
 from stream_fusion.utils.debrid.get_debrid_service import get_all_debrid_services
 from stream_fusion.utils.filter.results_per_quality_filter import (
     ResultsPerQualityFilter,
@@ -23,10 +41,13 @@ from stream_fusion.logging_config import logger
 from stream_fusion.utils.jackett.jackett_result import JackettResult
 from stream_fusion.utils.jackett.jackett_service import JackettService
 from stream_fusion.utils.parser.parser_service import StreamParser
+from stream_fusion.utils.prefetch_scheduler import prefetch_scheduler
+from stream_fusion.utils.search_scheduler import SearchScheduler
 from stream_fusion.utils.sharewood.sharewood_service import SharewoodService
 from stream_fusion.utils.yggfilx.yggflix_service import YggflixService
 from stream_fusion.utils.yggfilx.yggflix_result import YggflixResult
 from stream_fusion.utils.metdata.cinemeta import Cinemeta
+from stream_fusion.utils.metdata.show_metadata import get_media
 from stream_fusion.utils.metdata.tmdb import TMDB
 from stream_fusion.utils.models.movie import Movie
 from stream_fusion.utils.models.series import Series
@@ -49,6 +70,23 @@ from stream_fusion.settings import settings
 
 router = APIRouter()
 
+search_single_flight = SingleFlight(
+    "search",
+    lock_ttl=settings.search_single_flight_lock_ttl,
+    wait_timeout=settings.search_single_flight_wait_timeout,
+)
+
+
+# Références fortes vers les tâches lancées sans attente, sinon collectables en cours d'exécution
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
 def get_client_ip(request: Request) -> str:
     forwarded_for = request.headers.get("X-Forwarded-For")
@@ -60,259 +98,69 @@ def get_client_ip(request: Request) -> str:
     return request.client.host
 
 
-async def full_prefetch_from_cache(media, config, redis_cache, stream_cache_key, get_metadata, stream_type, debrid_services, torrent_dao, request):
-    try:
-        await asyncio.sleep(1.0)
-        http_session = getattr(request.app.state, 'http_session', None)
-
-        current_season_num = int(media.season.replace("S", ""))
-        current_episode_num = int(media.episode.replace("E", ""))
-        next_episode_num = current_episode_num + 1
-
-        next_episode_id = f"{media.id.split(':')[0]}:{current_season_num}:{next_episode_num}"
-
-        next_media_mock = type(media)(
-            id=next_episode_id,
-            tmdb_id=media.tmdb_id,
-            titles=media.titles,
-            season=f"S{current_season_num:02d}",
-            episode=f"E{next_episode_num:02d}",
-            languages=media.languages
-        )
-
-        next_stream_key = stream_cache_key(next_media_mock)
-        cached_next = await redis_cache.get(next_stream_key)
-
-        if cached_next is None:
-            logger.debug(f"Pre-fetch: Starting full background search for next episode {next_episode_id}")
-
-            async def fetch_next_metadata():
-                return await get_metadata(next_episode_id, stream_type)
-
-            next_media = await asyncio.wait_for(
-                redis_cache.get_or_set(fetch_next_metadata, next_episode_id, stream_type, config["metadataProvider"]),
-                timeout=5.0
-            )
+async def check_debrid_availability(
+    debrid_services, torrent_smart_container, media, ip, redis_cache: RedisCache = None,
+    pipeline: AvailabilityPipeline = None,
+):
+    """
+    Interroge tous les debrids en parallèle (timeout par service) puis fusionne par ordre de priorité.
+    Avec redis_cache, seuls les hashes absents du cache de disponibilité partagé sont envoyés au provider.
+    Avec pipeline, les réponses déjà obtenues pendant la recherche sont reprises telles quelles.
+    """
+    hashes = torrent_smart_container.get_unaviable_hashes()
+    if not hashes or not debrid_services:
+        return
+    availability_cache = AvailabilityCache(redis_cache) if redis_cache is not None else None
+    if pipeline is not None:
+        await pipeline.drain()
+
+    async def _check(debrid):
+        provider = availability_provider(debrid)
+        if provider is None or (availability_cache is None and pipeline is None):
+            return await fetch_availability(debrid, hashes, ip)
+
+        entries = {}
+        remaining = hashes
+        known = pipeline.known_entries(debrid) if pipeline is not None else None
+        if known is not None:
+            entries = {info_hash: known[info_hash] for info_hash in hashes if info_hash in known}
+            # Un hash dont la vérification a échoué pendant la recherche n'est pas redemandé
+            attempted = pipeline.attempted_hashes(debrid)
+            remaining = [info_hash for info_hash in hashes if info_hash not in entries and info_hash not in attempted]
+        if remaining:
+            entries.update(await check_entries(debrid, remaining, ip, availability_cache))
+        else:
+            logger.info(f"Search: {type(debrid).__name__} availability already known for all hashes")
+        return build_response(debrid, entries)
 
-            search_results = []
-            postgres_results = []
+    results = await asyncio.gather(*[_check(debrid) for debrid in debrid_services])
 
-            background_session = request.app.state.db_session_factory()
-            try:
-                background_torrent_dao = TorrentItemDAO(background_session)
-                torrent_service = TorrentService(config, background_torrent_dao)
-
-                if hasattr(next_media, 'tmdb_id') and next_media.tmdb_id:
-                    try:
-                        postgres_items = await background_torrent_dao.search_by_tmdb_id(int(next_media.tmdb_id))
-                        if postgres_items:
-                            logger.debug(f"Pre-fetch: Found {len(postgres_items)} results from Postgres for TMDB ID {next_media.tmdb_id}")
-                            for db_item in postgres_items:
-                                if db_item.indexer in ['Yggtorrent - API', 'C411 - API', 'Torr9 - API']:
-                                    postgres_results.append(db_item.to_torrent_item())
-                            postgres_results = filter_items(postgres_results, next_media, config=config)
-                            logger.debug(f"Pre-fetch: After filtering: {len(postgres_results)} Postgres results for {next_media.season}{next_media.episode}")
-                    except Exception as pg_error:
-                        logger.debug(f"Pre-fetch: Postgres search failed: {str(pg_error)}")
-
-                if config["zilean"]:
-                    zilean_service = ZileanService(config, session=http_session)
-                    zilean_search_results = await zilean_service.search(next_media)
-                    if zilean_search_results:
-                        zilean_search_results = [
-                            ZileanResult().from_api_cached_item(torrent, next_media)
-                            for torrent in zilean_search_results
-                            if len(getattr(torrent, "info_hash", "")) == 40
-                        ]
-                        zilean_search_results = filter_items(zilean_search_results, next_media, config=config)
-                        zilean_search_results = await torrent_service.convert_and_process(zilean_search_results)
-                        search_results = merge_items(search_results, zilean_search_results)
-
-                if config.get("c411"):
-                    try:
-                        c411_service = C411Service(config, session=http_session)
-                        c411_results = await c411_service.search(next_media)
-                        if c411_results:
-                            c411_results = [
-                                C411SearchResult().from_api_item(item, next_media)
-                                for item in c411_results
-                                if getattr(item, "info_hash", None) and len(item.info_hash) == 40
-                            ]
-                            c411_results = await torrent_service.convert_and_process(c411_results)
-                            search_results = merge_items(search_results, c411_results)
-                            logger.debug(f"Pre-fetch: C411 API: {len(c411_results)} results")
-                    except Exception as e:
-                        logger.debug(f"Pre-fetch: C411 search failed: {e}")
-
-                if config.get("torr9"):
-                    try:
-                        torr9_service = Torr9Service(config, session=http_session)
-                        torr9_results = await torr9_service.search(next_media)
-                        if torr9_results:
-                            torr9_results = [
-                                Torr9SearchResult().from_api_item(item, next_media)
-                                for item in torr9_results
-                                if getattr(item, "info_hash", None) and len(item.info_hash) == 40
-                            ]
-                            torr9_results = await torrent_service.convert_and_process(torr9_results)
-                            search_results = merge_items(search_results, torr9_results)
-                            logger.debug(f"Pre-fetch: Torr9 API: {len(torr9_results)} results")
-                    except Exception as e:
-                        logger.debug(f"Pre-fetch: Torr9 search failed: {e}")
-
-                if config.get("lacale"):
-                    try:
-                        lacale_service = LaCaleService(config, session=http_session)
-                        lacale_results = await lacale_service.search(next_media)
-                        if lacale_results:
-                            lacale_results = await torrent_service.convert_and_process(lacale_results)
-                            search_results = merge_items(search_results, lacale_results)
-                            logger.debug(f"Pre-fetch: LaCale API: {len(lacale_results)} results")
-                    except Exception as e:
-                        logger.debug(f"Pre-fetch: LaCale search failed: {e}")
-
-                if postgres_results:
-                    search_results = merge_items(postgres_results, search_results)
-                    logger.debug(f"Pre-fetch: Merged {len(postgres_results)} Postgres + {len(search_results)} external = {len(search_results)} total")
-
-                if search_results:
-                    # Sort by indexer priority (C411/Torr9=1 before Yggtorrent=2)
-                    # so ResultsPerQualityFilter keeps complete packs first
-                    search_results = filter_items(search_results, next_media, config=config)
-                    filtered_results = ResultsPerQualityFilter(config).filter(search_results)
-                    torrent_smart_container = TorrentSmartContainer(filtered_results, next_media)
-
-                    for debrid in debrid_services:
-                        hashes = torrent_smart_container.get_unaviable_hashes()
-                        ip = get_client_ip(request)
-                        result = await debrid.get_availability_bulk(hashes, ip)
-                        if result:
-                            torrent_smart_container.update_availability(result, type(debrid), next_media)
-
-                    if config["cache"]:
-                        torrent_smart_container.cache_container_items()
-
-                    best_matching_results = torrent_smart_container.get_best_matching()
-                    best_matching_results = sort_items(best_matching_results, config)
-
-                    parser = StreamParser(config)
-                    stream_list = await parser.parse_to_stremio_streams(best_matching_results, next_media)
-                    next_stream_objects = [Stream(**stream) for stream in stream_list]
-
-                    await redis_cache.set(stream_cache_key(next_media), next_stream_objects, expiration=1200)
-                    logger.success(f"Pre-fetch: Successfully background pre-cached {len(next_stream_objects)} streams for episode {next_episode_id}")
-                else:
-                    logger.debug(f"Pre-fetch: No results found for episode {next_episode_id}")
-                    
-            finally:
-                await background_session.commit()
-                await background_session.close()
-                
-        else:
-            logger.debug(f"Pre-fetch: Next episode {next_episode_id} already cached")
-            
-    except Exception as e:
-        logger.debug(f"Pre-fetch: Error during full background pre-fetch: {str(e)}")
-
-
-async def simple_prefetch_next_episode(media, config, redis_cache, stream_cache_key, get_metadata, stream_type):
-    try:
-        await asyncio.sleep(0.5)
-        
-        current_season_num = int(media.season.replace("S", ""))
-        current_episode_num = int(media.episode.replace("E", ""))
-        next_episode_num = current_episode_num + 1
-        
-        next_episode_id = f"{media.id.split(':')[0]}:{current_season_num}:{next_episode_num}"
-        
-        next_media_mock = type(media)(
-            id=next_episode_id,
-            tmdb_id=media.tmdb_id,
-            titles=media.titles,
-            season=f"S{current_season_num:02d}",
-            episode=f"E{next_episode_num:02d}",
-            languages=media.languages
-        )
-        
-        next_stream_key = stream_cache_key(next_media_mock)
-        cached_next = await redis_cache.get(next_stream_key)
-        
-        if cached_next is None:
-            logger.debug(f"Pre-fetch: Starting simple background search for next episode {next_episode_id}")
-
-            async def fetch_next_metadata():
-                return await get_metadata(next_episode_id, stream_type)
-
-            await asyncio.wait_for(
-                redis_cache.get_or_set(fetch_next_metadata, next_episode_id, stream_type, config["metadataProvider"]),
-                timeout=3.0
-            )
-            logger.debug(f"Pre-fetch: Metadata cached for episode {next_episode_id}")
-            
+    debrid_responses = []
+    for debrid, result in zip(debrid_services, results):
+        if result:
+            count = len(result.items()) if isinstance(result, dict) else len(result)
+            logger.info(f"Search: Checked availability for {count} items with {type(debrid).__name__}")
+            debrid_responses.append((type(debrid), result))
         else:
-            logger.debug(f"Pre-fetch: Next episode {next_episode_id} already cached")
-            
-    except asyncio.TimeoutError:
-        logger.debug(f"Pre-fetch: Timeout during simple background pre-fetch")
-    except Exception as e:
-        logger.debug(f"Pre-fetch: Error during simple background pre-fetch: {str(e)}")
-
-
-async def prefetch_next_episode(media, config, redis_cache, stream_cache_key, get_metadata, get_and_filter_results, stream_processing, ResultsPerQualityFilter, Stream, stream_type):
-    try:
-        current_season_num = int(media.season.replace("S", ""))
-        current_episode_num = int(media.episode.replace("E", ""))
-        next_episode_num = current_episode_num + 1
-        
-        next_episode_id = f"{media.id.split(':')[0]}:{current_season_num}:{next_episode_num}"
-        
-        next_media_mock = type(media)(
-            id=next_episode_id,
-            tmdb_id=media.tmdb_id,
-            titles=media.titles,
-            season=f"S{current_season_num:02d}",
-            episode=f"E{next_episode_num:02d}",
-            languages=media.languages
-        )
-        
-        next_stream_key = stream_cache_key(next_media_mock)
-        cached_next = await redis_cache.get(next_stream_key)
-        
-        if cached_next is None:
-            logger.info(f"Pre-fetch: Starting background search for next episode {next_episode_id}")
+            logger.warning(f"Search: No availability results found in {type(debrid).__name__}")
 
-            expiration_time = 1200
+    torrent_smart_container.merge_availability(debrid_responses, media)
 
-            async def fetch_next_metadata():
-                return await get_metadata(next_episode_id, stream_type)
 
-            next_media = await asyncio.wait_for(
-                redis_cache.get_or_set(fetch_next_metadata, next_episode_id, stream_type, config["metadataProvider"]),
-                timeout=8.0
-            )
-            
-            raw_results = await asyncio.wait_for(
-                get_and_filter_results(next_media, config),
-                timeout=12.0
-            )
-            filtered_results = ResultsPerQualityFilter(config).filter(raw_results)
-            next_streams = stream_processing(filtered_results, next_media, config)
-            next_stream_objects = [Stream(**stream) for stream in next_streams]
-            
-            await redis_cache.set(stream_cache_key(next_media), next_stream_objects, expiration=expiration_time)
-            logger.success(f"Pre-fetch: Successfully background pre-cached {len(next_stream_objects)} streams for episode {next_episode_id}")
-            
-        else:
-            logger.debug(f"Pre-fetch: Next episode {next_episode_id} already cached")
-            
-    except asyncio.TimeoutError:
-        logger.debug(f"Pre-fetch: Timeout during background pre-fetch")
-    except Exception as e:
-        error_msg = str(e).lower()
-        if any(keyword in error_msg for keyword in ["connection", "timeout", "reset", "closed"]):
-            logger.debug(f"Pre-fetch: Network issue during background pre-fetch: {str(e)}")
-        else:
-            logger.warning(f"Pre-fetch: Error during background pre-fetch: {str(e)}")
+async def search_postgres_cache(dao: TorrentItemDAO, media, config, indexers):
+    """Candidats du cache Postgres, pré-filtrés en SQL sur le type, la saison/épisode et les langues."""
+    season = episode = None
+    if isinstance(media, Series):
+        season = int(media.season.replace("S", ""))
+        episode = int(media.episode.replace("E", ""))
+    return await dao.search_stream_candidates(
+        int(media.tmdb_id),
+        media.type,
+        indexers,
+        season=season,
+        episode=episode,
+        languages=config.get("languages"),
+    )
 
 
 @router.get("/{config}/stream/{stream_type}/{stream_id}", response_model=SearchResponse)
@@ -363,9 +211,8 @@ async def get_results(
         metadata_provider = Cinemeta(config, session=http_session)
         return await metadata_provider.get_metadata(actual_id, actual_type)
 
-    media = await redis_cache.get_or_set(
-        get_metadata, stream_id, stream_type, config["metadataProvider"]
-    )
+    # Titres du film/de la série en cache une fois par id IMDb, épisode projeté localement
+    media = await get_media(stream_id, stream_type, config["metadataProvider"], config["languages"], get_metadata)
     logger.debug(f"Search: Retrieved media metadata for {str(media.titles)}")
 
     def stream_cache_key(media):
@@ -382,18 +229,6 @@ async def get_results(
         hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
         return hashed_key[:16]
 
-    cached_result = await redis_cache.get(stream_cache_key(media))
-    if cached_result is not None:
-        logger.info("Search: Returning cached processed results")
-
-        if isinstance(media, Series):
-            asyncio.create_task(full_prefetch_from_cache(media, config, redis_cache, stream_cache_key, get_metadata, stream_type, debrid_services, torrent_dao, request))
-            await asyncio.sleep(0.5)  # 500ms de délai pour les séries
-
-        total_time = time.time() - start
-        logger.success(f"Search: Request completed in {total_time:.2f} seconds")
-        return SearchResponse(streams=cached_result)
-
     def media_cache_key(media):
         if isinstance(media, Movie):
             key_string = f"media:{media.titles[0]}:{media.year}:{media.languages[0]}"
@@ -404,161 +239,145 @@ async def get_results(
         hashed_key = hashlib.sha256(key_string.encode("utf-8")).hexdigest()
         return hashed_key[:16]
 
-    async def get_search_results(media, config):
+    async def backfill_media_cache(media, config, stragglers, search_results):
+        # Les sources retardataires complètent le cache externe pour la prochaine requête
+        done, pending = await asyncio.wait(stragglers, timeout=settings.search_backfill_timeout)
+        for task in pending:
+            task.cancel()
+        late_results = []
+        for task in done:
+            # Résultats déjà convertis par la source, sur sa propre session
+            processed = task.result()
+            if processed:
+                logger.info(f"Search: Backfill found {len(processed)} late results from {stragglers[task]}")
+                late_results = merge_items(late_results, processed)
+        if not late_results:
+            return
+
+        cache_key = media_cache_key(media)
+        cached = await redis_cache.get(cache_key)
+        base_results = [TorrentItem.from_dict(item) for item in cached] if cached else search_results
+        merged = merge_items(base_results, late_results)
+        await redis_cache.set(cache_key, [item.to_dict() for item in merged], expiration=settings.redis_expiration)
+        await season_pack_index.add(media, late_results)
+        logger.success(f"Search: Backfilled external cache with {len(merged)} results")
+
+    async def convert_results(raw, config):
+        # Une session par lot : les conversions tournent en parallèle et peuvent finir après la réponse
+        session = request.app.state.db_session_factory()
+        try:
+            torrent_service = TorrentService(config, TorrentItemDAO(session), session=http_session)
+            return await torrent_service.convert_and_process(raw)
+        finally:
+            await session.commit()
+            await session.close()
+
+    async def get_search_results(media, config, pipeline: AvailabilityPipeline = None, indexed_packs=()):
         search_results = []
-        torrent_service = TorrentService(config, torrent_dao)
+        # Packs déjà indexés pour la saison : ni retéléchargés ni réindexés
+        indexed_titles = {item.raw_title for item in indexed_packs}
 
         async def perform_search(update_cache=False):
             nonlocal search_results
             search_results = []
-
-            async def _fetch_c411_raw():
-                if not config.get("c411"):
-                    return []
-                try:
-                    c411_service = C411Service(config, session=http_session)
-                    raw = await c411_service.search(media)
-                    return [
-                        C411SearchResult().from_api_item(item, media)
-                        for item in raw
-                        if getattr(item, "info_hash", None) and len(item.info_hash) == 40
-                    ] if raw else []
-                except Exception as e:
-                    logger.warning(f"Search: C411 search failed, skipping: {str(e)}")
-                return []
-
-            async def _fetch_torr9_raw():
-                if not config.get("torr9"):
-                    return []
-                try:
-                    torr9_service = Torr9Service(config, session=http_session)
-                    raw = await torr9_service.search(media)
-                    return [
-                        Torr9SearchResult().from_api_item(item, media)
-                        for item in raw
-                        if getattr(item, "info_hash", None) and len(item.info_hash) == 40
-                    ] if raw else []
-                except Exception as e:
-                    logger.warning(f"Search: Torr9 search failed, skipping: {str(e)}")
-                return []
-
-            async def _fetch_lacale_raw():
-                if not config.get("lacale"):
-                    return []
-                try:
-                    lacale_service = LaCaleService(config, session=http_session)
-                    raw = await lacale_service.search(media)
-                    return raw if raw else []
-                except Exception as e:
-                    logger.warning(f"Search: LaCale search failed, skipping: {str(e)}")
-                return []
-
-            async def _fetch_yggflix_raw():
-                if not config.get("yggflix"):
-                    return []
-                try:
-                    yggflix_service = YggflixService(config)
-                    raw = await asyncio.to_thread(yggflix_service.search, media)
-                    return raw if raw else []
-                except Exception as e:
-                    logger.warning(f"Search: Yggflix search failed, skipping: {str(e)}")
-                return []
-
-            c411_raw, torr9_raw, lacale_raw, yggflix_raw = await asyncio.gather(
-                _fetch_c411_raw(), _fetch_torr9_raw(), _fetch_lacale_raw(), _fetch_yggflix_raw()
-            )
-
-            if c411_raw:
-                c411_search_results = await torrent_service.convert_and_process(c411_raw)
-                logger.success(f"Search: Found {len(c411_search_results)} results from C411")
-                search_results = merge_items(search_results, c411_search_results)
-            if torr9_raw:
-                torr9_search_results = await torrent_service.convert_and_process(torr9_raw)
-                logger.success(f"Search: Found {len(torr9_search_results)} results from Torr9")
-                search_results = merge_items(search_results, torr9_search_results)
-            if lacale_raw:
-                lacale_search_results = await torrent_service.convert_and_process(lacale_raw)
-                logger.success(f"Search: Found {len(lacale_search_results)} results from LaCale")
-                search_results = merge_items(search_results, lacale_search_results)
-            if yggflix_raw:
-                yggflix_search_results = await torrent_service.convert_and_process(yggflix_raw)
-                logger.success(f"Search: Found {len(yggflix_search_results)} results from Yggflix")
-                search_results = merge_items(search_results, yggflix_search_results)
-
-            # 2. Public cache (DMM etc.)
-            if config["cache"] and not update_cache and len(search_results) < int(
-                config["minCachedResults"]
-            ):
+            # Compteur tenu lot par lot : la liste fusionnée n'est pas refiltrée à chaque réponse
+            good_keys = {(item.raw_title, item.size, item.privacy) for item in filter_items(indexed_packs, media, config=config)}
+            min_results = int(config["minCachedResults"])
+
+            async def _search_c411():
+                c411_service = C411Service(config, session=http_session)
+                raw = await c411_service.search(media)
+                return [
+                    C411SearchResult().from_api_item(item, media)
+                    for item in raw or []
+                    if getattr(item, "info_hash", None) and len(item.info_hash) == 40
+                ]
+
+            async def _search_torr9():
+                torr9_service = Torr9Service(config, session=http_session)
+                raw = await torr9_service.search(media)
+                return [
+                    Torr9SearchResult().from_api_item(item, media)
+                    for item in raw or []
+                    if getattr(item, "info_hash", None) and len(item.info_hash) == 40
+                ]
+
+            async def _search_lacale():
+                lacale_service = LaCaleService(config, session=http_session)
+                return await lacale_service.search(media)
+
+            async def _search_yggflix():
+                yggflix_service = YggflixService(config, session=http_session)
+                return await yggflix_service.search(media)
+
+            async def _search_public():
                 public_cached_results = await asyncio.to_thread(search_public, media)
-                if public_cached_results:
-                    logger.success(
-                        f"Search: Found {len(public_cached_results)} public cached results"
-                    )
-                    public_cached_results = [
-                        JackettResult().from_cached_item(torrent, media)
-                        for torrent in public_cached_results
-                        if isinstance(torrent, dict) and len(torrent.get("hash", "")) == 40
-                    ]
-                    public_cached_results = await torrent_service.convert_and_process(
-                        public_cached_results
-                    )
-                    search_results = merge_items(search_results, public_cached_results)
+                return [
+                    JackettResult().from_cached_item(torrent, media)
+                    for torrent in public_cached_results or []
+                    if isinstance(torrent, dict) and len(torrent.get("hash", "")) == 40
+                ]
 
-            # 3. Zilean si pas assez de résultats
-            if config["zilean"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
+            async def _search_zilean():
                 zilean_service = ZileanService(config, session=http_session)
                 zilean_search_results = await zilean_service.search(media)
-                if zilean_search_results:
-                    logger.success(
-                        f"Search: Found {len(zilean_search_results)} results from Zilean"
-                    )
-                    zilean_search_results = [
-                        ZileanResult().from_api_cached_item(torrent, media)
-                        for torrent in zilean_search_results
-                        if len(getattr(torrent, "info_hash", "")) == 40
-                    ]
-                    zilean_search_results = await torrent_service.convert_and_process(
-                        zilean_search_results
-                    )
-                    logger.info(
-                        f"Search: Zilean final search results: {len(zilean_search_results)}"
-                    )
-                    search_results = merge_items(search_results, zilean_search_results)
+                return [
+                    ZileanResult().from_api_cached_item(torrent, media)
+                    for torrent in zilean_search_results or []
+                    if len(getattr(torrent, "info_hash", "")) == 40
+                ]
 
-            if config["sharewood"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
-                try:
-                    sharewood_service = SharewoodService(config, session=http_session)
-                    sharewood_search_results = await sharewood_service.search(media)
-                    if sharewood_search_results:
-                        logger.success(
-                            f"Search: Found {len(sharewood_search_results)} results from Sharewood"
-                        )
-                        sharewood_search_results = (
-                            await torrent_service.convert_and_process(
-                                sharewood_search_results
-                            )
-                        )
-                        search_results = merge_items(search_results, sharewood_search_results)
-                except Exception as e:
-                    logger.warning(f"Search: Sharewood search failed, skipping: {str(e)}")
+            async def _search_sharewood():
+                sharewood_service = SharewoodService(config, session=http_session)
+                return await sharewood_service.search(media)
 
-            if config["jackett"] and len(search_results) < int(
-                config["minCachedResults"]
-            ):
+            async def _search_jackett():
                 jackett_service = JackettService(config, session=http_session)
-                jackett_search_results = await jackett_service.search(media)
-                logger.success(
-                    f"Search: Found {len(jackett_search_results)} results from Jackett"
-                )
-                if jackett_search_results:
-                    torrent_results = await torrent_service.convert_and_process(
-                        jackett_search_results
-                    )
-                    search_results = merge_items(search_results, torrent_results)
+                return await jackett_service.search(media)
+
+            sources = {}
+            if config.get("c411"):
+                sources["C411"] = _search_c411
+            if config.get("torr9"):
+                sources["Torr9"] = _search_torr9
+            if config.get("lacale"):
+                sources["LaCale"] = _search_lacale
+            if config.get("yggflix"):
+                sources["Yggflix"] = _search_yggflix
+            if config["cache"] and not update_cache:
+                sources["Public cache"] = _search_public
+            if config["zilean"]:
+                sources["Zilean"] = _search_zilean
+            if config["sharewood"]:
+                sources["Sharewood"] = _search_sharewood
+            if config["jackett"]:
+                sources["Jackett"] = _search_jackett
+
+            def search_and_convert(search):
+                # Recherche et conversion dans la même tâche : la deadline du scheduler couvre aussi les .torrent
+                async def _run():
+                    raw = await search()
+                    raw = [result for result in raw or [] if result.raw_title not in indexed_titles]
+                    return await convert_results(raw, config) if raw else []
+                return _run
+
+            sources = {name: search_and_convert(search) for name, search in sources.items()}
+
+            async def on_result(name, processed):
+                nonlocal search_results
+                if not processed:
+                    return
+                logger.success(f"Search: Found {len(processed)} results from {name}")
+                search_results = merge_items(search_results, processed)
+                accepted = filter_items(processed, media, config=config)
+                good_keys.update((item.raw_title, item.size, item.privacy) for item in accepted)
+                if pipeline is not None:
+                    # Disponibilité debrid vérifiée sans attendre les autres indexers
+                    pipeline.submit(accepted)
+
+            stragglers = await SearchScheduler(sources).run(on_result, lambda: len(good_keys) >= min_results)
+            if stragglers:
+                spawn_background(backfill_media_cache(media, config, stragglers, search_results))
 
             if update_cache and search_results:
                 logger.info(
@@ -575,36 +394,58 @@ async def get_results(
         await perform_search()
         return search_results
 
-    async def get_and_filter_results(media, config):
+    async def get_and_filter_results(media, config, dao: TorrentItemDAO = torrent_dao, pipeline: AvailabilityPipeline = None):
         # Postgres acts as a local cache for private indexers (Yggtorrent, C411, Torr9)
         # and is always queried directly, bypassing Redis
         postgres_results = []
         if hasattr(media, 'tmdb_id') and media.tmdb_id:
             try:
-                postgres_items = await torrent_dao.search_by_tmdb_id(int(media.tmdb_id))
-                if postgres_items:
+                postgres_results = await search_postgres_cache(
+                    dao, media, config, ['Yggtorrent - API', 'C411 - API', 'Torr9 - API', 'LaCale - API']
+                )
+                if postgres_results:
                     logger.success(
-                        f"Search: Found {len(postgres_items)} results from Postgres (local cache) for TMDB ID {media.tmdb_id}"
+                        f"Search: Found {len(postgres_results)} results from Postgres (local cache) for TMDB ID {media.tmdb_id}"
                     )
-                    torrent_service = TorrentService(config, torrent_dao)
-                    for db_item in postgres_items:
-                        if db_item.indexer in ['Yggtorrent - API', 'C411 - API', 'Torr9 - API', 'LaCale - API']:
-                            torrent_item = db_item.to_torrent_item()
-                            postgres_results.append(torrent_item)
+                    if pipeline is not None:
+                        pipeline.submit(filter_items(postgres_results, media, config=config))
             except Exception as pg_error:
                 logger.error(f"Search: Postgres search failed: {str(pg_error)}")
 
+        # Packs de la saison déjà trouvés pour un autre épisode
+        indexed_packs = await season_pack_index.get(media) if isinstance(media, Series) else []
+        if indexed_packs:
+            logger.success(f"Search: Found {len(indexed_packs)} season packs in the pack index")
+            if pipeline is not None:
+                pipeline.submit(filter_items(indexed_packs, media, config=config))
+
         cache_key = media_cache_key(media)
+
+        async def search_and_cache():
+            # Un seul fan-out vers les indexers par titre/épisode, les requêtes concurrentes attendent ce résultat
+            async def _search():
+                # Tâche partagée : conversions en sessions DB dédiées, pipeline ignoré une fois fermé
+                results = await get_search_results(media, config, pipeline, indexed_packs)
+                await season_pack_index.add(media, results)
+                results_dict = [item.to_dict() for item in results]
+                await redis_cache.set(cache_key, results_dict, expiration=settings.redis_expiration)
+                logger.success(
+                    f"Search: Cached {len(results)} external results in Redis (Sharewood/Zilean/Jackett)"
+                )
+                return results_dict
+
+            results_dict = await search_single_flight.run(
+                cache_key, redis_cache, _search, lambda: redis_cache.get(cache_key)
+            )
+            # Copies propres à cette requête : la disponibilité debrid modifie les items
+            return [TorrentItem.from_dict(item) for item in results_dict]
+
         external_results = await redis_cache.get(cache_key)
+        fresh_search = external_results is None
 
-        if external_results is None:
+        if fresh_search:
             logger.info("Search: No external sources in Redis cache. Performing new search.")
-            external_results = await get_search_results(media, config)
-            external_results_dict = [item.to_dict() for item in external_results]
-            await redis_cache.set(cache_key, external_results_dict, expiration=settings.redis_expiration)
-            logger.success(
-                f"Search: Cached {len(external_results)} external results in Redis (Sharewood/Zilean/Jackett)"
-            )
+            external_results = await search_and_cache()
         else:
             logger.success(
                 f"Search: Retrieved {len(external_results)} external results from Redis cache"
@@ -612,26 +453,35 @@ async def get_results(
             external_results = [
                 TorrentItem.from_dict(item) for item in external_results
             ]
-
-        all_results = merge_items(postgres_results, external_results)
-        logger.info(f"Search: Merged Postgres ({len(postgres_results)}) + External ({len(external_results)}) = {len(all_results)} total results")
+            if pipeline is not None:
+                pipeline.submit(filter_items(external_results, media, config=config))
+
+        local_results = merge_items(indexed_packs, postgres_results)
+        all_results = merge_items(local_results, external_results)
+        logger.info(
+            f"Search: Merged Postgres ({len(postgres_results)}) + Season packs ({len(indexed_packs)})"
+            f" + External ({len(external_results)}) = {len(all_results)} total results"
+        )
 
         filtered_results = filter_items(all_results, media, config=config)
 
         min_results = int(config.get("minCachedResults", 8))
-        external_filtered = filter_items(external_results, media, config=config)
-        if len(external_filtered) < min_results:
+        # Résultats externes déjà filtrés dans filtered_results : pas de second passage de filter_items
+        external_keys = {(item.raw_title, item.size, item.privacy) for item in [*indexed_packs, *external_results]}
+        external_filtered = sum(
+            1 for item in filtered_results if (item.raw_title, item.size, item.privacy) in external_keys
+        )
+        # Inutile de relancer un fan-out qui vient d'être fait
+        if external_filtered < min_results and not fresh_search:
             logger.warning(
-                f"Search: Insufficient external results ({len(external_filtered)} < {min_results}). Recreating external cache."
+                f"Search: Insufficient external results ({external_filtered} < {min_results}). Recreating external cache."
             )
             await redis_cache.delete(cache_key)
-            external_results = await get_search_results(media, config)
-            external_results_dict = [item.to_dict() for item in external_results]
-            await redis_cache.set(cache_key, external_results_dict, expiration=settings.redis_expiration)
+            external_results = await search_and_cache()
             logger.success(
                 f"Search: Recreated external cache with {len(external_results)} results"
             )
-            all_results = merge_items(postgres_results, external_results)
+            all_results = merge_items(local_results, external_results)
             filtered_results = filter_items(all_results, media, config=config)
 
         logger.success(
@@ -639,38 +489,13 @@ async def get_results(
         )
         return filtered_results
 
-    raw_search_results = await get_and_filter_results(media, config)
-    logger.debug(f"Search: Filtered search results: {len(raw_search_results)}")
-    search_results = ResultsPerQualityFilter(config).filter(raw_search_results)
-    logger.info(f"Search: Filtered search results per quality: {len(search_results)}")
-
-    async def stream_processing(search_results, media, config):
+    async def stream_processing(search_results, media, config, pipeline: AvailabilityPipeline = None):
         torrent_smart_container = TorrentSmartContainer(search_results, media)
 
         if config["debrid"]:
-            for debrid in debrid_services:
-                hashes = torrent_smart_container.get_unaviable_hashes()
-                ip = get_client_ip(request)
-                result = await debrid.get_availability_bulk(hashes, ip)
-                if result:
-                    torrent_smart_container.update_availability(
-                        result, type(debrid), media
-                    )
-                    if isinstance(result, dict):
-                        count = len(result.items())
-                    else:
-                        count = len(result)
-
-                    is_stremthru = (type(debrid).__name__ == "StremThru" or
-                                   hasattr(debrid, 'store_name') and getattr(debrid, 'store_name', None) is not None)
-                    
-                    logger.info(
-                        f"Search: Checked availability for {count} items with {type(debrid).__name__}"
-                    )
-                else:
-                    logger.warning(
-                        "Search: No availability results found in debrid service"
-                    )
+            await check_debrid_availability(
+                debrid_services, torrent_smart_container, media, get_client_ip(request), redis_cache, pipeline
+            )
 
         if config["cache"]:
             torrent_smart_container.cache_container_items()
@@ -685,22 +510,118 @@ async def get_results(
 
         return stream_list
 
-    stream_list = await stream_processing(search_results, media, config)
-    streams = [Stream(**stream) for stream in stream_list]
+    async def compute_streams(media, dao: TorrentItemDAO = torrent_dao):
+        # Les vérifications debrid démarrent dès les premiers résultats, pendant la recherche
+        pipeline = AvailabilityPipeline(debrid_services, get_client_ip(request), redis_cache) if config["debrid"] else None
+        try:
+            raw_search_results = await get_and_filter_results(media, config, dao, pipeline)
+            logger.debug(f"Search: Filtered search results: {len(raw_search_results)}")
+            search_results = ResultsPerQualityFilter(config).filter(raw_search_results)
+            logger.info(f"Search: Filtered search results per quality: {len(search_results)}")
+
+            stream_list = await stream_processing(search_results, media, config, pipeline)
+        finally:
+            # drain() n'est pas atteint sans hash à vérifier ou en cas d'erreur
+            if pipeline is not None:
+                pipeline.close()
+        return [Stream(**stream) for stream in stream_list]
+
+    async def refresh_stream_cache(media, cache_key):
+        # Un seul rafraîchissement par clé, tous workers confondus
+        try:
+            client = await redis_cache.get_redis_client()
+            acquired = await client.set(
+                f"refresh:{cache_key}", 1, nx=True, ex=settings.stream_cache_refresh_lock_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Search: Unable to take refresh lock for {cache_key}: {e}")
+            return
+        if not acquired:
+            logger.debug(f"Search: Refresh already running for {cache_key}")
+            return
+
+        # La session de la requête est fermée à la fin de la réponse
+        background_session = request.app.state.db_session_factory()
+        try:
+            streams = await compute_streams(media, TorrentItemDAO(background_session))
+            await redis_cache.set(cache_key, streams, expiration=settings.stream_cache_hard_ttl)
+            stream_cache_stats.refreshed += 1
+            logger.success(f"Search: Background refresh cached {len(streams)} streams for {cache_key}")
+        except Exception as e:
+            stream_cache_stats.refresh_failed += 1
+            logger.error(f"Search: Background refresh failed for {cache_key}: {e}")
+        finally:
+            await background_session.commit()
+            await background_session.close()
+
+    async def prefetch_episode(current_media, season_num, episode_num, cross_season):
+        next_episode_id = f"{current_media.id.split(':')[0]}:{season_num}:{episode_num}"
+        next_media = await asyncio.wait_for(
+            get_media(next_episode_id, stream_type, config["metadataProvider"], config["languages"], get_metadata),
+            timeout=5.0
+        )
+        next_stream_key = stream_cache_key(next_media)
+        if await redis_cache.exists(next_stream_key):
+            logger.debug(f"Pre-fetch: Streams already cached for {next_episode_id}")
+            return
+
+        # La session de la requête est fermée à la fin de la réponse
+        background_session = request.app.state.db_session_factory()
+        try:
+            streams = await compute_streams(next_media, TorrentItemDAO(background_session))
+        finally:
+            await background_session.commit()
+            await background_session.close()
+
+        if streams:
+            await redis_cache.set(next_stream_key, streams, expiration=settings.stream_cache_hard_ttl)
+            logger.success(f"Pre-fetch: Pre-cached {len(streams)} streams for episode {next_episode_id}")
+        elif cross_season and settings.prefetch_next_season:
+            # Rien pour l'épisode suivant : probablement la fin de saison
+            await submit_prefetch(current_media, season_num + 1, 1, cross_season=False)
+
+    async def submit_prefetch(current_media, season_num, episode_num, cross_season):
+        user = hashlib.sha256((api_key or ip_address).encode("utf-8")).hexdigest()[:16]
+        key = f"{user}:{current_media.id.split(':')[0]}:{season_num}:{episode_num}"
+        await prefetch_scheduler.submit(
+            key, lambda: prefetch_episode(current_media, season_num, episode_num, cross_season)
+        )
+
+    async def schedule_prefetch(media):
+        season_num = media.get_season_number()
+        episode_num = media.get_episode_number()
+        for offset in range(1, settings.prefetch_lookahead + 1):
+            await submit_prefetch(media, season_num, episode_num + offset, cross_season=offset == 1)
 
-    expiration_time = 1200
-    has_stremthru = any(
-        type(debrid).__name__ == "StremThru" or hasattr(debrid, 'store_name')
-        for debrid in debrid_services
-    )
-    if has_stremthru:
-        expiration_time = 600
-        logger.info(f"Search: Using reduced cache expiration ({expiration_time}s) for StremThru")
+    soft_ttl = stream_cache_soft_ttl(debrid_services)
+    cache_key = stream_cache_key(media)
+    cached_result = await redis_cache.get(cache_key)
+    if cached_result is not None:
+        if is_stale(await redis_cache.get_ttl(cache_key), soft_ttl):
+            stream_cache_stats.stale += 1
+            logger.info("Search: Returning stale cached results, refreshing in background")
+            spawn_background(refresh_stream_cache(media, cache_key))
+        else:
+            stream_cache_stats.fresh += 1
+            logger.info("Search: Returning cached processed results")
+
+        if isinstance(media, Series):
+            await schedule_prefetch(media)
+
+        total_time = time.time() - start
+        logger.success(f"Search: Request completed in {total_time:.2f} seconds")
+        return SearchResponse(streams=cached_result)
+
+    stream_cache_stats.miss += 1
+    streams = await compute_streams(media)
+
+    if soft_ttl != settings.stream_cache_soft_ttl:
+        logger.info(f"Search: Using reduced soft cache TTL ({soft_ttl}s) for StremThru")
 
-    await redis_cache.set(stream_cache_key(media), streams, expiration=expiration_time)
+    await redis_cache.set(cache_key, streams, expiration=settings.stream_cache_hard_ttl)
 
     if isinstance(media, Series):
-        asyncio.create_task(full_prefetch_from_cache(media, config, redis_cache, stream_cache_key, get_metadata, stream_type, debrid_services, torrent_dao, request))
+        await schedule_prefetch(media)
 
     total_time = time.time() - start
     logger.info(f"Search: Request completed in {total_time:.2f} seconds")